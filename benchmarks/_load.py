@@ -0,0 +1,21 @@
+"""Import felshare_ble submodules without Home Assistant.
+
+The package __init__ pulls in Home Assistant, so the benchmarks register a bare
+package object pointing at the source directory and import only the pure modules
+(protocol, state, ...) from it.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "felshare_ble"
+
+def load(name: str):
+    if "felshare_ble" not in sys.modules:
+        pkg = types.ModuleType("felshare_ble")
+        pkg.__path__ = [str(PACKAGE_DIR)]
+        sys.modules["felshare_ble"] = pkg
+    return importlib.import_module(f"felshare_ble.{name}")
@@ -0,0 +1,96 @@
+"""Microbenchmarks for the protocol codec.
+
+Decoding per opcode (decode_frame on the frames of one opcode from the corpus),
+the per-device FrameDecoder over the whole session, the bytes_* encoders,
+find_workmode_inside_bytes / parse_bulk on bulk frames, FrameAssembler
+reassembling the session split into 20-byte notifications, and recording a
+notification in the frame trace.
+
+    python benchmarks/bench_codec.py [--frames N] [--corpus trace.fstr|frames.hex]
+"""
+from __future__ import annotations
+
+import argparse
+
+from _load import load
+from corpus import load_corpus, synthetic_session, fragment
+from harness import micro
+
+OPCODE_NAMES = {
+    0x03: "power",
+    0x04: "fan",
+    0x05: "status",
+    0x08: "oil_name",
+    0x0C: "bulk",
+    0x0E: "consumption",
+    0x0F: "capacity",
+    0x10: "remain",
+    0x32: "workmode",
+}
+
+def run(frames: list[bytes], repeat: int = 5) -> dict[str, dict[str, float]]:
+    protocol = load("protocol")
+    framing = load("framing")
+    trace = load("trace")
+    results: dict[str, dict[str, float]] = {}
+
+    notifications = [bytearray(f) for f in frames]
+    by_opcode: dict[int, list[bytearray]] = {}
+    for data in notifications:
+        by_opcode.setdefault(data[0], []).append(data)
+
+    for opcode, batch in sorted(by_opcode.items()):
+        name = OPCODE_NAMES.get(opcode, f"0x{opcode:02x}")
+        results[f"decode.{name}"] = micro(batch, lambda: protocol.decode_frame, repeat)
+
+    # A fresh decoder per run: its dedupe cache must not carry over.
+    results["decode.session_dedupe"] = micro(notifications, lambda: protocol.FrameDecoder().decode, repeat)
+
+    encoders = [
+        lambda: protocol.bytes_power(True),
+        lambda: protocol.bytes_fan(False),
+        lambda: protocol.bytes_status_request(),
+        lambda: protocol.bytes_workmode(9, 0, 21, 30, True, 0x3E, 30, 280),
+        lambda: protocol.bytes_oil_name("White Tea"),
+        lambda: protocol.bytes_oil_capacity_ml(200),
+        lambda: protocol.bytes_oil_remain_ml(150),
+        lambda: protocol.bytes_oil_consumption(25),
+    ]
+    results["encode.all_setters"] = micro(encoders * 2000, lambda: lambda encode: encode(), repeat)
+
+    bulk = [bytes(f) for f in by_opcode.get(0x0C, [])]
+    if bulk:
+        results["bulk.find_workmode"] = micro(bulk, lambda: protocol.find_workmode_inside_bytes, repeat)
+        results["bulk.parse_bulk"] = micro(bulk, lambda: protocol.parse_bulk, repeat)
+
+    # Fragments of one frame arrive within a few ms of each other.
+    pieces = [(piece, i * 0.001) for i, piece in enumerate(fragment(frames, framing.DEFAULT_MAX_PAYLOAD))]
+
+    def make_feed():
+        feed = framing.FrameAssembler().feed
+        return lambda item: feed(*item)
+    results["framing.reassemble"] = micro(pieces, make_feed, repeat)
+
+    # What every notification and write pays for the always-on frame trace.
+    def make_record():
+        record = trace.FrameTrace(1024).record
+        return lambda data: record(trace.RX, data)
+    results["trace.record"] = micro(notifications, make_record, repeat)
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--corpus", help="binary trace (.fstr) or text file with one hex frame per line")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_corpus(args.corpus) if args.corpus else synthetic_session(args.frames)
+    for name, metrics in run(frames, args.repeat).items():
+        print(
+            f"{name:28s} {metrics['ops_per_s']:12,.0f} ops/s {metrics['ns_per_op']:9,.0f} ns/op"
+            f" {metrics['allocs_per_op']:6.2f} allocs/op"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Frames/second of the notification decoder.
+
+Compares the 0.1.2 if-chain decoder (legacy_decode.py), the table-driven
+protocol.decode_frame() and the per-device protocol.FrameDecoder, which also skips
+frames identical to the previous one of the same opcode. The frames are handed
+over as bytearray, the way Bleak delivers notifications; the legacy path includes
+the bytes() copy _handle_notify used to make.
+
+    python benchmarks/bench_decode.py [--frames N] [--corpus trace.fstr|frames.hex]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from _load import load
+from corpus import load_corpus, synthetic_session
+import legacy_decode
+
+def _measure(fn, frames, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(frames)
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+def run(frames: list[bytes], repeat: int = 5) -> dict[str, float]:
+    protocol = load("protocol")
+    notifications = [bytearray(f) for f in frames]
+
+    def legacy(batch):
+        decode = legacy_decode.decode_frame
+        for data in batch:
+            decode(bytes(data))
+
+    def table(batch):
+        decode = protocol.decode_frame
+        for data in batch:
+            decode(data)
+
+    def stateful(batch):
+        decode = protocol.FrameDecoder().decode
+        for data in batch:
+            decode(data)
+
+    return {
+        "legacy if-chain": _measure(legacy, notifications, repeat),
+        "decode_frame (table)": _measure(table, notifications, repeat),
+        "FrameDecoder (table + dedupe)": _measure(stateful, notifications, repeat),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--corpus", help="binary trace (.fstr) or text file with one hex frame per line")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_corpus(args.corpus) if args.corpus else synthetic_session(args.frames)
+    results = run(frames, args.repeat)
+    base = results["legacy if-chain"]
+    print(f"{len(frames)} frames")
+    for name, fps in results.items():
+        print(f"  {name:32s} {fps:12,.0f} frames/s  x{fps / base:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""End-to-end benchmarks: simulated diffusers driving FelshareBleConnection.
+
+Each device is a simulator.SimulatedDiffuser plugged in through the connection's
+client_factory, so the whole path runs: command queue, writer task, reply
+correlation, notification reassembly, decoding and the state merge the
+coordinator does in _on_state.
+
+  commands  every device sends --commands setter frames back to back; latency is
+            write to echo (including the simulated --latency), throughput is
+            commands/s over the whole fleet.
+  notify    every device pushes status frames at --rate frames/s for --seconds;
+            latency is push to state merge (no simulated latency, so it shows
+            event-loop saturation), throughput is frames/s processed.
+
+Needs Home Assistant and bleak installed (pip install homeassistant).
+
+    python benchmarks/bench_e2e.py [--devices N] [--rate M] [--seconds S]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+
+from _load import load
+from harness import percentiles
+
+async def _commands(hass, devices: int, commands: int, latency: float) -> dict[str, float]:
+    ble = load("ble")
+    protocol = load("protocol")
+    simulator = load("simulator")
+    state = load("state")
+
+    fleet = simulator.make_fleet(devices, latency=latency, jitter=latency / 4, seed=1)
+    conns = []
+    for sim in fleet:
+        merged = state.FelshareState()
+        conns.append(
+            ble.FelshareBleConnection(hass, sim.address, sim.name, merged.update, client_factory=sim.connect)
+        )
+    await asyncio.gather(*(conn.connect() for conn in conns))
+
+    samples: list[float] = []
+
+    async def drive(conn) -> None:
+        for i in range(commands):
+            started = time.perf_counter()
+            await conn.request(protocol.bytes_power(bool(i & 1)))
+            samples.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(drive(conn) for conn in conns))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        await asyncio.gather(*(conn.close() for conn in conns))
+    return {
+        "commands_per_s": len(samples) / elapsed,
+        **percentiles(samples),
+        "peak_kib_per_device": peak / 1024 / devices,
+    }
+
+async def _notify(hass, devices: int, rate: float, seconds: float) -> dict[str, float]:
+    ble = load("ble")
+    simulator = load("simulator")
+    state = load("state")
+
+    fleet = simulator.make_fleet(devices, oil_capacity_ml=65535, oil_remain_ml=65535, seed=2)
+    samples: list[float] = []
+    pushed: dict[str, list[float]] = {sim.address: [] for sim in fleet}
+    conns = []
+    for sim in fleet:
+        merged = state.FelshareState()
+        sent = pushed[sim.address]
+
+        def on_state(partial, merged=merged, sent=sent) -> None:
+            merged.update(partial)
+            if "device_clock" in partial and sent:
+                samples.append(time.perf_counter() - sent.pop(0))
+
+        conns.append(ble.FelshareBleConnection(hass, sim.address, sim.name, on_state, client_factory=sim.connect))
+    await asyncio.gather(*(conn.connect() for conn in conns))
+
+    async def push(sim) -> None:
+        interval = 1.0 / rate
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pushed[sim.address].append(time.perf_counter())
+            # Draining oil makes every frame differ, so none is skipped as a duplicate.
+            sim.consume(1)
+            await asyncio.sleep(interval)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(push(sim) for sim in fleet))
+        await asyncio.sleep(0.1)  # let the last notifications drain
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        await asyncio.gather(*(conn.close() for conn in conns))
+    return {
+        "frames_per_s": len(samples) / elapsed,
+        **percentiles(samples),
+        "peak_kib_per_device": peak / 1024 / devices,
+    }
+
+async def _run(devices: int, commands: int, latency: float, rate: float, seconds: float) -> dict[str, dict[str, float]]:
+    from homeassistant.core import HomeAssistant
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        return {
+            f"e2e.commands.{devices}dev": await _commands(hass, devices, commands, latency),
+            f"e2e.notify.{devices}dev_{rate:g}hz": await _notify(hass, devices, rate, seconds),
+        }
+
+def run(
+    devices: int = 20,
+    commands: int = 50,
+    latency: float = 0.02,
+    rate: float = 5.0,
+    seconds: float = 5.0,
+) -> dict[str, dict[str, float]]:
+    return asyncio.run(_run(devices, commands, latency, rate, seconds))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--commands", type=int, default=50, help="setter frames per device")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated reply latency (s)")
+    parser.add_argument("--rate", type=float, default=5.0, help="pushed status frames per device per second")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for name, metrics in run(args.devices, args.commands, args.latency, args.rate, args.seconds).items():
+        print(f"{name}: " + ", ".join(f"{k} {v:,.2f}" for k, v in metrics.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmarks for merging decoded frames into the device state.
+
+FelshareState.update() is what FelshareCoordinator._on_state does first for every
+notification; its changed-key list drives the entity updates. Measured on its
+own (pre-decoded frames), as the notification path (FrameDecoder + update, the
+way _process_frame feeds _on_state), and for the copies and schedule reads the
+setters make.
+
+    python benchmarks/bench_state.py [--frames N] [--corpus trace.fstr|frames.hex]
+"""
+from __future__ import annotations
+
+import argparse
+
+from _load import load
+from corpus import load_corpus, synthetic_session
+from harness import micro
+
+def run(frames: list[bytes], repeat: int = 5) -> dict[str, dict[str, float]]:
+    protocol = load("protocol")
+    state = load("state")
+    results: dict[str, dict[str, float]] = {}
+
+    partials = [p for p in map(protocol.decode_frame, frames) if p]
+    results["state.update"] = micro(partials, lambda: state.FelshareState().update, repeat)
+
+    def make_pipeline():
+        decode = protocol.FrameDecoder().decode
+        update = state.FelshareState().update
+
+        def notify(data):
+            partial = decode(data)
+            return update(partial) if partial else None
+        return notify
+    results["state.notify_pipeline"] = micro([bytearray(f) for f in frames], make_pipeline, repeat)
+
+    full = state.FelshareState()
+    for partial in partials:
+        full.update(partial)
+    reads = [None] * 5000
+    results["state.copy"] = micro(reads, lambda: lambda _: full.copy(), repeat)
+    results["state.workmode_fields"] = micro(reads, lambda: lambda _: full.workmode_fields(), repeat)
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--corpus", help="binary trace (.fstr) or text file with one hex frame per line")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_corpus(args.corpus) if args.corpus else synthetic_session(args.frames)
+    for name, metrics in run(frames, args.repeat).items():
+        print(
+            f"{name:28s} {metrics['ops_per_s']:12,.0f} ops/s {metrics['ns_per_op']:9,.0f} ns/op"
+            f" {metrics['allocs_per_op']:6.2f} allocs/op"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Frame corpora for the benchmarks.
+
+`synthetic_session()` builds a deterministic notification stream shaped like a
+day of traffic from one diffuser (status polls with a ticking clock and draining
+oil, echoes of user commands, schedule reads). Recorded traffic can be used
+instead: a text file with one hex-encoded frame per line, or a binary trace
+exported from a live device (felshare_ble.export_trace).
+"""
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+from _load import load
+
+def _status(year, month, day, hour, minute, second, power, fan, cons, cap, rem, name: bytes) -> bytes:
+    return (
+        bytes([0x05])
+        + year.to_bytes(2, "big")
+        + bytes([month, day, hour, minute, second, 0x00, power, fan])
+        + cons.to_bytes(2, "big")
+        + cap.to_bytes(2, "big")
+        + bytes(5)
+        + rem.to_bytes(2, "big")
+        + bytes(2)
+        + name
+        + b"\x00"
+    )
+
+def _workmode(sh, sm, eh, em, enabled, daymask, run_s, stop_s) -> bytes:
+    flag = (0x80 if enabled else 0) | (daymask & 0x7F)
+    return bytes([0x32, 0x01, sh, sm, eh, em, flag]) + run_s.to_bytes(2, "big") + stop_s.to_bytes(2, "big")
+
+def _bulk(workmode: bytes) -> bytes:
+    # Header/clock block, the WorkMode record, then unused schedule slots.
+    return bytes([0x0C]) + bytes(range(1, 20)) + workmode + bytes(24)
+
+def synthetic_session(n: int = 20000, seed: int = 1) -> list[bytes]:
+    rnd = random.Random(seed)
+    frames: list[bytes] = []
+    rem = 180
+    second = 0
+    wm = _workmode(9, 0, 21, 0, True, 0x3E, 30, 280)
+    names = [b"Lavender", b"White Tea", b"Hotel Lobby Signature Blend"]
+    name = names[0]
+    while len(frames) < n:
+        second += 300
+        if rnd.random() < 0.05 and rem > 0:
+            rem -= 1
+        t = second % 86400
+        frames.append(_status(2024, 5, 17, t // 3600, (t // 60) % 60, t % 60, 1, 1, 25, 200, rem, name))
+        roll = rnd.random()
+        if roll < 0.25:
+            frames.append(bytes([0x03, rnd.randint(0, 1)]))
+        elif roll < 0.40:
+            frames.append(bytes([0x04, rnd.randint(0, 1)]))
+        elif roll < 0.55:
+            wm = _workmode(rnd.randint(6, 10), 0, rnd.randint(18, 23), 30, True, rnd.randint(1, 0x7F), 30, 280)
+            frames.append(wm)
+        elif roll < 0.65:
+            frames.append(_bulk(wm))
+        elif roll < 0.75:
+            frames.append(bytes([rnd.choice((0x0E, 0x0F, 0x10))]) + rnd.randint(0, 400).to_bytes(2, "big"))
+        elif roll < 0.80:
+            name = rnd.choice(names)
+            frames.append(bytes([0x08]) + name + b"\x00")
+        else:
+            # Keepalive poll answered with an unchanged status frame.
+            frames.append(frames[-1])
+    return frames[:n]
+
+def fragment(frames: list[bytes], size: int) -> list[bytes]:
+    """Split each frame into notifications of at most `size` bytes, as the link delivers them."""
+    return [frame[i : i + size] for frame in frames for i in range(0, len(frame), size)]
+
+def load_trace(path: str | Path) -> list[bytes]:
+    """Whole RX frames of a binary trace exported by the integration (export_trace service)."""
+    trace = load("trace")
+    return list(trace.reassemble(trace.parse_trace(Path(path).read_bytes()).records))
+
+def load_corpus(path: str | Path) -> list[bytes]:
+    """Frames from a binary trace (.fstr) or a hex text file."""
+    return load_trace(path) if str(path).endswith(".fstr") else load_hex(path)
+
+def load_hex(path: str | Path) -> list[bytes]:
+    frames = []
+    for line in Path(path).read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            frames.append(bytes.fromhex(line))
+    return frames
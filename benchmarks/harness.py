@@ -0,0 +1,137 @@
+"""Measurement helpers shared by the benchmark scripts.
+
+Every benchmark reports a flat {name: {metric: value}} dict so the runner can
+print it, save it as a baseline and compare it with one. Throughput is the best
+of several runs (least disturbed by the rest of the machine); allocations are
+counted with tracemalloc in a separate run so tracing does not skew the timing.
+"""
+from __future__ import annotations
+
+import gc
+import math
+import time
+import tracemalloc
+from typing import Any, Callable, Sequence
+
+# Metrics where a larger value is better; everything else (latency, allocations) is a cost.
+HIGHER_IS_BETTER = ("ops_per_s", "speed_index", "frames_per_s", "commands_per_s")
+# Reported for reading, but depend on the machine's current speed; see speed_index.
+NOT_COMPARED = ("ops_per_s", "ns_per_op")
+
+def _reference() -> Callable[[int], Any]:
+    """Fixed dict/tuple workload timed next to each benchmark (see speed_index)."""
+    table: dict[int, tuple[int, int]] = {}
+
+    def op(i: int) -> Any:
+        table[i & 63] = (i, i + 1)
+        return table.get(i >> 1)
+    return op
+
+_REFERENCE_ITEMS = range(2000)
+
+def throughput(
+    items: Sequence[Any],
+    make_op: Callable[[], Callable[[Any], Any]],
+    repeat: int = 5,
+    min_time: float = 0.05,
+) -> dict[str, float]:
+    """Best ops/s and ns/op of applying a fresh `make_op()` to every item, over `repeat` runs.
+
+    Each run passes over the items as often as needed to last at least `min_time`,
+    so short batches are not dominated by timer resolution and scheduling noise.
+    A reference workload is timed alternately with the benchmark; speed_index is
+    the ratio of the two, which stays comparable when the machine's speed drifts
+    (frequency scaling, noisy neighbours) and is what regressions are judged on.
+    """
+    def timed(items, make_op, rounds: int) -> float:
+        op = make_op()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for item in items:
+                op(item)
+        return time.perf_counter() - start
+
+    def calibrate(items, make_op) -> int:
+        return max(1, math.ceil(min_time / max(timed(items, make_op, 1), 1e-9)))
+
+    gc.collect()
+    # Like timeit: a collection landing in one run but not another is noise.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        rounds = calibrate(items, make_op)
+        ref_rounds = calibrate(_REFERENCE_ITEMS, _reference)
+        best = ref_best = float("inf")
+        for _ in range(repeat):
+            best = min(best, timed(items, make_op, rounds) / rounds)
+            ref_best = min(ref_best, timed(_REFERENCE_ITEMS, _reference, ref_rounds) / ref_rounds)
+    finally:
+        if enabled:
+            gc.enable()
+    ops_per_s = len(items) / best
+    return {
+        "ops_per_s": ops_per_s,
+        "ns_per_op": best * 1e9 / len(items),
+        "speed_index": ops_per_s / (len(_REFERENCE_ITEMS) / ref_best),
+    }
+
+def allocations(items: Sequence[Any], make_op: Callable[[], Callable[[Any], Any]]) -> dict[str, float]:
+    """Memory blocks and bytes per operation for what the operation returns or keeps.
+
+    Results are held until the snapshot is taken, so the objects an operation
+    hands back (dicts, frames) are counted; temporaries freed inside it are not.
+    """
+    op = make_op()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        kept = [op(item) for item in items]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    own = tracemalloc.Filter(False, __file__)
+    stats = after.filter_traces((own,)).compare_to(before.filter_traces((own,)), "filename")
+    del kept
+    blocks = sum(s.count_diff for s in stats if s.count_diff > 0)
+    size = sum(s.size_diff for s in stats if s.size_diff > 0)
+    return {"allocs_per_op": blocks / len(items), "bytes_per_op": size / len(items)}
+
+def micro(items: Sequence[Any], make_op: Callable[[], Callable[[Any], Any]], repeat: int = 5) -> dict[str, float]:
+    return {**throughput(items, make_op, repeat), **allocations(items, make_op)}
+
+def percentiles(samples: Sequence[float], points: Sequence[float] = (0.5, 0.99)) -> dict[str, float]:
+    """Nearest-rank percentiles of `samples` (seconds), reported in milliseconds."""
+    if not samples:
+        return {f"p{round(p * 100)}_ms": float("nan") for p in points}
+    ordered = sorted(samples)
+    out = {}
+    for p in points:
+        index = min(len(ordered) - 1, max(0, round(p * len(ordered) + 0.5) - 1))
+        out[f"p{round(p * 100)}_ms"] = ordered[index] * 1000.0
+    return out
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baselines: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Regressions of more than `tolerance` (fraction) against the baselines."""
+    regressions = []
+    for name, metrics in results.items():
+        base = baselines.get(name)
+        if not base:
+            continue
+        for metric, value in metrics.items():
+            ref = base.get(metric)
+            if metric in NOT_COMPARED or not ref or value != value:  # no baseline, or NaN
+                continue
+            if metric in HIGHER_IS_BETTER:
+                worse = value < ref * (1 - tolerance)
+            else:
+                # Allocation counts are exact; allow half an allocation of noise.
+                slack = 0.5 if metric == "allocs_per_op" else 0.0
+                worse = value > ref * (1 + tolerance) + slack
+            if worse:
+                regressions.append(f"{name}: {metric} {value:,.2f} vs baseline {ref:,.2f}")
+    return regressions
@@ -0,0 +1,76 @@
+"""Run the benchmark suite and compare it with the stored baselines.
+
+    python benchmarks/run_benchmarks.py            # codec + state, compare with baselines.json
+    python benchmarks/run_benchmarks.py --e2e      # also the simulated end-to-end scenarios
+    python benchmarks/run_benchmarks.py --save     # record the results as the new baselines
+
+Exits with status 1 when a metric regressed by more than --tolerance. Raw ops/s
+depend on the machine and are only printed; microbenchmarks are judged on
+speed_index (throughput relative to a reference workload timed alongside) and
+allocations per operation. End-to-end results are machine dependent, so their
+baselines are only recorded with --e2e --save on the machine that compares them.
+When a change is expected to move a number, update baselines.json in the same PR.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+from corpus import load_corpus, synthetic_session
+from harness import compare
+import bench_codec
+import bench_state
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--corpus", help="binary trace (.fstr) or text file with one hex frame per line")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--e2e", action="store_true", help="run the end-to-end scenarios (needs Home Assistant)")
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed regression as a fraction")
+    parser.add_argument("--baselines", type=Path, default=BASELINES)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baselines")
+    args = parser.parse_args()
+
+    frames = load_corpus(args.corpus) if args.corpus else synthetic_session(args.frames)
+    corpus = args.corpus or f"synthetic:{args.frames}"
+    results = {**bench_codec.run(frames, args.repeat), **bench_state.run(frames, args.repeat)}
+    if args.e2e:
+        import bench_e2e
+
+        results.update(bench_e2e.run(devices=args.devices))
+
+    for name, metrics in results.items():
+        print(f"{name:28s} " + "  ".join(f"{k} {v:,.2f}" for k, v in metrics.items()))
+
+    if args.save:
+        baselines = {
+            "meta": {"corpus": corpus, "python": platform.python_version(), "machine": platform.machine()},
+            "results": {name: {k: round(v, 4) for k, v in metrics.items()} for name, metrics in results.items()},
+        }
+        args.baselines.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"saved {len(results)} baselines to {args.baselines}")
+        return 0
+
+    if not args.baselines.exists():
+        print("no baselines to compare with (run with --save)")
+        return 0
+    stored = json.loads(args.baselines.read_text())
+    if stored.get("meta", {}).get("corpus") != corpus:
+        print(f"baselines were recorded on {stored.get('meta', {}).get('corpus')}, not {corpus}; not comparing")
+        return 0
+    regressions = compare(results, stored.get("results", {}), args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.baselines.name}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,25 @@ from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
 from homeassistant.components import bluetooth
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, CONF_ADDRESS, CONF_NAME
+from .const import (
+    DOMAIN,
+    CONF_ADDRESS,
+    CONF_NAME,
+    DATA_SLOT_SCHEDULER,
+    CONF_SLOTS_PER_ADAPTER,
+    CONF_LEASE_IDLE_RECLAIM,
+    DEFAULT_SLOTS_PER_ADAPTER,
+    DEFAULT_LEASE_IDLE_RECLAIM,
+)
+from .cache import FelshareStateCache
 from .coordinator import FelshareCoordinator
+from .gatt_cache import GattHandleCache
+from .journal import CommandJournal
+from .scheduler import FelshareSlotScheduler, get_slot_scheduler
+from .services import async_setup_services
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
@@ -19,6 +35,14 @@ PLATFORMS: list[Platform] = [
     Platform.BUTTON,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Create the connection-slot scheduler shared by all Felshare entries and register services."""
+    hass.data.setdefault(DOMAIN, {})[DATA_SLOT_SCHEDULER] = FelshareSlotScheduler(hass)
+    async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Felshare BLE from a config entry.
 
@@ -36,8 +60,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     address = entry.data[CONF_ADDRESS]
     name = entry.data.get(CONF_NAME, address)
 
-    coordinator = FelshareCoordinator(hass, address, name)
+    get_slot_scheduler(hass).set_limits(
+        entry.entry_id,
+        entry.options.get(CONF_SLOTS_PER_ADAPTER, DEFAULT_SLOTS_PER_ADAPTER),
+        entry.options.get(CONF_LEASE_IDLE_RECLAIM, DEFAULT_LEASE_IDLE_RECLAIM),
+    )
+    coordinator = FelshareCoordinator(hass, address, name, entry.options)
+    # Entities come up with the last known state while the first connect is pending.
+    await coordinator.async_restore()
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -46,9 +78,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     coordinator: FelshareCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
     ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     await coordinator.async_stop()
+    get_slot_scheduler(hass).remove_limits(entry.entry_id)
     return ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the cached state, GATT handles and command journal of a removed device."""
+    await FelshareStateCache(hass, entry.data[CONF_ADDRESS]).async_remove()
+    await GattHandleCache(hass, entry.data[CONF_ADDRESS]).async_remove()
+    await CommandJournal(hass, entry.data[CONF_ADDRESS], {}).async_remove()
@@ -2,8 +2,12 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import heapq
+import itertools
 import logging
-from typing import Callable, Any
+import time
+from typing import Any, Awaitable, Callable, NamedTuple, Sequence
 
 from bleak import BleakError
 from bleak.backends.device import BLEDevice
@@ -17,90 +21,591 @@ from bleak_retry_connector import (
     establish_connection,
 )
 
-from .const import NUS_RX_CHAR_UUID, NUS_TX_CHAR_UUID, CONNECT_TIMEOUT
-from .protocol import decode_frame
+from .const import (
+    NUS_RX_CHAR_UUID,
+    NUS_TX_CHAR_UUID,
+    CONNECT_TIMEOUT,
+    CONNECT_ATTEMPTS,
+    CONNECT_DEADLINE_MARGIN,
+    PRIORITY_USER,
+    PRIORITY_POLL,
+    COMMAND_DEADLINES,
+    COMMAND_QUEUE_MAX,
+    POLICY_ALWAYS,
+    POLICY_TRANSACTION,
+    DEFAULT_CONNECTION_POLICY,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_ACTIVE_WINDOW,
+    TRANSACTION_LINGER,
+    REPLY_TIMEOUT,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_BACKOFF_BASE,
+    BREAKER_BACKOFF_MAX,
+    TRACE_CAPACITY,
+    PATH_FAILOVER_ATTEMPTS,
+    PATH_FAILURE_PENALTY,
+    PATH_FAILURE_COOLDOWN,
+)
+from .breaker import ConnectBreaker
+from .protocol import FrameDecoder, reply_matcher
+from .framing import FrameAssembler, DEFAULT_MAX_PAYLOAD
+from .gatt_cache import GattHandleCache, nus_snapshot
+from .metrics import FelshareMetrics
+from .paths import PathCandidate, PathSelector
+from .scheduler import FelshareSlotScheduler, SlotLease
+from .trace import FrameTrace, RX, TX
 
 _LOGGER = logging.getLogger(__name__)
 
+class CommandQueueFullError(Exception):
+    """Raised when the per-device command queue cannot take another command."""
+
+class NoReplyError(TimeoutError):
+    """Raised when the device did not answer a command within the reply timeout."""
+
+class CircuitOpenError(BleakError):
+    """Raised without trying to connect while the reconnect circuit breaker is open."""
+
+class TransactionError(Exception):
+    """A transaction step failed; the steps before it were sent, the ones after it were not."""
+
+    def __init__(self, step: int, payload: bytes, cause: BaseException) -> None:
+        super().__init__(f"step {step + 1} (0x{payload[0]:02X}) failed: {cause or type(cause).__name__}")
+        self.step = step
+        self.payload = payload
+        self.cause = cause
+
+class TxStep(NamedTuple):
+    """One frame of a transaction."""
+
+    payload: bytes
+    # Wait for the device's reply before the next step (frames without a known reply never wait).
+    wait_reply: bool = True
+    # Pause after the step (after its reply when waiting for one).
+    delay: float = 0.0
+
+def _settle_like(target: asyncio.Future, source: asyncio.Future) -> None:
+    """Done callback: settle `target` the way `source` settled."""
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif (err := source.exception()) is not None:
+        target.set_exception(err)
+    else:
+        target.set_result(source.result())
+
+class _Command:
+    __slots__ = ("priority", "seq", "payload", "response", "deadline", "future", "matcher", "replies", "steps", "step")
+
+    def __init__(self, priority: int, seq: int, payload: bytes, response: bool, deadline: float, future: asyncio.Future) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.payload = payload
+        self.response = response
+        self.deadline = deadline
+        self.future = future
+        # Reply correlation: futures resolved with the first matching notification.
+        self.matcher: Callable[[bytes], bool] | None = None
+        self.replies: list[asyncio.Future] = []
+        # Transactions: all steps are sent by the writer as one unit; `step` is the one in flight.
+        self.steps: tuple[TxStep, ...] | None = None
+        self.step = 0
+
+    def __lt__(self, other: "_Command") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+class _ReplyWaiter:
+    __slots__ = ("matcher", "replies", "opcode", "sent_at")
+
+    def __init__(self, matcher: Callable[[bytes], bool], replies: list[asyncio.Future], opcode: int, sent_at: float) -> None:
+        self.matcher = matcher
+        self.replies = replies
+        self.opcode = opcode
+        self.sent_at = sent_at
+
 class FelshareBleConnection:
-    def __init__(self, hass: HomeAssistant, address: str, name: str, on_state: Callable[[dict[str, Any]], None]) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        name: str,
+        on_state: Callable[[dict[str, Any]], None],
+        scheduler: FelshareSlotScheduler | None = None,
+        on_link_change: Callable[[bool], None] | None = None,
+        policy: str = DEFAULT_CONNECTION_POLICY,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        active_window: float = DEFAULT_ACTIVE_WINDOW,
+        metrics: FelshareMetrics | None = None,
+        client_factory: Callable[..., Awaitable[Any]] | None = None,
+    ) -> None:
         self.hass = hass
         self.address = address
         self.name = name
         self._on_state = on_state
+        self._on_link_change = on_link_change
+        self.metrics = metrics or FelshareMetrics()
+        self._scheduler = scheduler
+        self._lease: SlotLease | None = None
+        self._source: str | None = None
+        self._paths = PathSelector(PATH_FAILURE_PENALTY, PATH_FAILURE_COOLDOWN)
+        self.last_lease_wait: float | None = None
+
+        # Connection policy: when to drop an otherwise healthy link.
+        self.policy = policy
+        self._idle_timeout = float(idle_timeout)
+        self._active_window = float(active_window)
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self._idle_deadline = 0.0
 
         self._client: BleakClientWithServiceCache | None = None
         self._cached_services = None
+        # Replaces the Bluetooth stack (device lookup + establish_connection), e.g.
+        # with simulator.SimulatedDiffuser.connect: (device, disconnected_callback, use_services_cache).
+        self._client_factory = client_factory
+        self._gatt_cache = GattHandleCache(hass, address)
+        self._breaker = ConnectBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_BACKOFF_BASE, BREAKER_BACKOFF_MAX)
+        self.last_connect_time: float | None = None
+        self._decoder = FrameDecoder()
+        self.trace = FrameTrace(TRACE_CAPACITY)
+        self._assembler = FrameAssembler()
+        self._fragment_timer: asyncio.TimerHandle | None = None
+        self.mtu: int | None = None
         self._lock = asyncio.Lock()
         self._connected_event = asyncio.Event()
         self._disconnecting = False
 
+        # Single writer task fed by a priority heap (user > schedule > poll).
+        self._queue: list[_Command] = []
+        self._queue_event = asyncio.Event()
+        self._seq = itertools.count()
+        self._writer_task: asyncio.Task | None = None
+        self._busy = False
+        self._reply_waiters: list[_ReplyWaiter] = []
+        self.reply_latency: dict[int, float] = {}  # last command→echo latency per opcode
+
     @property
     def is_connected(self) -> bool:
         return self._client is not None and getattr(self._client, "is_connected", False)
 
-    async def _get_ble_device(self) -> BLEDevice | None:
-        """Return the best known BLEDevice for the configured address.
+    def _path_candidates(self) -> list[PathCandidate]:
+        """Every connectable scanner that currently sees the device."""
+        try:
+            seen = bluetooth.async_scanner_devices_by_address(self.hass, self.address, connectable=True)
+        except Exception:
+            seen = []
+        free = self._free_slots()
+        now = time.monotonic()
+        candidates = []
+        for item in seen:
+            scanner = getattr(item, "scanner", None)
+            source = getattr(scanner, "source", None) or "default"
+            heard = (getattr(scanner, "discovered_device_timestamps", None) or {}).get(self.address)
+            candidates.append(
+                PathCandidate(
+                    source,
+                    getattr(getattr(item, "advertisement", None), "rssi", None),
+                    max(0.0, now - heard) if heard is not None else None,
+                    free(source),
+                    item.ble_device,
+                )
+            )
+        if not candidates:
+            # Older Home Assistant, or only the cached device: fall back to the last service info.
+            try:
+                service_info = bluetooth.async_last_service_info(self.hass, self.address, connectable=True)
+            except Exception:
+                service_info = None
+            device = getattr(service_info, "device", None) or bluetooth.async_ble_device_from_address(
+                self.hass, self.address, connectable=True
+            )
+            if device is not None:
+                source = getattr(service_info, "source", None) or "default"
+                heard = getattr(service_info, "time", None)
+                candidates.append(
+                    PathCandidate(
+                        source,
+                        getattr(service_info, "rssi", None),
+                        max(0.0, now - heard) if heard is not None else None,
+                        free(source),
+                        device,
+                    )
+                )
+        return candidates
+
+    def _free_slots(self) -> Callable[[str], int | None]:
+        """Free connection slots per source: what the scanner reports, capped by our own budget."""
+        reported: dict[str, int] = {}
+        current_allocations = getattr(bluetooth, "async_current_allocations", None)
+        if current_allocations is not None:
+            try:
+                for allocation in current_allocations(self.hass) or ():
+                    source = getattr(allocation, "adapter", None) or getattr(allocation, "source", None)
+                    if source is not None and getattr(allocation, "free", None) is not None:
+                        reported[source] = int(allocation.free)
+            except Exception:
+                _LOGGER.debug("%s: could not read connection slot allocations", self.address, exc_info=True)
+
+        def free(source: str) -> int | None:
+            slots = reported.get(source)
+            if self._scheduler is not None:
+                own = self._scheduler.slots_per_adapter - self._scheduler.leases_on(source)
+                slots = own if slots is None else min(slots, own)
+            return slots
+        return free
+
+    def _ranked_paths(self) -> list[PathCandidate]:
+        return self._paths.rank(self._path_candidates(), time.monotonic())
 
-        Prefer the latest BluetoothServiceInfo (best RSSI) to avoid stale cache.
+    def _get_ble_device(self) -> BLEDevice | None:
+        """The device as seen through the chosen path (bleak_retry_connector's ble_device_callback).
+
+        Falls back to the best ranked path when the chosen scanner lost the device.
         """
+        paths = self._ranked_paths()
+        for path in paths:
+            if path.source == self._source:
+                return path.device
+        return paths[0].device if paths else None
+
+    @property
+    def adapter(self) -> str:
+        """Scanner source (adapter or proxy) the device is / would be reached through."""
+        if self._lease is not None:
+            return self._lease.source
+        if self._source is None and self._client_factory is None:
+            paths = self._ranked_paths()
+            self._source = paths[0].source if paths else None
+        return self._source or "default"
+
+    def _disconnected(self, client) -> None:
+        if client is not self._client:
+            return  # a client we dropped ourselves (disconnect / failed connect)
+        _LOGGER.debug("%s disconnected", self.address)
+        self.metrics.unexpected_disconnects += 1
+        self._connected_event.clear()
+        self._cancel_timers()
+        self._release_slot()
+        self._link_changed(False)
+
+    def _link_changed(self, connected: bool) -> None:
+        if self._on_link_change is not None:
+            self._on_link_change(connected)
+
+    def _release_slot(self) -> None:
+        if self._scheduler is not None and self._lease is not None:
+            self._scheduler.release(self._lease)
+        self._lease = None
+
+    def _touch(self, keep_alive: float | None = None) -> None:
+        """Record link traffic: refresh the slot lease and push out the idle timer."""
+        if self._lease is not None:
+            self._lease.touch()
+        if self.policy == POLICY_ALWAYS or not self.is_connected:
+            return
+        if keep_alive is None:
+            keep_alive = TRANSACTION_LINGER if self.policy == POLICY_TRANSACTION else self._idle_timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + keep_alive
+        if self._idle_handle is not None:
+            if self._idle_deadline >= deadline:
+                return
+            self._idle_handle.cancel()
+        self._idle_deadline = deadline
+        self._idle_handle = loop.call_at(deadline, self._on_idle)
+
+    def _cancel_timers(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self._fragment_timer is not None:
+            self._fragment_timer.cancel()
+            self._fragment_timer = None
+
+    def _on_idle(self) -> None:
+        self._idle_handle = None
+        if not self.is_connected:
+            return
+        if self._busy or self._queue or self._reply_waiters:
+            # Still working or waiting for an echo; check again shortly.
+            self._touch(TRANSACTION_LINGER)
+            return
+        _LOGGER.debug("Disconnecting idle link to %s (policy %s)", self.address, self.policy)
+        self.hass.async_create_task(self.disconnect())
+
+    def slot_stats(self) -> dict[str, Any]:
+        if self._scheduler is None:
+            return {}
+        source = self._lease.source if self._lease is not None else (self._source or "default")
+        stats = self._scheduler.as_dict()
+        return {
+            "adapter": source,
+            "holds_lease": self._lease is not None,
+            "leases_on_adapter": self._scheduler.leases_on(source),
+            "waiting_on_adapter": self._scheduler.waiting_on(source),
+            "leases_held_total": self._scheduler.leases_held,
+            "wait_avg_s": stats["wait_avg_s"],
+            "wait_max_s": stats["wait_max_s"],
+        }
+
+    async def _reclaim_slot(self) -> None:
+        """Give the connection slot back to a waiting device unless we are busy."""
+        if self._busy or self._queue:
+            return
+        _LOGGER.debug("Releasing idle connection to %s for another device", self.address)
+        await self.disconnect()
+
+    def _advertised_at(self) -> float | None:
+        """Monotonic time of the latest connectable advertisement, if any."""
+        if self._client_factory is not None:
+            return time.monotonic()  # no advertisements to go by
         try:
             service_info = bluetooth.async_last_service_info(self.hass, self.address, connectable=True)
-            if service_info is not None:
-                dev = getattr(service_info, "device", None) or getattr(service_info, "ble_device", None)
-                if dev is not None:
-                    return dev
         except Exception:
-            pass
-        return bluetooth.async_ble_device_from_address(self.hass, self.address, connectable=True)
+            return None
+        return getattr(service_info, "time", None) if service_info is not None else None
 
-    def _disconnected(self, _client) -> None:
-        _LOGGER.debug("%s disconnected", self.address)
-        self._connected_event.clear()
+    def _breaker_error(self, now: float) -> CircuitOpenError:
+        return CircuitOpenError(
+            f"{self.address} unreachable after {self._breaker.failures} failed connects; "
+            f"next attempt in {self._breaker.retry_in(now):.0f}s once it advertises again"
+        )
+
+    def breaker_stats(self) -> dict[str, Any]:
+        return self._breaker.as_dict(time.monotonic())
 
-    async def connect(self) -> None:
+    async def connect(self, deadline: float | None = None) -> None:
+        """Connect unless connected; `deadline` (event-loop time) bounds the attempt.
+
+        Running out of time counts as a failed connect, like any other error.
+        """
+        wait_started = time.monotonic()
         async with self._lock:
+            self.metrics.lock_wait.observe(time.monotonic() - wait_started)
             if self.is_connected:
                 return
+            now = time.monotonic()
+            if not self._breaker.allow(now, self._advertised_at()):
+                raise self._breaker_error(now)
+            try:
+                async with asyncio.timeout_at(deadline):
+                    await self._connect(deadline)
+            except asyncio.CancelledError:
+                self._breaker.cancel_probe()
+                raise
+            except Exception:
+                self.metrics.connect_failures += 1
+                self._breaker.record_failure(time.monotonic())
+                raise
+            self.metrics.connects += 1
+            self._breaker.record_success()
 
-            # Ensure there is at least one connectable Bluetooth scanner/adapter.
-            if bluetooth.async_scanner_count(self.hass, connectable=True) == 0:
-                raise BleakError(
-                    "No connectable Bluetooth scanners are available. "
-                    "Check Settings → Devices & Services → Bluetooth (USB adapter or Bluetooth Proxy)."
+    async def _connect(self, deadline: float | None = None) -> None:
+        """Connect through the best ranked path, falling over to the next one on failure.
+
+        The best path gets up to a full CONNECT_TIMEOUT of the time left until
+        `deadline`, so a slow but healthy connect is not cut short; what remains
+        after it is shared between the failover paths.
+        """
+        paths = self._find_paths()
+        loop = asyncio.get_running_loop()
+        for attempt, path in enumerate(paths):
+            if path is None:
+                await self._connect_path(None)
+                return
+            self._source = path.source
+            started = time.monotonic()
+            if deadline is None:
+                path_deadline = loop.time() + CONNECT_TIMEOUT * CONNECT_ATTEMPTS
+            elif attempt == 0 and len(paths) > 1:
+                path_deadline = min(loop.time() + CONNECT_TIMEOUT, deadline)
+            else:
+                path_deadline = loop.time() + (deadline - loop.time()) / (len(paths) - attempt)
+            try:
+                async with asyncio.timeout_at(path_deadline):
+                    await self._connect_path(path.device)
+            except Exception as err:
+                self._paths.record_failure(path.source, time.monotonic())
+                if attempt + 1 == len(paths):
+                    raise
+                self._paths.failovers += 1
+                _LOGGER.debug(
+                    "%s: connect through %s failed (%s), trying %s",
+                    self.address, path.source, err or type(err).__name__, paths[attempt + 1].source,
                 )
+                continue
+            self._paths.record_success(path.source, time.monotonic() - started)
+            return
 
-            device = await self._get_ble_device()
-            if device is None:
-                raise BleakNotFoundError(f"{self.address} not found / not reachable")
-
-            _LOGGER.debug("Connecting to %s (%s)", self.name, self.address)
-            self._disconnecting = False
-
-            client = await establish_connection(
-                BleakClientWithServiceCache,
-                device,
-                self.name,
-                disconnected_callback=self._disconnected,
-                cached_services=self._cached_services,
-                ble_device_callback=self._get_ble_device,
-                timeout=CONNECT_TIMEOUT,
+    async def _connect_path(self, device: BLEDevice | None) -> None:
+        if self._scheduler is not None and self._lease is None:
+            self._lease, self.last_lease_wait = await self._scheduler.acquire(
+                self._source or "default", self.address, self._reclaim_slot
             )
-            self._client = client
-            try:
-                if client.services is not None:
-                    self._cached_services = client.services
-            except Exception:
-                pass
 
+        _LOGGER.debug("Connecting to %s (%s)", self.name, self.address)
+        self._disconnecting = False
+
+        loop = asyncio.get_running_loop()
+        try:
+            await self._gatt_cache.async_load()
+        except Exception:
+            _LOGGER.debug("%s: could not load GATT handles", self.address, exc_info=True)
+        try:
+            known = self._gatt_cache.snapshot is not None
+            started = loop.time()
+            client = await self._establish(device)
+            snapshot = nus_snapshot(client.services)
+            if known and not self._gatt_cache.matches(snapshot):
+                # The backend returned services that differ from the handles we
+                # know (e.g. after a firmware update): clear its cache and rediscover.
+                _LOGGER.debug("%s: cached GATT handles do not match, rediscovering", self.address)
+                await self._invalidate_services(client)
+                known = False
+                client = await self._establish(device, fresh=True)
+                snapshot = nus_snapshot(client.services)
+            if snapshot is None:
+                await self._drop_client(client)
+                raise BleakError(f"{self.address}: Nordic UART service not found")
+        except BaseException:
+            self._release_slot()
+            raise
+        self._client = client
+        self._cached_services = client.services
+
+        self._read_mtu(client)
+        self._assembler.reset()
+        try:
             await client.start_notify(NUS_RX_CHAR_UUID, self._handle_notify)
-            self._connected_event.set()
+        except BaseException:
+            self._client = None
+            await self._drop_client(client)
+            self._release_slot()
+            raise
+        self._record_connect(known, loop.time() - started)
+        try:
+            await self._gatt_cache.async_update(snapshot)
+        except Exception:
+            _LOGGER.debug("%s: could not save GATT handles", self.address, exc_info=True)
+        self._connected_event.set()
+        self._touch()
+        self._link_changed(True)
+
+    def _find_paths(self) -> list[PathCandidate | None]:
+        """Paths to try, best first; [None] when a client factory replaces the Bluetooth stack."""
+        if self._client_factory is not None:
+            return [None]
+        # Ensure there is at least one connectable Bluetooth scanner/adapter.
+        if bluetooth.async_scanner_count(self.hass, connectable=True) == 0:
+            raise BleakError(
+                "No connectable Bluetooth scanners are available. "
+                "Check Settings → Devices & Services → Bluetooth (USB adapter or Bluetooth Proxy)."
+            )
+
+        paths = self._ranked_paths()
+        if not paths:
+            raise BleakNotFoundError(f"{self.address} not found / not reachable")
+        return paths[:PATH_FAILOVER_ATTEMPTS]
+
+    async def _establish(self, device: BLEDevice | None, fresh: bool = False) -> BleakClientWithServiceCache:
+        """Connect, letting the backend use its service cache unless `fresh` discovery is needed."""
+        if self._client_factory is not None:
+            return await self._client_factory(device, self._disconnected, not fresh)
+        return await establish_connection(
+            BleakClientWithServiceCache,
+            device,
+            self.name,
+            disconnected_callback=self._disconnected,
+            cached_services=None if fresh else self._cached_services,
+            ble_device_callback=self._get_ble_device,
+            max_attempts=CONNECT_ATTEMPTS,
+            use_services_cache=not fresh,
+            timeout=CONNECT_TIMEOUT,
+        )
+
+    async def _drop_client(self, client: BleakClientWithServiceCache) -> None:
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
+
+    async def _invalidate_services(self, client: BleakClientWithServiceCache) -> None:
+        """Forget the persisted handles and the backend's cached services, then drop the link."""
+        self._cached_services = None
+        try:
+            await client.clear_cache()
+        except Exception:
+            _LOGGER.debug("%s: clearing the service cache failed", self.address, exc_info=True)
+        try:
+            await self._gatt_cache.async_invalidate()
+        except Exception:
+            _LOGGER.debug("%s: could not remove GATT handles", self.address, exc_info=True)
+        await self._drop_client(client)
+
+    def _record_connect(self, handles_known: bool, elapsed: float) -> None:
+        """Connect latency (lease granted → notifications on), split by whether the
+        services matched GATT handles stored on a previous connect, or there were
+        none stored or they did not match and discovery ran again.
+
+        This is not whether discovery was skipped: that is up to the backend's own
+        service cache, which the integration cannot observe."""
+        self.last_connect_time = elapsed
+        (self.metrics.connect_handles_known if handles_known else self.metrics.connect_handles_new).observe(elapsed)
+        _LOGGER.debug(
+            "%s: connect with %s GATT handles took %.2fs", self.address, "known" if handles_known else "new", elapsed
+        )
+
+    def connect_stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            "handles_new": self.metrics.connect_handles_new.as_dict(),
+            "handles_known": self.metrics.connect_handles_known.as_dict(),
+        }
+        stats["gatt_handles_known"] = self._gatt_cache.snapshot is not None
+        stats["gatt_invalidations"] = self._gatt_cache.invalidations
+        stats["breaker"] = self.breaker_stats()
+        stats["paths"] = self.path_stats()
+        return stats
+
+    def path_stats(self) -> dict[str, Any]:
+        """The current ranking of the scanners that see the device, and how each path did."""
+        now = time.monotonic()
+        ranked = [] if self._client_factory is not None else self._ranked_paths()
+        return {
+            "source": self._source,
+            "ranking": [
+                {
+                    "source": path.source,
+                    "score": round(self._paths.score(path, now), 1),
+                    "rssi": path.rssi,
+                    "age_s": round(path.age, 1) if path.age is not None else None,
+                    "free_slots": path.free_slots,
+                }
+                for path in ranked
+            ],
+            **self._paths.as_dict(),
+        }
+
+    def _read_mtu(self, client: BleakClientWithServiceCache) -> None:
+        """Learn the MTU from the public client API so fragments are judged against the right size.
+
+        ESPHome proxies negotiate it while connecting; where the backend has not
+        exchanged it yet, bleak reports the default of 23.
+        """
+        try:
+            mtu = int(client.mtu_size)
+        except Exception:
+            mtu = DEFAULT_MAX_PAYLOAD + 3
+        self.mtu = mtu
+        self._assembler.max_payload = max(DEFAULT_MAX_PAYLOAD, mtu - 3)
+        _LOGGER.debug("%s: MTU %s", self.address, mtu)
 
     async def disconnect(self) -> None:
         async with self._lock:
             self._disconnecting = True
             self._connected_event.clear()
+            self._cancel_timers()
             if self._client is None:
+                self._release_slot()
                 return
             client = self._client
             self._client = None
@@ -112,22 +617,325 @@ class FelshareBleConnection:
                 await client.disconnect()
             except Exception:
                 pass
+            self._release_slot()
+            self._link_changed(False)
 
-    async def ensure_connected(self) -> None:
+    async def ensure_connected(self, deadline: float | None = None) -> None:
         if self.is_connected:
             return
-        await self.connect()
+        # Fail fast instead of queueing on the lock behind a connect that will be refused.
+        now = time.monotonic()
+        if not self._breaker.would_allow(now, self._advertised_at()):
+            self._breaker.fast_fails += 1
+            raise self._breaker_error(now)
+        await self.connect(deadline)
 
     def _handle_notify(self, _sender: int, data: bytearray) -> None:
-        frame = bytes(data)
-        if not frame:
+        if not data:
             return
-        st = decode_frame(frame)
+        self.trace.record(RX, data)
+        self._touch()
+        loop = asyncio.get_running_loop()
+        for frame in self._assembler.feed(data, loop.time()):
+            self._process_frame(frame)
+        self._arm_fragment_timer(loop)
+
+    def _arm_fragment_timer(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._fragment_timer is not None:
+            self._fragment_timer.cancel()
+            self._fragment_timer = None
+        if self._assembler.pending:
+            self._fragment_timer = loop.call_at(self._assembler.deadline, self._on_fragment_timeout)
+
+    def _on_fragment_timeout(self) -> None:
+        self._fragment_timer = None
+        loop = asyncio.get_running_loop()
+        for frame in self._assembler.flush_stale(loop.time()):
+            self._process_frame(frame)
+        self._arm_fragment_timer(loop)
+
+    def _process_frame(self, frame: bytes | bytearray) -> None:
+        # Decoded in place from the buffer; repeated frames are skipped.
+        self.metrics.frame(frame[0])
+        st = self._decoder.decode(frame)
         if st:
             self._on_state(st)
+        elif st is not None:
+            self.metrics.decode_misses += 1
+        if self._reply_waiters:
+            self._resolve_replies(bytes(frame))
+
+    def framing_stats(self) -> dict[str, Any]:
+        return {"mtu": self.mtu, **self._assembler.as_dict(), "duplicates": self._decoder.duplicates}
+
+    def _resolve_replies(self, frame: bytes) -> None:
+        for waiter in self._reply_waiters:
+            if not waiter.matcher(frame):
+                continue
+            self._reply_waiters.remove(waiter)
+            latency = asyncio.get_running_loop().time() - waiter.sent_at
+            self.reply_latency[waiter.opcode] = latency
+            self.metrics.reply_latency.observe(latency)
+            _LOGGER.debug("%s: 0x%02X answered in %.0f ms", self.address, waiter.opcode, latency * 1000)
+            for fut in waiter.replies:
+                if not fut.done():
+                    fut.set_result(frame)
+            return
+
+    async def write(
+        self,
+        payload: bytes,
+        response: bool = False,
+        priority: int = PRIORITY_USER,
+        timeout: float | None = None,
+    ) -> None:
+        """Queue a frame for the writer task and wait until it was sent.
+
+        Commands are sent in priority order; a command that is still queued when its
+        deadline passes fails with TimeoutError instead of being sent late.
+        """
+        await self._enqueue(payload, response, priority, timeout).future
+
+    async def request(
+        self,
+        payload: bytes,
+        priority: int = PRIORITY_USER,
+        timeout: float | None = None,
+        reply_timeout: float = REPLY_TIMEOUT,
+    ) -> bytes:
+        """Send a command and wait for the notification that answers it.
+
+        Returns the reply frame; raises NoReplyError when the device stays silent.
+        Commands without a known reply behave like write() and return b"".
+        """
+        matcher = reply_matcher(payload)
+        if matcher is None:
+            await self.write(payload, priority=priority, timeout=timeout)
+            return b""
+        reply = asyncio.get_running_loop().create_future()
+        cmd = self._enqueue(payload, False, priority, timeout, matcher, reply)
+        try:
+            await cmd.future
+            async with asyncio.timeout(reply_timeout):
+                return await reply
+        except TimeoutError as err:
+            if cmd.future.done() and not cmd.future.cancelled() and cmd.future.exception() is None:
+                raise NoReplyError(f"{self.address}: no reply to 0x{payload[0]:02X} within {reply_timeout:.0f}s") from err
+            raise
+        finally:
+            reply.cancel()
+            self._drop_reply_waiter(reply)
+
+    async def transaction(
+        self,
+        steps: Sequence[TxStep],
+        priority: int = PRIORITY_USER,
+        timeout: float | None = None,
+    ) -> list[bytes]:
+        """Send `steps` in order as one unit: one connect, nothing interleaved.
+
+        Each step waits for its reply (or its delay) before the next one is sent.
+        Returns the reply of every step (b"" for steps that do not wait); raises
+        TransactionError naming the step that failed.
+        """
+        steps = tuple(steps)
+        if not steps:
+            return []
+        if timeout is None:
+            timeout = COMMAND_DEADLINES.get(priority, CONNECT_TIMEOUT) + sum(REPLY_TIMEOUT + s.delay for s in steps)
+        cmd = self._enqueue(steps[0].payload, False, priority, timeout, steps=steps)
+        return await cmd.future
+
+    def _drop_reply_waiter(self, reply: asyncio.Future) -> None:
+        for waiter in self._reply_waiters:
+            if reply in waiter.replies:
+                waiter.replies.remove(reply)
+                if not waiter.replies:
+                    self._reply_waiters.remove(waiter)
+                return
 
-    async def write(self, payload: bytes, response: bool = False) -> None:
-        await self.ensure_connected()
+    def _enqueue(
+        self,
+        payload: bytes,
+        response: bool,
+        priority: int,
+        timeout: float | None,
+        matcher: Callable[[bytes], bool] | None = None,
+        reply: asyncio.Future | None = None,
+        steps: tuple[TxStep, ...] | None = None,
+    ) -> _Command:
+        loop = asyncio.get_running_loop()
+        if timeout is None:
+            timeout = COMMAND_DEADLINES.get(priority, CONNECT_TIMEOUT)
+        fut = loop.create_future()
+        cmd = _Command(priority, next(self._seq), bytes(payload), response, loop.time() + timeout, fut)
+        if reply is not None:
+            cmd.matcher = matcher
+            cmd.replies.append(reply)
+        cmd.steps = steps
+
+        if priority >= PRIORITY_POLL and steps is None:
+            # A newer poll makes any queued identical poll redundant: it leaves the
+            # queue and its callers get the newer poll's outcome and reply.
+            superseded = [
+                old
+                for old in self._queue
+                if old.priority == priority
+                and old.steps is None
+                and old.payload == cmd.payload
+                and not old.future.done()
+            ]
+            for old in superseded:
+                if old.replies:
+                    cmd.matcher = cmd.matcher or old.matcher
+                    cmd.replies.extend(old.replies)
+                self._queue.remove(old)
+                cmd.future.add_done_callback(functools.partial(_settle_like, old.future))
+            if superseded:
+                heapq.heapify(self._queue)
+        self._prune_queue()
+
+        if len(self._queue) >= COMMAND_QUEUE_MAX:
+            worst = max(self._queue)
+            if not cmd < worst:
+                raise CommandQueueFullError(f"{self.address}: command queue full")
+            self._queue.remove(worst)
+            heapq.heapify(self._queue)
+            if not worst.future.done():
+                worst.future.set_exception(CommandQueueFullError(f"{self.address}: dropped for a higher priority command"))
+
+        heapq.heappush(self._queue, cmd)
+        self._queue_event.set()
+        self._ensure_writer()
+        return cmd
+
+    def _prune_queue(self) -> None:
+        if any(c.future.done() for c in self._queue):
+            self._queue = [c for c in self._queue if not c.future.done()]
+            heapq.heapify(self._queue)
+
+    def _ensure_writer(self) -> None:
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = self.hass.async_create_background_task(
+                self._writer_loop(), f"felshare_ble writer {self.address}"
+            )
+
+    async def _writer_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._queue:
+                self._queue_event.clear()
+                await self._queue_event.wait()
+                continue
+            cmd = heapq.heappop(self._queue)
+            if cmd.future.done():
+                continue
+            if loop.time() >= cmd.deadline:
+                cmd.future.set_exception(TimeoutError(f"{self.address}: command 0x{cmd.payload[0]:02X} expired in queue"))
+                continue
+            self._busy = True
+            result = None
+            try:
+                async with asyncio.timeout_at(cmd.deadline):
+                    await self.ensure_connected(cmd.deadline - CONNECT_DEADLINE_MARGIN)
+                    if cmd.steps is not None:
+                        result = await self._run_steps(cmd)
+                    else:
+                        if cmd.matcher is not None and cmd.replies:
+                            # Register before writing: the echo may arrive before write returns.
+                            self._reply_waiters.append(
+                                _ReplyWaiter(cmd.matcher, cmd.replies, cmd.payload[0], loop.time())
+                            )
+                        await self._write_frame(cmd.payload, cmd.response)
+                    # A user command means someone is watching: keep push updates flowing for a while.
+                    self._touch(
+                        self._active_window
+                        if cmd.priority == PRIORITY_USER and self.policy != POLICY_TRANSACTION
+                        else None
+                    )
+            except asyncio.CancelledError:
+                if not cmd.future.done():
+                    cmd.future.cancel()
+                raise
+            except Exception as err:  # noqa: BLE001 - handed to the caller
+                self.metrics.write_errors += 1
+                cause = err.cause if isinstance(err, TransactionError) else err
+                if isinstance(cause, BleakError) and self.is_connected:
+                    await self.disconnect()
+                if cmd.steps is not None and not isinstance(err, TransactionError):
+                    # Connect failure or the transaction deadline.
+                    err = TransactionError(cmd.step, cmd.steps[cmd.step].payload, err)
+                if not cmd.future.done():
+                    cmd.future.set_exception(err)
+            else:
+                if not cmd.future.done():
+                    cmd.future.set_result(result)
+            finally:
+                self._busy = False
+                self._touch()
+
+    async def _write_frame(self, payload: bytes, response: bool = False) -> None:
         assert self._client is not None
-        async with self._lock:
+        loop = asyncio.get_running_loop()
+        sent = loop.time()
+        self.trace.record(TX, payload)
+        try:
             await self._client.write_gatt_char(NUS_TX_CHAR_UUID, payload, response=response)
+        except BleakError:
+            # The link went bad on this path; the writer drops it so the next
+            # command reconnects, through another path if this one ranks lower now.
+            if self._client_factory is None and self._source is not None:
+                self._paths.record_failure(self._source, time.monotonic())
+            raise
+        self.metrics.writes += 1
+        self.metrics.write_latency.observe(loop.time() - sent)
+
+    async def _run_steps(self, cmd: _Command) -> list[bytes]:
+        loop = asyncio.get_running_loop()
+        replies: list[bytes] = []
+        for i, step in enumerate(cmd.steps):
+            cmd.step = i
+            matcher = reply_matcher(step.payload) if step.wait_reply else None
+            reply: asyncio.Future | None = None
+            if matcher is not None:
+                reply = loop.create_future()
+                self._reply_waiters.append(_ReplyWaiter(matcher, [reply], step.payload[0], loop.time()))
+            try:
+                await self._write_frame(step.payload)
+                if reply is None:
+                    replies.append(b"")
+                else:
+                    try:
+                        async with asyncio.timeout(REPLY_TIMEOUT):
+                            replies.append(await reply)
+                    except TimeoutError as err:
+                        raise NoReplyError(f"no reply within {REPLY_TIMEOUT:.0f}s") from err
+            except Exception as err:
+                raise TransactionError(i, step.payload, err) from err
+            finally:
+                if reply is not None:
+                    reply.cancel()
+                    self._drop_reply_waiter(reply)
+            self._touch()
+            if step.delay:
+                await asyncio.sleep(step.delay)
+        return replies
+
+    async def close(self) -> None:
+        """Stop the writer task, fail queued commands and disconnect."""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        queue, self._queue = self._queue, []
+        for cmd in queue:
+            if not cmd.future.done():
+                cmd.future.cancel()
+        waiters, self._reply_waiters = self._reply_waiters, []
+        for waiter in waiters:
+            for fut in waiter.replies:
+                fut.cancel()
+        await self.disconnect()
@@ -0,0 +1,91 @@
+"""Reconnect circuit breaker.
+
+Without it an unreachable diffuser costs a full connect timeout (and a proxy
+connection slot) on every poll and every user action. After a few consecutive
+failed connects the breaker opens and connects fail fast; after a jittered,
+exponentially growing backoff a single probe (half-open) is allowed, but only
+once the device has been heard advertising again since the last failure.
+"""
+from __future__ import annotations
+
+import random
+from typing import Any
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+class ConnectBreaker:
+    def __init__(
+        self,
+        threshold: int = 2,
+        base: float = 30.0,
+        maximum: float = 900.0,
+        jitter: float = 0.2,
+    ) -> None:
+        self.threshold = max(1, int(threshold))
+        self.base = base
+        self.maximum = maximum
+        self.jitter = jitter
+        self.state = STATE_CLOSED
+        self.failures = 0  # consecutive failed connects
+        self.opened = 0  # consecutive opens, drives the backoff
+        self.failed_at = 0.0
+        self.retry_at = 0.0
+        self.fast_fails = 0
+
+    def allow(self, now: float, advertised_at: float | None) -> bool:
+        """Whether a connect may be attempted now.
+
+        `advertised_at` is the (monotonic) time of the latest connectable
+        advertisement, or None if the device has not been seen.
+        """
+        if self.state == STATE_CLOSED:
+            return True
+        if self.would_allow(now, advertised_at):
+            self.state = STATE_HALF_OPEN
+            return True
+        self.fast_fails += 1
+        return False
+
+    def would_allow(self, now: float, advertised_at: float | None) -> bool:
+        """Like allow() but without starting the half-open probe."""
+        if self.state == STATE_CLOSED:
+            return True
+        return (
+            self.state == STATE_OPEN
+            and now >= self.retry_at
+            and advertised_at is not None
+            and advertised_at > self.failed_at
+        )
+
+    def cancel_probe(self) -> None:
+        """A half-open probe was cancelled before it finished; allow another one."""
+        if self.state == STATE_HALF_OPEN:
+            self.state = STATE_OPEN
+
+    def record_success(self) -> None:
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened = 0
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        self.failed_at = now
+        if self.state == STATE_HALF_OPEN or self.failures >= self.threshold:
+            self.opened += 1
+            delay = min(self.maximum, self.base * 2 ** (self.opened - 1))
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+            self.state = STATE_OPEN
+            self.retry_at = now + delay
+
+    def retry_in(self, now: float) -> float:
+        return max(0.0, self.retry_at - now) if self.state == STATE_OPEN else 0.0
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in_s": round(self.retry_in(now), 1),
+            "fast_fails": self.fast_fails,
+        }
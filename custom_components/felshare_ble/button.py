@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import asyncio
-
 from homeassistant.components.button import ButtonEntity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
@@ -21,6 +19,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     )
 
 class FelshareButton(FelshareEntity, ButtonEntity):
+    _state_keys = ()
+
     def __init__(self, coordinator, key, name):
         super().__init__(coordinator, key, name)
 
@@ -31,10 +31,10 @@ class FelshareButton(FelshareEntity, ButtonEntity):
             await self.coordinator.async_request_bulk()
 
 class FelsharePowerOnSafeButton(FelshareEntity, ButtonEntity):
+    _state_keys = ()
+
     def __init__(self, coordinator):
         super().__init__(coordinator, "power_on_safe", "Power ON (safe)")
 
     async def async_press(self) -> None:
-        await self.coordinator.async_set_power(False)
-        await asyncio.sleep(0.25)
-        await self.coordinator.async_set_power(True)
+        await self.coordinator.async_power_cycle_on()
@@ -0,0 +1,105 @@
+"""Persistent cache of the last known device state.
+
+Entities would otherwise stay unknown after a restart until the first connect and
+the status/bulk replies, which can take minutes across a fleet. The cache keeps the
+last reported value of every field with the time it was reported, plus a
+fingerprint of the schedule so a restored schedule can be trusted without
+re-reading the bulk frame.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, CACHE_SAVE_DELAY, CACHE_SCHEDULE_MAX_AGE
+from .state import FIELDS, SCHEDULE_FIELDS
+
+STORAGE_VERSION = 1
+
+# The device clock is only meaningful at the moment it was reported.
+CACHED_FIELDS = tuple(name for name in FIELDS if name != "device_clock")
+
+def schedule_fingerprint(values: dict[str, Any]) -> str | None:
+    """Short hash of the schedule fields and slots; None if the schedule is incomplete."""
+    if any(values.get(name) is None for name in SCHEDULE_FIELDS):
+        return None
+    parts = [repr(values[name]) for name in SCHEDULE_FIELDS]
+    parts.append(repr(_to_tuple(values.get("work_slots"))))
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+
+def _to_tuple(value: Any) -> Any:
+    """JSON turns tuples into lists; turn them back."""
+    if isinstance(value, list):
+        return tuple(_to_tuple(v) for v in value)
+    return value
+
+class FelshareStateCache:
+    def __init__(self, hass: HomeAssistant, address: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.state.{address.replace(':', '').lower()}"
+        )
+        self._values: dict[str, Any] = {}
+        # Wall-clock time each field was last reported by the device.
+        self._reported_at: dict[str, float] = {}
+        self.schedule_at: float | None = None
+        self.fingerprint: str | None = None
+
+    async def async_load(self) -> dict[str, Any]:
+        """Load the cache; return the restored fields (FelshareState names and types)."""
+        data = await self._store.async_load()
+        if not data:
+            return {}
+        values = {k: _to_tuple(v) for k, v in data.get("state", {}).items() if k in CACHED_FIELDS}
+        self._values = values
+        self._reported_at = {k: float(v) for k, v in data.get("reported_at", {}).items() if k in values}
+        fingerprint = data.get("schedule_fingerprint")
+        if fingerprint is not None and fingerprint == schedule_fingerprint(values):
+            self.fingerprint = fingerprint
+            self.schedule_at = data.get("schedule_at")
+        return dict(values)
+
+    def schedule_fresh(self, now: float | None = None) -> bool:
+        """True when the restored schedule is intact and recent enough to skip the bulk read."""
+        if self.fingerprint is None or self.schedule_at is None:
+            return False
+        return (now or time.time()) - self.schedule_at < CACHE_SCHEDULE_MAX_AGE
+
+    def record(self, partial: dict[str, Any], changed: list[str]) -> None:
+        """Note a decoded frame; schedule a save when anything worth keeping changed."""
+        now = time.time()
+        for key, value in partial.items():
+            if key in CACHED_FIELDS:
+                self._values[key] = value
+                self._reported_at[key] = now
+        schedule_seen = False
+        if "work_slots" in partial or any(key in SCHEDULE_FIELDS for key in partial):
+            fingerprint = schedule_fingerprint(self._values)
+            if fingerprint is not None:
+                self.fingerprint = fingerprint
+                self.schedule_at = now
+                schedule_seen = True
+        if schedule_seen or any(key in CACHED_FIELDS for key in changed):
+            self._store.async_delay_save(self._data, CACHE_SAVE_DELAY)
+
+    def age(self, key: str) -> float | None:
+        reported = self._reported_at.get(key)
+        return None if reported is None else time.time() - reported
+
+    async def async_save(self) -> None:
+        if self._values:
+            await self._store.async_save(self._data())
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    def _data(self) -> dict[str, Any]:
+        return {
+            "state": dict(self._values),
+            "reported_at": dict(self._reported_at),
+            "schedule_fingerprint": self.fingerprint,
+            "schedule_at": self.schedule_at,
+        }
@@ -0,0 +1,135 @@
+"""Coalescing write layer for Felshare BLE setters.
+
+Slider drags and day toggles arrive as bursts of setter calls. Instead of sending
+one frame per call, pending changes are collected per property for a short window
+and flushed together: plain properties keep only the latest value (last writer
+wins) and merged properties (the WorkMode schedule) fold every change into one
+pending value so a burst becomes a single frame. The flush callback reports an
+outcome per property: an exception fails only the callers of that property,
+anything else is their result, so one failed frame does not fail the others
+flushed with it.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Mapping
+
+# Never hold a write back longer than this many windows, even while changes keep coming.
+MAX_WAIT_WINDOWS = 5
+
+class WriteCoalescer:
+    def __init__(
+        self,
+        window: float,
+        flush: Callable[[dict[str, Any]], Awaitable[Mapping[str, Any] | None]],
+    ) -> None:
+        self._window = max(0.0, float(window))
+        self._flush_cb = flush
+        self._pending: dict[str, Any] = {}
+        self._waiters: dict[str, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._first_submit: float | None = None
+        self._flush_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def window(self) -> float:
+        return self._window
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def is_pending(self, prop: str) -> bool:
+        """Whether a change of `prop` is waiting for the next flush."""
+        return prop in self._pending
+
+    def submit(
+        self,
+        prop: str,
+        value: Any,
+        merge: Callable[[Any, Any], Any] | None = None,
+    ) -> asyncio.Future:
+        """Queue a property change; the returned future resolves with its outcome once flushed."""
+        loop = asyncio.get_running_loop()
+        if merge is not None:
+            self._pending[prop] = merge(self._pending.get(prop), value)
+        else:
+            # Re-insert so flush order follows the most recent edit.
+            self._pending.pop(prop, None)
+            self._pending[prop] = value
+
+        fut = loop.create_future()
+        self._waiters.setdefault(prop, []).append(fut)
+        self._schedule(loop)
+        return fut
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        now = loop.time()
+        if self._first_submit is None:
+            self._first_submit = now
+        if self._timer is not None:
+            self._timer.cancel()
+        # Debounce on the last change, but cap the total delay of the oldest change.
+        deadline = min(now + self._window, self._first_submit + self._window * MAX_WAIT_WINDOWS)
+        self._timer = loop.call_at(deadline, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        task = asyncio.get_running_loop().create_task(self._flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self) -> None:
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, {}
+            self._first_submit = None
+            if not pending:
+                return
+            try:
+                outcomes = await self._flush_cb(pending) or {}
+            except asyncio.CancelledError:
+                for futs in waiters.values():
+                    for fut in futs:
+                        if not fut.done():
+                            fut.cancel()
+                raise
+            except Exception as err:  # noqa: BLE001 - surfaced to every caller
+                outcomes = dict.fromkeys(waiters, err)
+            for prop, futs in waiters.items():
+                outcome = outcomes.get(prop)
+                for fut in futs:
+                    if fut.done():
+                        continue
+                    if isinstance(outcome, BaseException):
+                        fut.set_exception(outcome)
+                    else:
+                        fut.set_result(outcome)
+
+    async def async_flush(self) -> None:
+        """Flush pending changes immediately."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._flush()
+
+    async def async_wait_flushed(self) -> None:
+        """Wait until a flush in progress has finished (and its outcomes are set)."""
+        async with self._flush_lock:
+            pass
+
+    def cancel(self) -> None:
+        """Drop pending changes (used on unload)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for task in list(self._tasks):
+            task.cancel()
+        self._pending = {}
+        self._first_submit = None
+        waiters, self._waiters = self._waiters, {}
+        for futs in waiters.values():
+            for fut in futs:
+                if not fut.done():
+                    fut.cancel()
@@ -4,14 +4,41 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.components import bluetooth
+from homeassistant.core import callback
 from homeassistant.helpers.selector import selector
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, CONF_ADDRESS, CONF_NAME
+from .const import (
+    DOMAIN,
+    CONF_ADDRESS,
+    CONF_NAME,
+    CONF_WRITE_COALESCE_MS,
+    DEFAULT_WRITE_COALESCE_MS,
+    CONF_JOURNAL_POWER_EXPIRY,
+    DEFAULT_JOURNAL_POWER_EXPIRY,
+    CONF_JOURNAL_SETTINGS_EXPIRY,
+    DEFAULT_JOURNAL_SETTINGS_EXPIRY,
+    CONF_CONNECTION_POLICY,
+    CONNECTION_POLICIES,
+    DEFAULT_CONNECTION_POLICY,
+    CONF_IDLE_TIMEOUT,
+    DEFAULT_IDLE_TIMEOUT,
+    CONF_ACTIVE_WINDOW,
+    DEFAULT_ACTIVE_WINDOW,
+    CONF_SLOTS_PER_ADAPTER,
+    DEFAULT_SLOTS_PER_ADAPTER,
+    CONF_LEASE_IDLE_RECLAIM,
+    DEFAULT_LEASE_IDLE_RECLAIM,
+)
 
 class FelshareBleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return FelshareBleOptionsFlow(config_entry)
+
     async def async_step_bluetooth(self, discovery_info: bluetooth.BluetoothServiceInfoBleak) -> FlowResult:
         address = discovery_info.address
         name = discovery_info.name or "Felshare Diffuser"
@@ -61,3 +88,58 @@ class FelshareBleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_show_form(step_id="user", data_schema=schema)
+
+class FelshareBleOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_CONNECTION_POLICY,
+                    default=options.get(CONF_CONNECTION_POLICY, DEFAULT_CONNECTION_POLICY),
+                ): selector(
+                    {
+                        "select": {
+                            "options": CONNECTION_POLICIES,
+                            "mode": "list",
+                            "translation_key": CONF_CONNECTION_POLICY,
+                        }
+                    }
+                ),
+                vol.Optional(
+                    CONF_IDLE_TIMEOUT,
+                    default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Optional(
+                    CONF_ACTIVE_WINDOW,
+                    default=options.get(CONF_ACTIVE_WINDOW, DEFAULT_ACTIVE_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Optional(
+                    CONF_WRITE_COALESCE_MS,
+                    default=options.get(CONF_WRITE_COALESCE_MS, DEFAULT_WRITE_COALESCE_MS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                vol.Optional(
+                    CONF_JOURNAL_POWER_EXPIRY,
+                    default=options.get(CONF_JOURNAL_POWER_EXPIRY, DEFAULT_JOURNAL_POWER_EXPIRY),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                vol.Optional(
+                    CONF_JOURNAL_SETTINGS_EXPIRY,
+                    default=options.get(CONF_JOURNAL_SETTINGS_EXPIRY, DEFAULT_JOURNAL_SETTINGS_EXPIRY),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=720)),
+                vol.Optional(
+                    CONF_SLOTS_PER_ADAPTER,
+                    default=options.get(CONF_SLOTS_PER_ADAPTER, DEFAULT_SLOTS_PER_ADAPTER),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                vol.Optional(
+                    CONF_LEASE_IDLE_RECLAIM,
+                    default=options.get(CONF_LEASE_IDLE_RECLAIM, DEFAULT_LEASE_IDLE_RECLAIM),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
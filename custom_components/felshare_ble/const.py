@@ -11,8 +11,112 @@ NUS_RX_CHAR_UUID = "6e400003-b5a3-f393-e0a9-e50e24dcca9e"  # Notify
 CONF_ADDRESS = "address"
 CONF_NAME = "name"
 
-DEFAULT_POLL_INTERVAL_SECONDS = 300  # send status 0x05 every 5 min
+DEFAULT_POLL_INTERVAL_SECONDS = 300  # status 0x05 at most every 5 min when nothing else happens
+POLL_INTERVAL_FAST = 30  # while the unit is being operated or the oil level moves quickly
+POLL_FAST_WINDOW = 300  # seconds the fast interval lasts after the last trigger
+POLL_INTERVAL_MAX = 3600  # backoff cap while the unit is unreachable
+POLL_OIL_FAST_RATE = 20  # mL/h change in oil remaining that counts as "changing quickly"
+POLL_INTERVAL_RELAXED = 600  # while the oil model predicts the level within OIL_MODEL_ACCURATE_ML
+OIL_MODEL_ACCURATE_ML = 2
 CONNECT_TIMEOUT = 30
+CONNECT_ATTEMPTS = 2  # establish_connection attempts per connect, each up to CONNECT_TIMEOUT
+# A connect made for a queued command ends this long before the command's deadline,
+# so it fails (and counts against the breaker) instead of being cancelled with it.
+CONNECT_DEADLINE_MARGIN = 1.0
+
+# Reconnect circuit breaker: after this many failed connects in a row, fail fast
+# and retry after a jittered exponential backoff, once the device advertises again.
+BREAKER_FAILURE_THRESHOLD = 2
+BREAKER_BACKOFF_BASE = 30  # seconds, doubled per consecutive open
+BREAKER_BACKOFF_MAX = 900
+
+# Connection paths (see paths.py): how many scanners one connect tries, and how a
+# failed path is held back (dB-like score per consecutive failure, fading over the cooldown).
+PATH_FAILOVER_ATTEMPTS = 2
+PATH_FAILURE_PENALTY = 15
+PATH_FAILURE_COOLDOWN = 600
+
+# Command queue: lower priority value is sent first.
+PRIORITY_USER = 0  # power/fan/oil changes and explicit refresh requests
+PRIORITY_SCHEDULE = 1  # WorkMode (0x32) writes
+PRIORITY_POLL = 2  # keepalive / background status reads
+COMMAND_DEADLINES = {
+    PRIORITY_USER: CONNECT_TIMEOUT + 10,
+    PRIORITY_SCHEDULE: CONNECT_TIMEOUT + 30,
+    PRIORITY_POLL: CONNECT_TIMEOUT * 2,
+}
+COMMAND_QUEUE_MAX = 32
+REPLY_TIMEOUT = 5.0  # seconds to wait for the device's echo of a command
+REPLY_RETRIES = 1  # resend a command this many times when its echo does not arrive
+OPTIMISTIC_TIMEOUT = 90  # seconds an unconfirmed optimistic value is shown before rolling back
+
+# Persistent state cache (restored at setup so entities show the last known values)
+CACHE_SAVE_DELAY = 10  # seconds; batches bursts of notifications into one write
+CACHE_SCHEDULE_MAX_AGE = 12 * 3600  # seconds a cached schedule is trusted instead of re-reading the bulk frame
+
+# Connection-slot scheduler shared by all entries (options; the smallest across entries applies)
+DATA_SLOT_SCHEDULER = "slot_scheduler"
+CONF_SLOTS_PER_ADAPTER = "slots_per_adapter"
+CONF_LEASE_IDLE_RECLAIM = "lease_idle_reclaim"
+DEFAULT_SLOTS_PER_ADAPTER = 2  # ESPHome proxies default to 3 slots; leave one for other integrations
+DEFAULT_LEASE_IDLE_RECLAIM = 20  # seconds without traffic before a lease may be taken back
+
+# Options
+CONF_WRITE_COALESCE_MS = "write_coalesce_ms"
+DEFAULT_WRITE_COALESCE_MS = 300  # merge setter bursts (slider drags, day toggles) into one write
+
+CONF_CONNECTION_POLICY = "connection_policy"
+POLICY_ALWAYS = "always"  # connect once, stay connected (push updates all the time)
+POLICY_IDLE = "idle"  # disconnect after idle_timeout without traffic
+POLICY_TRANSACTION = "transaction"  # connect per command batch, drop the link right after
+CONNECTION_POLICIES = [POLICY_ALWAYS, POLICY_IDLE, POLICY_TRANSACTION]
+DEFAULT_CONNECTION_POLICY = POLICY_ALWAYS
+
+CONF_IDLE_TIMEOUT = "idle_timeout"
+DEFAULT_IDLE_TIMEOUT = 60  # seconds
+CONF_ACTIVE_WINDOW = "active_window"
+DEFAULT_ACTIVE_WINDOW = 300  # seconds to stay connected after a user command (keeps push updates flowing)
+TRANSACTION_LINGER = 2.0  # seconds to wait for reply notifications before dropping a per-transaction link
+
+# Offline command journal: how long a command for an unreachable unit is kept for
+# replay. Power/fan intents go stale quickly, settings stay valid much longer.
+CONF_JOURNAL_POWER_EXPIRY = "journal_power_expiry"
+DEFAULT_JOURNAL_POWER_EXPIRY = 30  # minutes; 0 disables journaling power/fan commands
+CONF_JOURNAL_SETTINGS_EXPIRY = "journal_settings_expiry"
+DEFAULT_JOURNAL_SETTINGS_EXPIRY = 168  # hours; 0 disables journaling schedule/oil settings
+JOURNAL_POWER_PROPS = ("power", "fan")
+JOURNAL_SETTINGS_PROPS = ("workmode", "oil_name", "oil_capacity", "oil_remain", "oil_consumption")
+JOURNAL_SAVE_DELAY = 1  # seconds
+
+# Frames (TX and RX) kept per device for trace export.
+TRACE_CAPACITY = 1024
+
+# Pseudo data key dispatched to listeners when the BLE link connects or drops.
+KEY_LINK = "_link"
+# Pseudo data key dispatched when the effective poll interval changes.
+KEY_POLL = "_poll"
+# Pseudo data key dispatched every METRICS_PUBLISH_INTERVAL seconds to the metric sensors.
+KEY_METRICS = "_metrics"
+# Pseudo data key for the oil prediction sensors: re-anchored on status frames, refreshed with the metrics.
+KEY_OIL_MODEL = "_oil_model"
+METRICS_PUBLISH_INTERVAL = 60
+
+# Services
+SERVICE_APPLY_PROFILE = "apply_profile"
+SERVICE_EXPORT_TRACE = "export_trace"
+ATTR_START_TIME = "start_time"
+ATTR_END_TIME = "end_time"
+ATTR_RUN_SECONDS = "run_seconds"
+ATTR_STOP_SECONDS = "stop_seconds"
+ATTR_DAYS = "days"
+ATTR_SCHEDULE_ENABLED = "schedule_enabled"
+ATTR_OIL_NAME = "oil_name"
+ATTR_OIL_CAPACITY = "oil_capacity"
+ATTR_OIL_REMAINING = "oil_remaining"
+ATTR_OIL_CONSUMPTION = "oil_consumption"
+ATTR_MAX_PER_ADAPTER = "max_per_adapter"
+ATTR_FORCE = "force"
+ATTR_CLEAR = "clear"
 
 # Work schedule bitmask: 0=Sun, 1=Mon, ... 6=Sat
 DAY_BITS = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
@@ -3,16 +3,57 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from datetime import timedelta
-from typing import Any
+from typing import Any, Callable, Coroutine, Iterable, Mapping, Sequence
 
-from homeassistant.core import HomeAssistant
+from bleak import BleakError
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.exceptions import ConfigEntryNotReady
 
-from .const import DEFAULT_POLL_INTERVAL_SECONDS
-from .ble import FelshareBleConnection
+from .const import (
+    DEFAULT_POLL_INTERVAL_SECONDS,
+    POLL_INTERVAL_FAST,
+    POLL_INTERVAL_MAX,
+    POLL_FAST_WINDOW,
+    POLL_OIL_FAST_RATE,
+    POLL_INTERVAL_RELAXED,
+    OIL_MODEL_ACCURATE_ML,
+    CONF_WRITE_COALESCE_MS,
+    DEFAULT_WRITE_COALESCE_MS,
+    CONF_CONNECTION_POLICY,
+    DEFAULT_CONNECTION_POLICY,
+    CONF_IDLE_TIMEOUT,
+    DEFAULT_IDLE_TIMEOUT,
+    CONF_ACTIVE_WINDOW,
+    DEFAULT_ACTIVE_WINDOW,
+    CONF_JOURNAL_POWER_EXPIRY,
+    DEFAULT_JOURNAL_POWER_EXPIRY,
+    CONF_JOURNAL_SETTINGS_EXPIRY,
+    DEFAULT_JOURNAL_SETTINGS_EXPIRY,
+    JOURNAL_POWER_PROPS,
+    JOURNAL_SETTINGS_PROPS,
+    PRIORITY_USER,
+    PRIORITY_SCHEDULE,
+    PRIORITY_POLL,
+    REPLY_RETRIES,
+    OPTIMISTIC_TIMEOUT,
+    KEY_LINK,
+    KEY_POLL,
+    KEY_METRICS,
+    KEY_OIL_MODEL,
+    METRICS_PUBLISH_INTERVAL,
+)
+from .ble import FelshareBleConnection, NoReplyError, TxStep
+from .cache import FelshareStateCache
+from .coalescer import WriteCoalescer
+from .journal import CommandJournal
+from .metrics import FelshareMetrics
+from .oil_model import INPUT_FIELDS as OIL_INPUT_FIELDS, OilInputs, OilModel
+from .polling import AdaptivePollSchedule
+from .scheduler import get_slot_scheduler
 from .protocol import (
     bytes_status_request,
     bytes_bulk_request,
@@ -24,11 +65,77 @@ from .protocol import (
     bytes_oil_remain_ml,
     bytes_oil_consumption,
 )
+from .state import DERIVED_FROM, SCHEDULE_FIELDS, FelshareState, workmode_to_state
 
 _LOGGER = logging.getLogger(__name__)
 
-class FelshareCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    def __init__(self, hass: HomeAssistant, address: str, name: str) -> None:
+# Outcome of a coalesced write that was journaled because the device is unreachable.
+WRITE_QUEUED = "queued"
+
+# Writable property -> state fields its frame is encoded from.
+WRITE_FIELDS: dict[str, tuple[str, ...]] = {
+    "power": ("power_on",),
+    "fan": ("fan_on",),
+    "workmode": SCHEDULE_FIELDS,
+    "oil_name": ("oil_name",),
+    "oil_capacity": ("oil_capacity_ml",),
+    "oil_remain": ("oil_remain_ml",),
+    "oil_consumption": ("oil_consumption_raw",),
+}
+
+# Oil profile key -> (property, value, optimistic state) of its write.
+_OIL_WRITES: dict[str, Callable[[Any], tuple[str, Any, dict[str, Any]]]] = {
+    "name": lambda name: ("oil_name", name, {"oil_name": (name or "").strip()}),
+    "capacity": lambda ml: ("oil_capacity", int(ml), {"oil_capacity_ml": int(ml)}),
+    "remain": lambda ml: ("oil_remain", int(ml), {"oil_remain_ml": int(ml)}),
+    "consumption": lambda ml_h: (
+        "oil_consumption",
+        float(ml_h),
+        {"oil_consumption_raw": int(round(float(ml_h) * 10.0))},
+    ),
+}
+
+def _oil_write(key: str, value: Any) -> tuple[str, Any, dict[str, Any]]:
+    return _OIL_WRITES[key](value)
+
+def _resolve_workmode(base: FelshareState, change: dict[str, Any]) -> dict[str, Any]:
+    """Apply a (merged) schedule change to `base` and return bytes_workmode() kwargs."""
+    fields = base.workmode_fields()
+    fields.update({k: v for k, v in change.items() if k in fields})
+    fields["daymask"] = (fields["daymask"] | change.get("days_on", 0)) & ~change.get("days_off", 0) & 0x7F
+    return fields
+
+def _merge_workmode(pending: dict[str, Any] | None, change: dict[str, Any]) -> dict[str, Any]:
+    """Fold a schedule change into the pending one.
+
+    Day toggles are kept as separate set/clear bitmasks so that ticking several days
+    in one window does not lose the earlier toggles; an explicit daymask resets them.
+    """
+    merged = dict(pending or {})
+    for key, value in change.items():
+        if key == "daymask":
+            merged["daymask"] = int(value) & 0x7F
+            merged.pop("days_on", None)
+            merged.pop("days_off", None)
+        elif key == "days_on":
+            merged["days_on"] = merged.get("days_on", 0) | value
+            merged["days_off"] = merged.get("days_off", 0) & ~value
+        elif key == "days_off":
+            merged["days_off"] = merged.get("days_off", 0) | value
+            merged["days_on"] = merged.get("days_on", 0) & ~value
+        else:
+            merged[key] = value
+    return merged
+
+class FelshareCoordinator(DataUpdateCoordinator[FelshareState]):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        name: str,
+        options: Mapping[str, Any] | None = None,
+        client_factory=None,
+    ) -> None:
         super().__init__(
             hass,
             _LOGGER,
@@ -37,11 +144,96 @@ class FelshareCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         )
         self.address = address
         self.name = name
-        self.data: dict[str, Any] = {}
+        self.data = FelshareState()
+        self.metrics = FelshareMetrics()
+        options = options or {}
 
-        self._conn = FelshareBleConnection(hass, address, name, self._on_state)
-        self._unsub_poll = None
+        self._conn = FelshareBleConnection(
+            hass,
+            address,
+            name,
+            self._on_state,
+            get_slot_scheduler(hass),
+            on_link_change=self._on_link_change,
+            policy=options.get(CONF_CONNECTION_POLICY, DEFAULT_CONNECTION_POLICY),
+            idle_timeout=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+            active_window=options.get(CONF_ACTIVE_WINDOW, DEFAULT_ACTIVE_WINDOW),
+            metrics=self.metrics,
+            client_factory=client_factory,
+        )
+        self._writer = WriteCoalescer(
+            options.get(CONF_WRITE_COALESCE_MS, DEFAULT_WRITE_COALESCE_MS) / 1000.0,
+            self._flush_writes,
+        )
+        self._unsub_poll: CALLBACK_TYPE | None = None
+        self._poll = AdaptivePollSchedule(
+            DEFAULT_POLL_INTERVAL_SECONDS,
+            POLL_INTERVAL_FAST,
+            POLL_INTERVAL_MAX,
+            POLL_FAST_WINDOW,
+            POLL_OIL_FAST_RATE,
+            POLL_INTERVAL_RELAXED,
+        )
+        self._oil = OilModel(OIL_MODEL_ACCURATE_ML)
+        self._polling = False
+        self._stopping = False
+        self._unsub_metrics: CALLBACK_TYPE | None = None
         self._start_task: asyncio.Task | None = None
+
+        # Last known state from before a restart; keys stay in _restored until reported again.
+        self._cache = FelshareStateCache(hass, address)
+        self._restored: set[str] = set()
+
+        # Writes the device could not be reached for, replayed when the link comes back.
+        power_expiry = options.get(CONF_JOURNAL_POWER_EXPIRY, DEFAULT_JOURNAL_POWER_EXPIRY) * 60
+        settings_expiry = options.get(CONF_JOURNAL_SETTINGS_EXPIRY, DEFAULT_JOURNAL_SETTINGS_EXPIRY) * 3600
+        self._journal = CommandJournal(
+            hass,
+            address,
+            {
+                **{prop: power_expiry for prop in JOURNAL_POWER_PROPS},
+                **{prop: settings_expiry for prop in JOURNAL_SETTINGS_PROPS},
+            },
+        )
+        self._replay_task: asyncio.Task | None = None
+        self._replaying: set[str] = set()
+
+        # Entity update callbacks per data key (see async_add_key_listener).
+        self._key_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+
+        # Frame each writable property would have if written with the device's current
+        # value; only built from live reports, so restored state never suppresses a write.
+        self._device_frames: dict[str, bytes] = {}
+        self._forced: set[str] = set()
+
+        # Optimistic values: key -> (value, token) until the device confirms them.
+        self._optimistic: dict[str, tuple[Any, int]] = {}
+        self._optimistic_token = 0
+        self._optimistic_timers: dict[int, asyncio.TimerHandle] = {}
+
+    async def async_restore(self) -> None:
+        """Load the cached state so entities start with the last known values."""
+        try:
+            values = await self._cache.async_load()
+        except Exception:
+            _LOGGER.debug("%s: could not load the state cache", self.address, exc_info=True)
+            return
+        if values:
+            self._restored.update(self.data.update(values))
+            _LOGGER.debug(
+                "%s: restored %d cached fields (schedule %s)",
+                self.address,
+                len(values),
+                "fresh" if self._cache.schedule_fresh() else "stale",
+            )
+        try:
+            await self._journal.async_load()
+        except Exception:
+            _LOGGER.debug("%s: could not load the command journal", self.address, exc_info=True)
+            return
+        if len(self._journal):
+            _LOGGER.debug("%s: %d journaled commands waiting for the device", self.address, len(self._journal))
+
     def start_background(self) -> None:
         """Start coordinator tasks without blocking config-entry setup."""
         if getattr(self, "_start_task", None) is None:
@@ -49,27 +241,29 @@ class FelshareCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def async_start(self) -> None:
         """Start background tasks and attempt initial sync."""
-        # keepalive poll (optional)
-        if self._unsub_poll is None:
-            self._unsub_poll = async_track_time_interval(
-                self.hass,
-                self._poll_status,
-                timedelta(seconds=DEFAULT_POLL_INTERVAL_SECONDS),
+        if self._unsub_metrics is None:
+            self._unsub_metrics = async_track_time_interval(
+                self.hass, self._publish_metrics, timedelta(seconds=METRICS_PUBLISH_INTERVAL)
             )
-
         # Kick off initial reads (status + schedule). These will auto-connect as needed.
         try:
-            await self.async_request_status()
-            await asyncio.sleep(0.2)
-            await self.async_request_bulk()
+            # The bulk read goes out as soon as the status reply arrived, unless the
+            # cached schedule is recent enough to trust.
+            steps = [TxStep(bytes_status_request())]
+            if not self._cache.schedule_fresh():
+                steps.append(TxStep(bytes_bulk_request()))
+            await self._conn.transaction(steps, priority=PRIORITY_POLL)
         except asyncio.CancelledError:
             # Home Assistant is shutting down or unloading; honor cancellation.
             raise
         except Exception:
             _LOGGER.debug("Initial BLE requests failed (will retry on poll / user actions)", exc_info=True)
+            self._poll.note_result(False)
+        self._schedule_poll()
 
 
     async def async_stop(self) -> None:
+        self._stopping = True
         if self._start_task is not None and not self._start_task.done():
             self._start_task.cancel()
             try:
@@ -77,47 +271,483 @@ class FelshareCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             except asyncio.CancelledError:
                 pass
         self._start_task = None
+        if self._replay_task is not None and not self._replay_task.done():
+            self._replay_task.cancel()
+        self._replay_task = None
 
         if self._unsub_poll is not None:
             self._unsub_poll()
             self._unsub_poll = None
-        await self._conn.disconnect()
+        if self._unsub_metrics is not None:
+            self._unsub_metrics()
+            self._unsub_metrics = None
+        self._writer.cancel()
+        for timer in self._optimistic_timers.values():
+            timer.cancel()
+        self._optimistic_timers.clear()
+        await self._conn.close()
+        try:
+            await self._cache.async_save()
+        except Exception:
+            _LOGGER.debug("%s: could not save the state cache", self.address, exc_info=True)
+        try:
+            await self._journal.async_save()
+        except Exception:
+            _LOGGER.debug("%s: could not save the command journal", self.address, exc_info=True)
+
+    @callback
+    def async_add_key_listener(self, keys: Iterable[str], update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call `update_callback` whenever one of `keys` changes; returns an unsubscribe."""
+        keys = tuple(keys)
+        for key in keys:
+            self._key_listeners.setdefault(key, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            for key in keys:
+                listeners = self._key_listeners.get(key)
+                if listeners and update_callback in listeners:
+                    listeners.remove(update_callback)
+                    if not listeners:
+                        del self._key_listeners[key]
+
+        return remove_listener
+
+    @callback
+    def _dispatch(self, keys: Iterable[str]) -> None:
+        """Notify each listener subscribed to any of `keys` exactly once."""
+        notified: list[CALLBACK_TYPE] = []
+        for key in keys:
+            for update_callback in self._key_listeners.get(key, ()):
+                if update_callback not in notified:
+                    notified.append(update_callback)
+                    update_callback()
+        self.metrics.dispatches += len(notified)
+
+    @callback
+    def _publish_metrics(self, _now) -> None:
+        # Metric sensors and the oil prediction refresh on a timer rather than on every frame.
+        keys = [key for key in (KEY_METRICS, KEY_OIL_MODEL) if key in self._key_listeners]
+        if keys:
+            self._dispatch(keys)
+
+    @callback
+    def _on_link_change(self, connected: bool) -> None:
+        self._dispatch((KEY_LINK,))
+        if connected and self._poll.note_reachable():
+            # Back from an outage (e.g. a user command reconnected): leave the poll backoff.
+            self._schedule_poll()
+        if (
+            connected
+            and len(self._journal)
+            and not self._stopping
+            and (self._replay_task is None or self._replay_task.done())
+        ):
+            self._replay_task = self.hass.async_create_task(self._replay_journal())
 
     def _on_state(self, partial: dict[str, Any]) -> None:
-        self.data = {**(self.data or {}), **partial}
-        self.async_set_updated_data(self.data)
+        changed = self.data.update(partial)
+        if changed or "oil_remain_ml" in partial:
+            self._update_oil_model(partial, changed)
+        if "device_clock" in partial:
+            # A full status frame: the next poll is counted from here.
+            now = time.monotonic()
+            self._poll.note_status(now)
+            self._poll.note_oil(now, partial.get("oil_remain_ml"))
+            self._schedule_poll()
+        self._cache.record(partial, changed)
+        self._update_device_frames(partial)
+        for key, value in partial.items():
+            pending = self._optimistic.get(key)
+            if pending is not None and pending[0] == value:
+                del self._optimistic[key]  # confirmed by the device
+                if key not in changed:
+                    changed.append(key)  # the pending flag flips
+        if self._restored:
+            self._clear_restored(partial, changed)
+        if changed:
+            self._dispatch(changed)
+
+    def _update_oil_model(self, partial: dict[str, Any], changed: list[str]) -> None:
+        now = time.monotonic()
+        inputs_changed = any(key in OIL_INPUT_FIELDS for key in changed)
+        if inputs_changed:
+            self._oil.set_inputs(now, OilInputs.from_state(self.data))
+        if "oil_remain_ml" in partial:
+            # Status frames are measurements; a 0x10 echo is a value someone just set.
+            status = "device_clock" in partial
+            self._oil.observe(
+                now, partial["oil_remain_ml"], self.data.device_time if status else None, measured=status
+            )
+            self._poll.note_model(self._oil.accurate)
+        elif not inputs_changed:
+            return
+        changed.append(KEY_OIL_MODEL)
+
+    def oil_prediction(self) -> tuple[float | None, float | None]:
+        """Predicted mL remaining and seconds until empty, now."""
+        now = time.monotonic()
+        return self._oil.predict(now), self._oil.time_to_empty(now)
+
+    def oil_model_stats(self) -> dict[str, Any]:
+        return self._oil.as_dict(time.monotonic())
+
+    def _clear_restored(self, partial: dict[str, Any], changed: list[str]) -> None:
+        """Keys the device just reported are live again; their `restored` flag flips."""
+        live = [key for key in partial if key in self._restored]
+        for key in live:
+            self._restored.discard(key)
+        for key, inputs in DERIVED_FROM.items():
+            if key in self._restored and not self._restored.intersection(inputs):
+                self._restored.discard(key)
+                live.append(key)
+        changed.extend(key for key in live if key not in changed)
+
+    @property
+    def restored_keys(self) -> list[str]:
+        return sorted(self._restored)
+
+    @property
+    def pending_keys(self) -> list[str]:
+        return sorted(self._optimistic)
+
+    def is_restored(self, *keys: str) -> bool:
+        """True while any of `keys` still shows a cached value from before the restart."""
+        return any(key in self._restored for key in keys)
+
+    # ----- optimistic state -----
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value entities should show: pending intent first, then device state."""
+        pending = self._optimistic.get(key)
+        if pending is not None:
+            return pending[0]
+        return self.data.get(key, default)
+
+    def is_pending(self, *keys: str) -> bool:
+        return any(key in self._optimistic for key in keys)
+
+    def is_queued(self, *keys: str) -> bool:
+        """True while a journaled write for any of `keys` waits for the device."""
+        return any(
+            prop in self._journal and any(key in fields for key in keys)
+            for prop, fields in WRITE_FIELDS.items()
+        )
+
+    def journal_stats(self) -> dict[str, Any]:
+        return self._journal.as_dict()
+
+    def _effective_state(self) -> FelshareState:
+        state = self.data.copy()
+        state.update({key: value for key, (value, _token) in self._optimistic.items()})
+        return state
+
+    @callback
+    def _apply_optimistic(self, values: dict[str, Any]) -> int:
+        if not values:
+            return 0  # nothing to show or settle; settling token 0 is a no-op
+        self._optimistic_token += 1
+        token = self._optimistic_token
+        for key, value in values.items():
+            self._optimistic[key] = (value, token)
+        self._optimistic_timers[token] = self.hass.loop.call_later(
+            OPTIMISTIC_TIMEOUT, self._settle_optimistic, token, True
+        )
+        self._dispatch(values)
+        return token
+
+    @callback
+    def _settle_optimistic(self, token: int, rollback: bool) -> None:
+        """Drop the optimistic values of `token`; on rollback entities fall back to device state."""
+        timer = self._optimistic_timers.pop(token, None)
+        if timer is not None:
+            timer.cancel()
+        keys = [key for key, (_value, tok) in self._optimistic.items() if tok == token]
+        for key in keys:
+            del self._optimistic[key]
+        if keys:
+            if rollback:
+                self.metrics.rollbacks += 1
+                _LOGGER.debug("%s: rolled back unconfirmed %s", self.address, ", ".join(keys))
+            self._dispatch(keys)
+
+    async def _submit(
+        self,
+        prop: str,
+        value: Any,
+        optimistic: dict[str, Any],
+        merge=None,
+        force: bool = False,
+    ) -> bool:
+        """Write a property; True when the device was unreachable and the write was journaled instead."""
+        return await self._queue_write(prop, value, optimistic, merge, force)
+
+    def _queue_write(
+        self,
+        prop: str,
+        value: Any,
+        optimistic: dict[str, Any],
+        merge=None,
+        force: bool = False,
+    ) -> Coroutine[Any, Any, bool]:
+        """Hand a write to the coalescer right away; the returned coroutine waits for its outcome."""
+        if force:
+            self._forced.add(prop)
+        self._journal.supersede(prop, value, merge)
+        token = self._apply_optimistic(optimistic)
+        self._poll.note_command(time.monotonic())
+        self._schedule_poll()
+        return self._write_outcome(self._writer.submit(prop, value, merge), token)
+
+    async def _write_outcome(self, future: asyncio.Future, token: int) -> bool:
+        try:
+            outcome = await future
+        except BaseException:
+            self._settle_optimistic(token, rollback=True)
+            raise
+        # Acknowledged (the echo has already updated the device state) or journaled.
+        self._settle_optimistic(token, rollback=False)
+        return outcome == WRITE_QUEUED
+
+    # ----- adaptive polling -----
+    @callback
+    def _schedule_poll(self) -> None:
+        """(Re)arm the poll timer from the current poll schedule."""
+        if self._polling or self._stopping:
+            return  # rescheduled when the running poll finishes
+        previous = (self._poll.interval, self._poll.reason)
+        if self._unsub_poll is not None:
+            self._unsub_poll()
+        self._unsub_poll = async_call_later(
+            self.hass, self._poll.next_delay(time.monotonic()), self._poll_status
+        )
+        if (self._poll.interval, self._poll.reason) != previous:
+            self._dispatch((KEY_POLL,))
 
     async def _poll_status(self, _now) -> None:
+        self._unsub_poll = None
+        self._polling = True
         try:
-            await self._conn.write(bytes_status_request())
+            await self._conn.request(bytes_status_request(), priority=PRIORITY_POLL)
         except Exception:
             _LOGGER.debug("Poll status failed", exc_info=True)
+            self._poll.note_result(False)
+        else:
+            self._poll.note_result(True)
+        finally:
+            self._polling = False
+        self._schedule_poll()
+
+    @property
+    def poll_interval(self) -> float:
+        """Effective status-poll interval in seconds."""
+        return self._poll.interval
+
+    def poll_stats(self) -> dict[str, Any]:
+        return self._poll.as_dict(time.monotonic())
+
+    @property
+    def connection(self) -> FelshareBleConnection:
+        return self._conn
 
     # ----- command helpers -----
     async def async_request_status(self) -> None:
-        await self._conn.write(bytes_status_request())
+        await self._conn.request(bytes_status_request())
 
     async def async_request_bulk(self) -> None:
-        await self._conn.write(bytes_bulk_request())
+        await self._conn.request(bytes_bulk_request())
+
+    async def async_transaction(self, steps: Sequence[TxStep], priority: int = PRIORITY_USER) -> list[bytes]:
+        """Send several frames as one unit over one connection (see FelshareBleConnection.transaction)."""
+        return await self._conn.transaction(steps, priority=priority)
+
+    async def async_power_cycle_on(self) -> None:
+        """Power off, then on once the device confirmed the off (the "safe" power-on)."""
+        await self.async_transaction([TxStep(bytes_power(False)), TxStep(bytes_power(True))])
+
+    async def async_command(self, payload: bytes, priority: int = PRIORITY_USER) -> bytes:
+        """Send a command and wait for its echo, resending only if the echo is missing."""
+        attempt = 0
+        while True:
+            try:
+                return await self._conn.request(payload, priority=priority)
+            except NoReplyError:
+                attempt += 1
+                if attempt > REPLY_RETRIES:
+                    raise
+                self.metrics.command_retries += 1
+                _LOGGER.debug("%s: no echo for 0x%02X, resending", self.address, payload[0])
+
+    # Setters skip the write when the encoded frame equals what the device already
+    # reported; force=True sends it anyway.
+    async def async_set_power(self, on: bool, force: bool = False) -> bool:
+        return await self._submit("power", bool(on), {"power_on": bool(on)}, force=force)
+
+    async def async_set_fan(self, on: bool, force: bool = False) -> bool:
+        return await self._submit("fan", bool(on), {"fan_on": bool(on)}, force=force)
+
+    async def async_set_workmode(
+        self, sh: int, sm: int, eh: int, em: int, enabled: bool, daymask: int, run_s: int, stop_s: int, force: bool = False
+    ) -> bool:
+        return await self.async_update_workmode(
+            sh=sh, sm=sm, eh=eh, em=em, enabled=enabled, daymask=daymask, run_s=run_s, stop_s=stop_s, force=force
+        )
+
+    async def async_update_workmode(self, *, force: bool = False, **changes: Any) -> bool:
+        """Change some schedule fields; the rest keep their current device values."""
+        return await self._submit("workmode", changes, self._workmode_optimistic(changes), _merge_workmode, force)
+
+    def _workmode_optimistic(self, changes: Mapping[str, Any]) -> dict[str, Any]:
+        current = self._effective_state()
+        intended = workmode_to_state(_resolve_workmode(current, _merge_workmode(None, changes)))
+        return {k: v for k, v in intended.items() if current.get(k) != v}
 
-    async def async_set_power(self, on: bool) -> None:
-        await self._conn.write(bytes_power(on))
+    async def async_set_work_day(self, bit: int, on: bool) -> bool:
+        return await self.async_update_workmode(**{"days_on" if on else "days_off": 1 << bit})
 
-    async def async_set_fan(self, on: bool) -> None:
-        await self._conn.write(bytes_fan(on))
+    async def async_set_oil_name(self, name: str, force: bool = False) -> bool:
+        return await self._submit(*_oil_write("name", name), force=force)
 
-    async def async_set_workmode(self, sh: int, sm: int, eh: int, em: int, enabled: bool, daymask: int, run_s: int, stop_s: int) -> None:
-        await self._conn.write(bytes_workmode(sh, sm, eh, em, enabled, daymask, run_s, stop_s))
+    async def async_set_oil_capacity(self, cap_ml: int, force: bool = False) -> bool:
+        return await self._submit(*_oil_write("capacity", cap_ml), force=force)
 
-    async def async_set_oil_name(self, name: str) -> None:
-        await self._conn.write(bytes_oil_name(name, null_term=True))
+    async def async_set_oil_remain(self, rem_ml: int, force: bool = False) -> bool:
+        return await self._submit(*_oil_write("remain", rem_ml), force=force)
 
-    async def async_set_oil_capacity(self, cap_ml: int) -> None:
-        await self._conn.write(bytes_oil_capacity_ml(cap_ml))
+    async def async_set_oil_consumption(self, ml_per_hour: float, force: bool = False) -> bool:
+        return await self._submit(*_oil_write("consumption", ml_per_hour), force=force)
 
-    async def async_set_oil_remain(self, rem_ml: int) -> None:
-        await self._conn.write(bytes_oil_remain_ml(rem_ml))
+    async def async_apply_profile(self, schedule: dict[str, Any], oil: dict[str, Any], force: bool = False) -> bool:
+        """Apply schedule changes and oil settings in one go.
 
-    async def async_set_oil_consumption(self, ml_per_hour: float) -> None:
-        raw = int(round(float(ml_per_hour) * 10.0))
-        await self._conn.write(bytes_oil_consumption(raw))
\ No newline at end of file
+        Everything is submitted to the coalescer before flushing it right away, so
+        the frames are queued together and sent over a single connection. Returns
+        True when some of it was journaled because the device is unreachable.
+        """
+        # Work out every write first, so a bad value fails before anything is queued.
+        writes = [_oil_write(key, oil[key]) for key in _OIL_WRITES if key in oil]
+        if schedule:
+            writes.insert(0, ("workmode", schedule, self._workmode_optimistic(schedule), _merge_workmode))
+        outcomes = [self._queue_write(*write, force=force) for write in writes]
+        await self._writer.async_flush()
+        return any(await asyncio.gather(*outcomes))
+
+    # ----- coalesced writes -----
+    def _encode_write(self, prop: str, value: Any) -> bytes:
+        if prop == "power":
+            return bytes_power(value)
+        if prop == "fan":
+            return bytes_fan(value)
+        if prop == "workmode":
+            return bytes_workmode(**_resolve_workmode(self.data, value))
+        if prop == "oil_name":
+            return bytes_oil_name(value, null_term=True)
+        if prop == "oil_capacity":
+            return bytes_oil_capacity_ml(value)
+        if prop == "oil_remain":
+            return bytes_oil_remain_ml(value)
+        if prop == "oil_consumption":
+            return bytes_oil_consumption(int(round(value * 10.0)))
+        raise ValueError(f"Unknown property {prop}")
+
+    def _update_device_frames(self, partial: dict[str, Any]) -> None:
+        for prop, fields in WRITE_FIELDS.items():
+            if not any(key in partial for key in fields):
+                continue
+            if any(self.data.get(key) is None for key in fields):
+                self._device_frames.pop(prop, None)
+                continue
+            if prop == "workmode":
+                value: Any = {}
+            elif prop == "oil_consumption":
+                value = self.data.oil_consumption_raw / 10.0
+            else:
+                value = self.data.get(fields[0])
+            self._device_frames[prop] = self._encode_write(prop, value)
+
+    async def _flush_writes(self, pending: dict[str, Any]) -> dict[str, Any]:
+        """Write the coalesced properties.
+
+        Returns the outcome per property that was not written: its exception, or
+        WRITE_QUEUED when it was journaled until the device is reachable.
+        """
+        outcomes: dict[str, Any] = {}
+        sent: list[tuple[str, Any]] = []
+        commands = []
+        touched: list[str] = []
+        for prop, value in pending.items():
+            payload = self._encode_write(prop, value)
+            if prop in self._forced:
+                self._forced.discard(prop)
+            elif payload == self._device_frames.get(prop):
+                self.metrics.suppressed_writes += 1
+                _LOGGER.debug("%s: %s already set on the device, not writing", self.address, prop)
+                if prop in self._journal:
+                    self._journal.discard(prop, replayed=prop in self._replaying)
+                    touched.append(prop)
+                continue
+            sent.append((prop, value))
+            commands.append(
+                self.async_command(payload, priority=PRIORITY_SCHEDULE if prop == "workmode" else PRIORITY_USER)
+            )
+        # Hand everything to the command queue at once so it can order by priority.
+        results = await asyncio.gather(*commands, return_exceptions=True)
+
+        for (prop, value), result in zip(sent, results):
+            if not isinstance(result, BaseException):
+                # A schedule change only carries some fields; it supersedes the
+                # journaled one only when it was the replay of it.
+                if prop in self._journal and (prop != "workmode" or prop in self._replaying):
+                    self._journal.discard(prop, replayed=prop in self._replaying)
+                    touched.append(prop)
+                continue
+            if isinstance(result, (BleakError, TimeoutError)) and self._journal.record(
+                prop, value, _merge_workmode if prop == "workmode" else None
+            ):
+                # The device is unreachable: keep the intent for the next connect.
+                _LOGGER.debug("%s: %s journaled until the device is reachable (%r)", self.address, prop, result)
+                touched.append(prop)
+                outcomes[prop] = WRITE_QUEUED
+                continue
+            if prop in self._replaying:
+                # Rejected rather than unreachable: replaying it again will not help.
+                self._journal.discard(prop)
+                touched.append(prop)
+            outcomes[prop] = result
+        if touched:
+            self._dispatch(key for prop in touched for key in WRITE_FIELDS[prop])
+        return outcomes
+
+    async def _replay_journal(self) -> None:
+        """Send the journaled writes, collapsed per property, in the session that just opened."""
+        if not self._journal.pending():
+            return
+        try:
+            if "workmode" in self._journal and any(self.data.get(key) is None for key in SCHEDULE_FIELDS):
+                # Schedule changes are stored as deltas; they need the current schedule.
+                await self._conn.request(bytes_bulk_request(), priority=PRIORITY_SCHEDULE)
+            # Take the journal only once a flush of user writes already under way is
+            # done: writes submitted since the link came up superseded their entries,
+            # and a plain value still waiting in the coalescer is newer than any entry.
+            await self._writer.async_wait_flushed()
+            pending = {
+                prop: value
+                for prop, value in self._journal.pending().items()
+                if prop == "workmode" or not self._writer.is_pending(prop)
+            }
+            if not pending:
+                return
+            _LOGGER.debug("%s: replaying journaled %s", self.address, ", ".join(pending))
+            futures = [
+                self._writer.submit(prop, value, _merge_workmode if prop == "workmode" else None)
+                for prop, value in pending.items()
+            ]
+            self._replaying.update(pending)
+            await self._writer.async_flush()
+            await asyncio.gather(*futures)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Unreachable writes stay journaled for the next connect; rejected ones were dropped.
+            _LOGGER.debug("%s: replaying the command journal failed", self.address, exc_info=True)
+        finally:
+            self._replaying.clear()
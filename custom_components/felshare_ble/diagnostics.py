@@ -0,0 +1,45 @@
+"""Diagnostics support for Felshare BLE."""
+from __future__ import annotations
+
+import base64
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_ADDRESS, DATA_SLOT_SCHEDULER
+from .coordinator import FelshareCoordinator
+
+TO_REDACT = {CONF_ADDRESS}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    coordinator: FelshareCoordinator = hass.data[DOMAIN][entry.entry_id]
+    conn = coordinator.connection
+    scheduler = hass.data[DOMAIN].get(DATA_SLOT_SCHEDULER)
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "state": coordinator.data.as_dict(),
+        "restored_keys": coordinator.restored_keys,
+        "pending_keys": coordinator.pending_keys,
+        "journal": coordinator.journal_stats(),
+        "connection": {
+            "connected": conn.is_connected,
+            "policy": conn.policy,
+            "last_connect_s": conn.last_connect_time,
+            "connect": conn.connect_stats(),
+            "framing": conn.framing_stats(),
+            "slots": conn.slot_stats(),
+            "reply_latency_ms": {f"0x{op:02X}": round(s * 1000, 1) for op, s in conn.reply_latency.items()},
+        },
+        "polling": {"interval_s": coordinator.poll_interval, **coordinator.poll_stats()},
+        "oil_model": coordinator.oil_model_stats(),
+        "metrics": coordinator.metrics.as_dict(),
+        "slot_scheduler": scheduler.as_dict() if scheduler is not None else None,
+        # Binary trace (see trace.py) of the most recent frames, base64-encoded.
+        "trace": {**conn.trace.as_dict(), "data": base64.b64encode(conn.trace.export()).decode()},
+    }
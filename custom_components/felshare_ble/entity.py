@@ -1,19 +1,47 @@
 """Shared entity base for Felshare BLE."""
 from __future__ import annotations
 
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
 
 from .coordinator import FelshareCoordinator
 from .const import DOMAIN
 
-class FelshareEntity(CoordinatorEntity[FelshareCoordinator]):
+class FelshareEntity(Entity):
+    """Entity updated by the coordinator's key listeners (the only update path)."""
+
     _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    # FelshareState fields this entity displays; None means just its own key.
+    # The entity only writes state when one of these keys changes.
+    _state_keys: tuple[str, ...] | None = None
 
     def __init__(self, coordinator: FelshareCoordinator, key: str, name: str) -> None:
-        super().__init__(coordinator)
+        self.coordinator = coordinator
         self._key = key
         self._attr_name = name
         self._attr_unique_id = f"{coordinator.address}-{key}"
+        if self._state_keys is None:
+            self._state_keys = (key,)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._state_keys:
+            self.async_on_remove(
+                self.coordinator.async_add_key_listener(self._state_keys, self._handle_coordinator_update)
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self):
+        # Shown until the device reports the value again after a restart.
+        if self._state_keys and self.coordinator.is_restored(*self._state_keys):
+            return {"restored": True}
+        return None
 
     @property
     def device_info(self):
@@ -23,3 +51,13 @@ class FelshareEntity(CoordinatorEntity[FelshareCoordinator]):
             "manufacturer": "Felshare",
             "model": "Diffuser (BLE)",
         }
+
+class FelshareCommandEntity(FelshareEntity):
+    """Entity that writes to the device and shows its intended value until confirmed."""
+
+    @property
+    def extra_state_attributes(self):
+        attrs = super().extra_state_attributes or {}
+        attrs["pending"] = self.coordinator.is_pending(*self._state_keys)
+        attrs["queued"] = self.coordinator.is_queued(*self._state_keys)
+        return attrs
@@ -0,0 +1,176 @@
+"""Reassembly of Felshare frames split across GATT notifications.
+
+A notification carries at most MTU-3 bytes (20 with the default MTU), so long
+frames such as the status (0x05) and bulk (0x0C) replies can arrive in several
+pieces, especially through Bluetooth proxies. The frames carry no length field,
+so the assembler relies on what is known per opcode: fixed sizes for the simple
+property frames and minimum sizes for the variable ones. Past its minimum size a
+variable frame ends where its own layout says so: the NUL after the oil name
+(status, oil name) or zero padding after the last whole WorkMode record (bulk);
+a record cut off at the end means more is coming. Only when the layout cannot
+tell is the fragment size used: a notification shorter than a full one at
+either size a device may chunk at (20 bytes, or the negotiated MTU - 3) ends
+the frame. Anything else is emitted when no further fragment arrives within the
+fragment timeout.
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+from .protocol import WORKMODE_LEN
+
+# Frames with a fixed total length.
+FIXED_LENGTHS = {0x03: 2, 0x04: 2, 0x0E: 3, 0x0F: 3, 0x10: 3, 0x32: 11}
+# Variable-length frames and the minimum length decode_frame() needs.
+MIN_LENGTHS = {0x05: 24, 0x08: 2, 0x0C: 20}
+
+DEFAULT_MAX_PAYLOAD = 20  # ATT_MTU 23 - 3
+FRAGMENT_TIMEOUT = 0.5  # seconds to wait for the next fragment
+
+def _name_end(offset: int) -> Callable[[bytes | bytearray], bool | None]:
+    """Frames ending in a NUL-terminated name at `offset`."""
+    def ends(frame: bytes | bytearray) -> bool | None:
+        return True if frame.find(0, offset) >= 0 else None
+    return ends
+
+def _bulk_end(frame: bytes | bytearray) -> bool | None:
+    # Skip the WorkMode records that follow the opcode back to back.
+    end = len(frame)
+    i = 1
+    while i + WORKMODE_LEN <= end and frame[i] == 0x32 and frame[i + 1] == 0x01:
+        i += WORKMODE_LEN
+    if i == end:
+        return None
+    if frame[i] == 0x32:
+        return False  # a record cut off at the fragment boundary
+    if not frame.endswith(bytes(end - i)):
+        return None  # something else follows the records
+    return True  # zero padding
+
+# Variable frame -> whether it is complete (True), incomplete (False) or cannot tell (None).
+FRAME_ENDS: dict[int, Callable[[bytes | bytearray], bool | None]] = {
+    0x05: _name_end(MIN_LENGTHS[0x05]),
+    0x08: _name_end(1),
+    0x0C: _bulk_end,
+}
+
+class FrameAssembler:
+    def __init__(self, max_payload: int = DEFAULT_MAX_PAYLOAD, timeout: float = FRAGMENT_TIMEOUT) -> None:
+        self.max_payload = max_payload
+        self.timeout = timeout
+        self._buf = bytearray()
+        self._fragments = 0
+        self._last_fragment_len = 0
+        self._updated = 0.0
+
+        self.frames = 0
+        self.reassembled = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._buf)
+
+    @property
+    def deadline(self) -> float:
+        """Time at which a pending partial frame goes stale."""
+        return self._updated + self.timeout
+
+    def reset(self) -> None:
+        if self._buf:
+            self.dropped += 1
+        self._buf.clear()
+        self._fragments = 0
+
+    def feed(self, data: bytes | bytearray, now: float) -> list[bytes | bytearray]:
+        """Add one notification; return the frames it completed (usually just `data`)."""
+        if not data:
+            return []
+        if not self._buf:
+            if self._is_complete(data, len(data)):
+                # Common case: a whole frame in one notification, passed through uncopied.
+                self.frames += 1
+                return [data]
+        elif self._starts_new_frame(data):
+            out = self._flush_partial()
+            return out + self.feed(data, now)
+
+        self._buf += data
+        self._fragments += 1
+        self._last_fragment_len = len(data)
+        self._updated = now
+        return self._drain()
+
+    def flush_stale(self, now: float) -> list[bytes]:
+        """Emit or drop a partial frame whose next fragment never came."""
+        if not self._buf or now < self.deadline:
+            return []
+        return self._flush_partial()
+
+    def _is_complete(self, frame: bytes | bytearray, last_fragment_len: int) -> bool:
+        cmd = frame[0]
+        fixed = FIXED_LENGTHS.get(cmd)
+        if fixed is not None:
+            return len(frame) == fixed
+        minimum = MIN_LENGTHS.get(cmd)
+        if minimum is None:
+            return True  # unknown opcode: nothing to reassemble against
+        if len(frame) < minimum:
+            return False
+        complete = FRAME_ENDS[cmd](frame)
+        if complete is not None:
+            return complete
+        return last_fragment_len not in (DEFAULT_MAX_PAYLOAD, self.max_payload)
+
+    def _starts_new_frame(self, data: bytes | bytearray) -> bool:
+        """A variable frame that already reached its minimum size is followed by a new frame."""
+        minimum = MIN_LENGTHS.get(self._buf[0])
+        if minimum is None or len(self._buf) < minimum:
+            return False
+        cmd = data[0]
+        fixed = FIXED_LENGTHS.get(cmd)
+        if fixed is not None:
+            return len(data) == fixed
+        return cmd in MIN_LENGTHS
+
+    def _drain(self) -> list[bytes | bytearray]:
+        out: list[bytes | bytearray] = []
+        while self._buf:
+            cmd = self._buf[0]
+            fixed = FIXED_LENGTHS.get(cmd)
+            if fixed is not None:
+                if len(self._buf) < fixed:
+                    break
+                out.append(self._take(fixed))
+                continue
+            if self._is_complete(self._buf, self._last_fragment_len):
+                out.append(self._take(len(self._buf)))
+            break
+        return out
+
+    def _take(self, n: int) -> bytes:
+        frame = bytes(self._buf[:n])
+        del self._buf[:n]
+        self.frames += 1
+        if self._fragments > 1:
+            self.reassembled += 1
+        if not self._buf:
+            self._fragments = 0
+        return frame
+
+    def _flush_partial(self) -> list[bytes]:
+        minimum = MIN_LENGTHS.get(self._buf[0])
+        if minimum is not None and len(self._buf) >= minimum:
+            return [self._take(len(self._buf))]
+        self.dropped += 1
+        self._buf.clear()
+        self._fragments = 0
+        return []
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "max_payload": self.max_payload,
+            "frames": self.frames,
+            "reassembled": self.reassembled,
+            "dropped": self.dropped,
+        }
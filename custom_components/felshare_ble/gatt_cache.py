@@ -0,0 +1,72 @@
+"""Persisted GATT handles of the diffuser's UART service.
+
+Service discovery is the slowest part of a connect, especially through a proxy.
+The Bluetooth backends (BlueZ, ESPHome) can reuse services they discovered
+before, but a stale backend cache after a firmware update would send writes to
+the wrong handles. Keeping the NUS handles per address across restarts lets a
+connect use the backend cache when the handles are known, and tells us when the
+services it returned no longer match so the cache can be cleared.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, NUS_SERVICE_UUID, NUS_TX_CHAR_UUID, NUS_RX_CHAR_UUID
+
+STORAGE_VERSION = 1
+
+def nus_snapshot(services: Any) -> dict[str, Any] | None:
+    """Handles of the NUS service and its TX/RX characteristics, or None if missing."""
+    if services is None:
+        return None
+    try:
+        service = services.get_service(NUS_SERVICE_UUID)
+        tx = services.get_characteristic(NUS_TX_CHAR_UUID)
+        rx = services.get_characteristic(NUS_RX_CHAR_UUID)
+    except Exception:
+        return None
+    if service is None or tx is None or rx is None:
+        return None
+    return {
+        "service": service.handle,
+        "tx": tx.handle,
+        "tx_properties": sorted(tx.properties),
+        "rx": rx.handle,
+        "rx_descriptors": sorted(d.handle for d in rx.descriptors),
+    }
+
+class GattHandleCache:
+    def __init__(self, hass: HomeAssistant, address: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.gatt.{address.replace(':', '').lower()}"
+        )
+        self._loaded = False
+        self.snapshot: dict[str, Any] | None = None
+        self.invalidations = 0
+
+    async def async_load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load()
+        if data and data.get("nus"):
+            self.snapshot = data["nus"]
+
+    def matches(self, snapshot: dict[str, Any] | None) -> bool:
+        return snapshot is not None and snapshot == self.snapshot
+
+    async def async_update(self, snapshot: dict[str, Any]) -> None:
+        if snapshot != self.snapshot:
+            self.snapshot = snapshot
+            await self._store.async_save({"nus": snapshot})
+
+    async def async_invalidate(self) -> None:
+        self.invalidations += 1
+        self.snapshot = None
+        await self._store.async_remove()
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
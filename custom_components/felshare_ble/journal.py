@@ -0,0 +1,119 @@
+"""Persisted journal of commands the diffuser could not be reached for.
+
+A write to an unreachable unit used to fail after a long connect attempt and the
+intent was lost, so an automation turning the units off at night silently did
+nothing. The journal keeps the last desired value per writable property (the
+same keys the write coalescer uses), survives restarts, and is replayed as soon
+as the link comes back. Each entry expires after a per-property window: an old
+"power off" must not be replayed the next morning, a schedule change can wait.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Mapping
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, JOURNAL_SAVE_DELAY
+
+STORAGE_VERSION = 1
+
+class CommandJournal:
+    def __init__(self, hass: HomeAssistant, address: str, expiry: Mapping[str, float]) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.journal.{address.replace(':', '').lower()}"
+        )
+        # Seconds an entry stays valid per property; 0 (or missing) disables journaling it.
+        self._expiry = dict(expiry)
+        # prop -> {"value": desired value, "at": wall-clock time it was first journaled}
+        self._entries: dict[str, dict[str, Any]] = {}
+        self.journaled = 0
+        self.replayed = 0
+        self.expired = 0
+
+    def __contains__(self, prop: str) -> bool:
+        return prop in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if data:
+            self._entries = {
+                prop: entry for prop, entry in data.get("entries", {}).items() if prop in self._expiry
+            }
+            self.pending()
+
+    def record(self, prop: str, value: Any, merge: Callable[[Any, Any], Any] | None = None) -> bool:
+        """Journal `value` for `prop`; False if this property is not journaled."""
+        if not self._expiry.get(prop):
+            return False
+        entry = self._entries.get(prop)
+        if merge is not None:
+            value = merge(entry["value"] if entry else None, value)
+        if entry is None or entry["value"] != value:
+            # A replay that failed again keeps its original age.
+            self._entries[prop] = {"value": value, "at": time.time()}
+            self.journaled += 1
+            self._save()
+        return True
+
+    def supersede(self, prop: str, value: Any, merge: Callable[[Any, Any], Any] | None = None) -> None:
+        """A newer write of `prop` was submitted; the entry must not be replayed over it.
+
+        A plain property's entry is dropped. A merged one (schedule changes) folds
+        the newer change in and keeps its age, so replaying it still ends on it.
+        """
+        entry = self._entries.get(prop)
+        if entry is None:
+            return
+        if merge is None:
+            del self._entries[prop]
+        else:
+            entry["value"] = merge(entry["value"], value)
+        self._save()
+
+    def discard(self, prop: str, replayed: bool = False) -> None:
+        """Drop the entry for `prop` once a write for it reached the device."""
+        if self._entries.pop(prop, None) is not None:
+            if replayed:
+                self.replayed += 1
+            self._save()
+
+    def pending(self, now: float | None = None) -> dict[str, Any]:
+        """Valid entries (prop -> value) in journal order; expired ones are dropped."""
+        now = now or time.time()
+        expired = [
+            prop
+            for prop, entry in self._entries.items()
+            if now - entry["at"] > self._expiry.get(prop, 0)
+        ]
+        for prop in expired:
+            del self._entries[prop]
+        if expired:
+            self.expired += len(expired)
+            self._save()
+        return {prop: entry["value"] for prop, entry in self._entries.items()}
+
+    def as_dict(self, now: float | None = None) -> dict[str, Any]:
+        now = now or time.time()
+        return {
+            "entries": {prop: round(now - entry["at"], 1) for prop, entry in self._entries.items()},
+            "journaled": self.journaled,
+            "replayed": self.replayed,
+            "expired": self.expired,
+        }
+
+    async def async_save(self) -> None:
+        await self._store.async_save(self._data())
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    def _save(self) -> None:
+        self._store.async_delay_save(self._data, JOURNAL_SAVE_DELAY)
+
+    def _data(self) -> dict[str, Any]:
+        return {"entries": {prop: dict(entry) for prop, entry in self._entries.items()}}
@@ -0,0 +1,127 @@
+"""Lightweight counters and latency histograms for the BLE link and coordinator.
+
+Recording is a few integer additions and one bisect over fixed bucket bounds, so
+the metrics stay on in production. They are published through diagnostic
+sensors (refreshed periodically, not per frame) and the diagnostics download.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bucket bounds in milliseconds; the last bucket is open-ended.
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+_LABELS = tuple(f"<={b}" for b in BUCKETS_MS) + (f">{BUCKETS_MS[-1]}",)
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max", "last")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000.0
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.last = ms
+        if ms > self.max:
+            self.max = ms
+
+    @property
+    def avg_ms(self) -> float | None:
+        return round(self.total / self.count, 1) if self.count else None
+
+    def quantile_ms(self, q: float) -> float | None:
+        """Upper bound of the bucket holding quantile `q` (the max for the open bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else round(self.max, 1)
+        return round(self.max, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": self.avg_ms,
+            "p50_ms": self.quantile_ms(0.5),
+            "p95_ms": self.quantile_ms(0.95),
+            "max_ms": round(self.max, 1),
+            "last_ms": round(self.last, 1) if self.last is not None else None,
+            "buckets": {label: n for label, n in zip(_LABELS, self.counts) if n},
+        }
+
+class FelshareMetrics:
+    """Per-device counters shared by the connection and the coordinator."""
+
+    __slots__ = (
+        "connects",
+        "connect_failures",
+        "unexpected_disconnects",
+        "frames_rx",
+        "frames_by_opcode",
+        "decode_misses",
+        "writes",
+        "write_errors",
+        "suppressed_writes",
+        "command_retries",
+        "rollbacks",
+        "dispatches",
+        "connect_handles_new",
+        "connect_handles_known",
+        "lock_wait",
+        "write_latency",
+        "reply_latency",
+    )
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.connect_failures = 0
+        self.unexpected_disconnects = 0
+        self.frames_rx = 0
+        self.frames_by_opcode: dict[int, int] = {}
+        self.decode_misses = 0  # frames decode_frame() could not make sense of
+        self.writes = 0
+        self.write_errors = 0
+        self.suppressed_writes = 0  # setter writes skipped because the device already had the value
+        self.command_retries = 0  # resends after a missing echo
+        self.rollbacks = 0  # optimistic values the device never confirmed
+        self.dispatches = 0  # entity state writes triggered by device data
+        self.connect_handles_new = Histogram()  # no stored GATT handles, or they did not match
+        self.connect_handles_known = Histogram()  # the stored GATT handles matched
+        self.lock_wait = Histogram()
+        self.write_latency = Histogram()
+        self.reply_latency = Histogram()
+
+    def frame(self, opcode: int) -> None:
+        self.frames_rx += 1
+        self.frames_by_opcode[opcode] = self.frames_by_opcode.get(opcode, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "connects": self.connects,
+            "connect_failures": self.connect_failures,
+            "unexpected_disconnects": self.unexpected_disconnects,
+            "frames_rx": self.frames_rx,
+            "frames_by_opcode": {f"0x{op:02X}": n for op, n in sorted(self.frames_by_opcode.items())},
+            "decode_misses": self.decode_misses,
+            "writes": self.writes,
+            "write_errors": self.write_errors,
+            "suppressed_writes": self.suppressed_writes,
+            "command_retries": self.command_retries,
+            "rollbacks": self.rollbacks,
+            "dispatches": self.dispatches,
+            "connect_handles_new": self.connect_handles_new.as_dict(),
+            "connect_handles_known": self.connect_handles_known.as_dict(),
+            "lock_wait": self.lock_wait.as_dict(),
+            "write_latency": self.write_latency.as_dict(),
+            "reply_latency": self.reply_latency.as_dict(),
+        }
@@ -7,17 +7,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.const import UnitOfTime
 
 from .const import DOMAIN
-from .entity import FelshareEntity
-from .protocol import parse_hhmm
-
-def _current_work_fields(data: dict):
-    sh, sm = parse_hhmm(data.get("work_start", "09:00"))
-    eh, em = parse_hhmm(data.get("work_end", "21:00"))
-    enabled = bool(data.get("work_enabled", True))
-    daymask = int(data.get("work_days_mask", 0x7F))
-    run_s = int(data.get("work_run_s", 30))
-    stop_s = int(data.get("work_stop_s", 280))
-    return sh, sm, eh, em, enabled, daymask, run_s, stop_s
+from .entity import FelshareCommandEntity
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     coordinator = hass.data[DOMAIN][entry.entry_id]
@@ -31,7 +21,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         ]
     )
 
-class FelshareOilCapacityNumber(FelshareEntity, NumberEntity):
+class FelshareOilCapacityNumber(FelshareCommandEntity, NumberEntity):
     _attr_native_min_value = 0
     _attr_native_max_value = 65535
     _attr_native_step = 1
@@ -42,12 +32,12 @@ class FelshareOilCapacityNumber(FelshareEntity, NumberEntity):
 
     @property
     def native_value(self):
-        return (self.coordinator.data or {}).get("oil_capacity_ml")
+        return self.coordinator.get("oil_capacity_ml")
 
     async def async_set_native_value(self, value: float):
         await self.coordinator.async_set_oil_capacity(int(value))
 
-class FelshareOilRemainNumber(FelshareEntity, NumberEntity):
+class FelshareOilRemainNumber(FelshareCommandEntity, NumberEntity):
     _attr_native_min_value = 0
     _attr_native_max_value = 65535
     _attr_native_step = 1
@@ -58,12 +48,13 @@ class FelshareOilRemainNumber(FelshareEntity, NumberEntity):
 
     @property
     def native_value(self):
-        return (self.coordinator.data or {}).get("oil_remain_ml")
+        return self.coordinator.get("oil_remain_ml")
 
     async def async_set_native_value(self, value: float):
         await self.coordinator.async_set_oil_remain(int(value))
 
-class FelshareOilConsumptionNumber(FelshareEntity, NumberEntity):
+class FelshareOilConsumptionNumber(FelshareCommandEntity, NumberEntity):
+    _state_keys = ("oil_consumption_raw",)
     _attr_native_min_value = 0
     _attr_native_max_value = 6553.5
     _attr_native_step = 0.1
@@ -74,7 +65,7 @@ class FelshareOilConsumptionNumber(FelshareEntity, NumberEntity):
 
     @property
     def native_value(self):
-        raw = (self.coordinator.data or {}).get("oil_consumption_raw")
+        raw = self.coordinator.get("oil_consumption_raw")
         if raw is None:
             return None
         return round(float(raw) / 10.0, 1)
@@ -82,7 +73,7 @@ class FelshareOilConsumptionNumber(FelshareEntity, NumberEntity):
     async def async_set_native_value(self, value: float):
         await self.coordinator.async_set_oil_consumption(float(value))
 
-class FelshareWorkRunNumber(FelshareEntity, NumberEntity):
+class FelshareWorkRunNumber(FelshareCommandEntity, NumberEntity):
     _attr_native_min_value = 0
     _attr_native_max_value = 2000
     _attr_native_step = 1
@@ -93,14 +84,12 @@ class FelshareWorkRunNumber(FelshareEntity, NumberEntity):
 
     @property
     def native_value(self):
-        return (self.coordinator.data or {}).get("work_run_s")
+        return self.coordinator.get("work_run_s")
 
     async def async_set_native_value(self, value: float):
-        data = self.coordinator.data or {}
-        sh, sm, eh, em, enabled, daymask, _run_s, stop_s = _current_work_fields(data)
-        await self.coordinator.async_set_workmode(sh, sm, eh, em, enabled, daymask, int(value), int(stop_s))
+        await self.coordinator.async_update_workmode(run_s=int(value))
 
-class FelshareWorkStopNumber(FelshareEntity, NumberEntity):
+class FelshareWorkStopNumber(FelshareCommandEntity, NumberEntity):
     _attr_native_min_value = 0
     _attr_native_max_value = 2000
     _attr_native_step = 1
@@ -111,9 +100,7 @@ class FelshareWorkStopNumber(FelshareEntity, NumberEntity):
 
     @property
     def native_value(self):
-        return (self.coordinator.data or {}).get("work_stop_s")
+        return self.coordinator.get("work_stop_s")
 
     async def async_set_native_value(self, value: float):
-        data = self.coordinator.data or {}
-        sh, sm, eh, em, enabled, daymask, run_s, _stop_s = _current_work_fields(data)
-        await self.coordinator.async_set_workmode(sh, sm, eh, em, enabled, daymask, int(run_s), int(value))
+        await self.coordinator.async_update_workmode(stop_s=int(value))
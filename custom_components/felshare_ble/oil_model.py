@@ -0,0 +1,233 @@
+"""Oil consumption model: remaining oil and time to empty between status polls.
+
+oil_remain_ml only changes when a status frame arrives. In between, the model
+integrates what the device's own settings say it consumes:
+
+    consumption rate (oil_consumption_raw, mL/h) × run / (run + stop) duty cycle
+
+while the unit is on and, with the schedule enabled, inside the work window on
+the days of the day mask (evaluated on the device clock). Every status frame
+re-anchors the prediction on the reported value and records the prediction
+error. The device reports whole millilitres, so a prediction within half a
+millilitre of the report is kept as is rather than snapped to the integer. Over
+longer stretches (LEARN_MIN_ML of modelled consumption) the ratio of the actual
+to the modelled drop is learnt as a correction factor, which absorbs how far the
+nominal rate is off for the oil and the unit. A rise of more than REFILL_ML is a
+refill: the model re-anchors without counting it as an error.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, NamedTuple
+
+# State fields the model reads (see OilInputs.from_state).
+INPUT_FIELDS = (
+    "power_on",
+    "oil_consumption_raw",
+    "work_start_h",
+    "work_start_m",
+    "work_end_h",
+    "work_end_m",
+    "work_enabled",
+    "work_days_mask",
+    "work_run_s",
+    "work_stop_s",
+)
+
+REFILL_ML = 2.0
+LEARN_MIN_ML = 5.0  # modelled consumption before the correction factor is updated
+CORRECTION_RANGE = (0.2, 5.0)
+CORRECTION_WEIGHT = 0.5
+ERROR_WEIGHT = 0.3  # weight of the latest error in the running average
+HORIZON_DAYS = 60  # time_to_empty() gives up beyond this
+
+class OilInputs(NamedTuple):
+    power_on: bool
+    rate_ml_h: float
+    run_s: int
+    stop_s: int
+    schedule_enabled: bool
+    start_min: int  # minutes after midnight
+    end_min: int
+    days_mask: int  # bit 0 = Sunday … bit 6 = Saturday
+
+    @classmethod
+    def from_state(cls, state: Any) -> "OilInputs | None":
+        """Inputs from a FelshareState; None until power and consumption rate are known."""
+        power, raw = state.power_on, state.oil_consumption_raw
+        if power is None or raw is None:
+            return None
+        f = state.workmode_fields()
+        return cls(
+            bool(power),
+            raw / 10.0,
+            f["run_s"],
+            f["stop_s"],
+            f["enabled"],
+            f["sh"] * 60 + f["sm"],
+            f["eh"] * 60 + f["em"],
+            f["daymask"],
+        )
+
+    @property
+    def duty(self) -> float:
+        total = self.run_s + self.stop_s
+        return self.run_s / total if total else 0.0
+
+def _windows(inputs: OilInputs, start: datetime, end: datetime):
+    """(from, to) work windows overlapping [start, end), in order."""
+    day = datetime.combine(start.date(), datetime.min.time()) - timedelta(days=1)
+    length = (inputs.end_min - inputs.start_min) % 1440 or 1440  # end <= start runs past midnight
+    while day < end:
+        if inputs.days_mask & (1 << (day.isoweekday() % 7)):
+            opens = day + timedelta(minutes=inputs.start_min)
+            closes = opens + timedelta(minutes=length)
+            if closes > start and opens < end:
+                yield max(opens, start), min(closes, end)
+        day += timedelta(days=1)
+
+def active_seconds(inputs: OilInputs, start: datetime, end: datetime) -> float:
+    """Seconds of [start, end) in which the unit diffuses (run and stop phases alike)."""
+    if not inputs.power_on or end <= start:
+        return 0.0
+    if not inputs.schedule_enabled:
+        return (end - start).total_seconds()
+    return sum((to - frm).total_seconds() for frm, to in _windows(inputs, start, end))
+
+def seconds_until_active(inputs: OilInputs, start: datetime, needed: float) -> float | None:
+    """Wall-clock seconds from `start` until `needed` active seconds have passed, if within the horizon."""
+    if not inputs.power_on:
+        return None
+    if not inputs.schedule_enabled:
+        return needed
+    done = 0.0
+    for frm, to in _windows(inputs, start, start + timedelta(days=HORIZON_DAYS)):
+        span = (to - frm).total_seconds()
+        if done + span >= needed:
+            return (frm - start).total_seconds() + needed - done
+        done += span
+    return None
+
+class OilModel:
+    def __init__(self, accurate_error_ml: float = 2.0, min_observations: int = 3) -> None:
+        self.accurate_error_ml = accurate_error_ml
+        self.min_observations = min_observations
+        self.inputs: OilInputs | None = None
+        self.correction = 1.0
+        self.observations = 0  # status frames compared with a prediction
+        self.refills = 0
+        self.last_error_ml: float | None = None  # predicted - reported
+        self.error_ml: float | None = None  # running average of |error|
+
+        # Anchor: monotonic time, device wall clock at that time, remaining mL.
+        self._anchor: tuple[float, datetime, float] | None = None
+        # Correction learning: reported mL at the start, modelled (uncorrected) mL consumed since.
+        self._learn: tuple[float, float] | None = None
+
+    @property
+    def anchored(self) -> bool:
+        return self._anchor is not None
+
+    @property
+    def accurate(self) -> bool:
+        """Whether recent predictions matched the device well enough to poll less."""
+        return (
+            self.observations >= self.min_observations
+            and self.error_ml is not None
+            and self.error_ml <= self.accurate_error_ml
+        )
+
+    def rate_ml_s(self) -> float:
+        """Consumption per active second, with the learnt correction."""
+        if self.inputs is None:
+            return 0.0
+        return self.inputs.rate_ml_h / 3600.0 * self.inputs.duty * self.correction
+
+    def _clock(self, now: float) -> datetime:
+        mono, clock, _remain = self._anchor
+        return clock + timedelta(seconds=now - mono)
+
+    def _consumed(self, now: float) -> float:
+        """Modelled mL consumed since the anchor."""
+        if self.inputs is None:
+            return 0.0
+        mono, clock, _remain = self._anchor
+        return active_seconds(self.inputs, clock, self._clock(now)) * self.rate_ml_s()
+
+    def predict(self, now: float) -> float | None:
+        """Predicted mL remaining at monotonic time `now`."""
+        if self._anchor is None:
+            return None
+        return max(0.0, self._anchor[2] - self._consumed(now))
+
+    def time_to_empty(self, now: float) -> float | None:
+        """Predicted seconds until the oil runs out; None if it does not within the horizon."""
+        remaining = self.predict(now)
+        rate = self.rate_ml_s()
+        if remaining is None or self.inputs is None or rate <= 0:
+            return None
+        return seconds_until_active(self.inputs, self._clock(now), remaining / rate)
+
+    def _advance(self, now: float) -> None:
+        """Move the anchor to `now` on the prediction, keeping the learning window."""
+        consumed = self._consumed(now)
+        if self._learn is not None and self.correction:
+            self._learn = (self._learn[0], self._learn[1] + consumed / self.correction)
+        self._anchor = (now, self._clock(now), max(0.0, self._anchor[2] - consumed))
+
+    def set_inputs(self, now: float, inputs: OilInputs | None) -> None:
+        """The settings changed: what was consumed until now used the old ones."""
+        if self._anchor is not None:
+            self._advance(now)
+        self.inputs = inputs
+
+    def observe(self, now: float, remain_ml: float, clock: datetime | None = None, measured: bool = True) -> None:
+        """Re-anchor on a reported value.
+
+        `measured` is False for values the device only echoed after they were set
+        (no prediction error is recorded); `clock` is the device clock at `now`.
+        """
+        if clock is None:
+            clock = self._clock(now) if self._anchor is not None else datetime.now()
+        predicted = self.predict(now)
+        if predicted is None or not measured or remain_ml > predicted + REFILL_ML:
+            if predicted is not None and measured:
+                self.refills += 1
+            self._anchor = (now, clock, float(remain_ml))
+            self._learn = (float(remain_ml), 0.0)
+            return
+
+        self._advance(now)
+        error = predicted - remain_ml
+        self.observations += 1
+        self.last_error_ml = error
+        if self.error_ml is None:
+            self.error_ml = abs(error)
+        else:
+            self.error_ml += ERROR_WEIGHT * (abs(error) - self.error_ml)
+
+        start, modelled = self._learn
+        if modelled >= LEARN_MIN_ML:
+            ratio = max(0.0, start - remain_ml) / modelled
+            self.correction += CORRECTION_WEIGHT * (ratio - self.correction)
+            self.correction = min(max(self.correction, CORRECTION_RANGE[0]), CORRECTION_RANGE[1])
+            self._learn = (float(remain_ml), 0.0)
+
+        # Whole millilitres: keep a prediction that rounds to the report.
+        anchored = min(max(predicted, remain_ml - 0.5), remain_ml + 0.5)
+        self._anchor = (now, clock, anchored)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        tte = self.time_to_empty(now)
+        predicted = self.predict(now)
+        return {
+            "predicted_ml": round(predicted, 1) if predicted is not None else None,
+            "time_to_empty_h": round(tte / 3600.0, 1) if tte is not None else None,
+            "rate_ml_h": round(self.rate_ml_s() * 3600.0, 3),
+            "correction": round(self.correction, 3),
+            "observations": self.observations,
+            "last_error_ml": round(self.last_error_ml, 2) if self.last_error_ml is not None else None,
+            "error_ml": round(self.error_ml, 2) if self.error_ml is not None else None,
+            "accurate": self.accurate,
+            "refills": self.refills,
+        }
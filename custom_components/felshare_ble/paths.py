@@ -0,0 +1,103 @@
+"""Connection path (adapter / proxy) ranking.
+
+A diffuser in range of several Bluetooth adapters or ESPHome proxies can be
+connected through any of them. Home Assistant's last service info only names the
+scanner with the latest advertisement, which is not necessarily the one with the
+best link, a free connection slot or a history of connects that work. Every
+connect ranks the scanners that currently see the device on a single dB-like
+score:
+
+    rssi                    as reported by the scanner (-100 when unknown)
+    - age / 10              1 dB per 10 s since the scanner last heard the device, capped
+    - no free slot          the proxy is full: connecting would wait or evict someone
+    + past success rate     Laplace-smoothed, ±10 dB between never and always working
+    - recent failures       per consecutive failure, fading out over the cooldown
+    - connect time          1 dB per second of the path's average connect time
+
+Path statistics are kept per device and per source for the lifetime of the
+connection; when the best path fails the connection falls over to the next one.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, NamedTuple
+
+RSSI_UNKNOWN = -100
+AGE_CAP = 300.0  # seconds; older advertisements all cost the same
+NO_SLOT_PENALTY = 40.0
+HISTORY_WEIGHT = 20.0
+CONNECT_TIME_EWMA = 0.3  # weight of the latest connect in the running average
+
+class PathCandidate(NamedTuple):
+    """One scanner that can currently see the device."""
+
+    source: str
+    rssi: int | None
+    age: float | None  # seconds since the scanner last heard the device
+    free_slots: int | None  # None when unknown
+    device: Any  # the BLEDevice as seen through this scanner
+
+class PathStats:
+    __slots__ = ("successes", "failures", "consecutive_failures", "failed_at", "connect_time")
+
+    def __init__(self) -> None:
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.failed_at = 0.0
+        self.connect_time: float | None = None  # running average, seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "connect_time_s": round(self.connect_time, 2) if self.connect_time is not None else None,
+        }
+
+class PathSelector:
+    """Ranks connection paths for one device and remembers how each one did."""
+
+    def __init__(self, failure_penalty: float = 15.0, cooldown: float = 600.0) -> None:
+        self.failure_penalty = failure_penalty
+        self.cooldown = cooldown
+        self.stats: dict[str, PathStats] = {}
+        self.failovers = 0
+
+    def score(self, candidate: PathCandidate, now: float) -> float:
+        score = float(candidate.rssi if candidate.rssi is not None else RSSI_UNKNOWN)
+        if candidate.age is not None:
+            score -= min(candidate.age, AGE_CAP) / 10.0
+        if candidate.free_slots is not None and candidate.free_slots <= 0:
+            score -= NO_SLOT_PENALTY
+        stats = self.stats.get(candidate.source)
+        if stats is not None:
+            rate = (stats.successes + 1) / (stats.successes + stats.failures + 2)
+            score += (rate - 0.5) * HISTORY_WEIGHT
+            if stats.consecutive_failures:
+                fade = max(0.0, 1.0 - (now - stats.failed_at) / self.cooldown)
+                score -= stats.consecutive_failures * self.failure_penalty * fade
+            if stats.connect_time is not None:
+                score -= stats.connect_time
+        return score
+
+    def rank(self, candidates: Iterable[PathCandidate], now: float) -> list[PathCandidate]:
+        """Candidates best first (ties keep their order)."""
+        return sorted(candidates, key=lambda c: self.score(c, now), reverse=True)
+
+    def record_success(self, source: str, elapsed: float) -> None:
+        stats = self.stats.setdefault(source, PathStats())
+        stats.successes += 1
+        stats.consecutive_failures = 0
+        if stats.connect_time is None:
+            stats.connect_time = elapsed
+        else:
+            stats.connect_time += CONNECT_TIME_EWMA * (elapsed - stats.connect_time)
+
+    def record_failure(self, source: str, now: float) -> None:
+        stats = self.stats.setdefault(source, PathStats())
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        stats.failed_at = now
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"failovers": self.failovers, "by_source": {s: v.as_dict() for s, v in self.stats.items()}}
@@ -0,0 +1,122 @@
+"""Adaptive status-poll timing.
+
+The status poll only exists to catch changes the device does not push. It is
+pointless right after a status frame arrived anyway, worth doing more often
+while someone is operating the unit or the oil level moves quickly, less often
+while the oil model (oil_model.py) predicts the level well, and a waste of proxy
+time while the unit is unreachable. AdaptivePollSchedule turns those
+observations into the delay until the next poll; the coordinator owns the timer.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+REASON_NORMAL = "normal"
+REASON_COMMAND = "command"
+REASON_OIL = "oil_changing"
+REASON_MODEL = "oil_model"
+REASON_BACKOFF = "unreachable"
+
+MIN_DELAY = 5.0  # seconds; never poll back-to-back
+
+class AdaptivePollSchedule:
+    def __init__(
+        self,
+        base: float,
+        fast: float,
+        maximum: float,
+        fast_window: float,
+        oil_fast_rate: float,
+        relaxed: float | None = None,
+    ) -> None:
+        self.base = float(base)
+        self.fast = float(fast)
+        self.maximum = float(maximum)
+        self.fast_window = float(fast_window)
+        self.oil_fast_rate = float(oil_fast_rate)  # mL/h
+        self.relaxed = float(relaxed) if relaxed else self.base  # while the oil model is accurate
+        self.model_accurate = False
+
+        self.interval = self.base
+        self.reason = REASON_NORMAL
+        self.failures = 0
+        self.polls = 0
+        self.postponed = 0  # polls pushed back by a status frame that arrived on its own
+
+        self._last_status: float | None = None
+        self._fast_until = 0.0
+        self._fast_reason = REASON_NORMAL
+        self._oil_sample: tuple[float, int] | None = None
+        self._due: float | None = None
+
+    def note_status(self, now: float) -> None:
+        """A full status frame arrived (polled or pushed)."""
+        self._last_status = now
+        self.note_reachable()
+
+    def note_reachable(self) -> bool:
+        """The device answered or connected: end the unreachable backoff; True if it was on."""
+        if not self.failures:
+            return False
+        self.failures = 0
+        self._due = None  # the backoff due time is no reference for postponed polls
+        return True
+
+    def note_command(self, now: float) -> None:
+        self._speed_up(now, REASON_COMMAND)
+
+    def note_model(self, accurate: bool) -> None:
+        """Whether the oil model's predictions currently match the reported level."""
+        self.model_accurate = accurate
+
+    def note_oil(self, now: float, remain_ml: int | None) -> None:
+        if remain_ml is None:
+            return
+        sample = self._oil_sample
+        self._oil_sample = (now, remain_ml)
+        if sample is None or now - sample[0] < MIN_DELAY or self.model_accurate:
+            # A level change the model predicted is no reason to poll faster.
+            return
+        rate = abs(remain_ml - sample[1]) * 3600.0 / (now - sample[0])
+        if rate >= self.oil_fast_rate:
+            self._speed_up(now, REASON_OIL)
+
+    def note_result(self, ok: bool) -> None:
+        self.polls += 1
+        self.failures = 0 if ok else self.failures + 1
+
+    def _speed_up(self, now: float, reason: str) -> None:
+        self._fast_until = now + self.fast_window
+        self._fast_reason = reason
+
+    def next_delay(self, now: float) -> float:
+        """Seconds until the next poll; also updates interval/reason."""
+        if self.failures:
+            interval = min(self.maximum, self.base * 2 ** self.failures)
+            reason = REASON_BACKOFF
+        elif now < self._fast_until:
+            interval, reason = self.fast, self._fast_reason
+        elif self.model_accurate:
+            interval, reason = self.relaxed, REASON_MODEL
+        else:
+            interval, reason = self.base, REASON_NORMAL
+        self.interval, self.reason = interval, reason
+
+        due = now + interval
+        if not self.failures and self._last_status is not None:
+            # Count from the last status frame: a pushed one makes a poll unnecessary.
+            due = self._last_status + interval
+        due = max(due, now + MIN_DELAY)
+        if self._due is not None and due > self._due and now < self._due:
+            self.postponed += 1
+        self._due = due
+        return due - now
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "reason": self.reason,
+            "next_poll_in_s": round(max(0.0, self._due - now), 1) if self._due is not None else None,
+            "polls": self.polls,
+            "postponed": self.postponed,
+            "failures": self.failures,
+        }
@@ -5,26 +5,36 @@ and responses/updates are received via RX notifications.
 
 Frame formats (observed):
   - Status (0x05): variable length, contains time + power/fan + oil info
-  - Bulk (0x0C): long frame that contains embedded WorkMode (0x32 0x01 ...)
+  - Bulk (0x0C): long frame that contains embedded WorkMode records (0x32 0x01 ...)
   - WorkMode (0x32 0x01): exactly 11 bytes
   - Simple property frames: 0x03,0x04,0x08,0x0E,0x0F,0x10
 """
 from __future__ import annotations
 
-from typing import Any
+import struct
+from typing import Any, Callable, NamedTuple
+
+# Precompiled layouts, unpacked in place (no slicing) from bytes/bytearray/memoryview.
+_U16 = struct.Struct(">H")
+# Status 0x05 from offset 1: year, month, day, hour, minute, second, (pad), power, fan,
+# consumption, capacity, (5 unknown), remaining.
+_STATUS = struct.Struct(">HBBBBBxBBHH5xH")
+# WorkMode body after 0x32 0x01: sh, sm, eh, em, flag, run_s, stop_s.
+_WORKMODE = struct.Struct(">BBBBBHH")
+
+# bytes.translate() delete table: everything outside printable ASCII (32..126).
+_NON_PRINTABLE = bytes(c for c in range(256) if not 32 <= c <= 126)
 
 def u16be(b: bytes) -> int:
     return int.from_bytes(b[:2], "big", signed=False)
 
 def sanitize_ascii_label(raw: bytes) -> str:
     """Trim at NUL and keep printable ASCII."""
-    if b"\x00" in raw:
-        raw = raw.split(b"\x00", 1)[0]
-    out = []
-    for c in raw:
-        if 32 <= c <= 126:
-            out.append(chr(c))
-    return "".join(out).strip()
+    raw = bytes(raw)
+    nul = raw.find(0)
+    if nul >= 0:
+        raw = raw[:nul]
+    return raw.translate(None, _NON_PRINTABLE).decode("ascii").strip()
 
 def clamp_int(v: int, lo: int, hi: int) -> int:
     if v < lo:
@@ -33,11 +43,6 @@ def clamp_int(v: int, lo: int, hi: int) -> int:
         return hi
     return v
 
-def parse_hhmm(s: str) -> tuple[int, int]:
-    s = (s or "").strip()
-    hh, mm = s.split(":")
-    return int(hh), int(mm)
-
 def bytes_workmode(sh: int, sm: int, eh: int, em: int, enabled: bool, daymask: int, run_s: int, stop_s: int) -> bytes:
     flag = (0x80 if enabled else 0x00) | (daymask & 0x7F)
     return bytes([0x32, 0x01, sh & 0xFF, sm & 0xFF, eh & 0xFF, em & 0xFF, flag & 0xFF]) + int(run_s).to_bytes(2, "big") + int(stop_s).to_bytes(2, "big")
@@ -73,103 +78,226 @@ def bytes_oil_consumption(raw_tenths: int) -> bytes:
     raw_tenths = clamp_int(int(raw_tenths), 0, 65535)
     return bytes([0x0E]) + raw_tenths.to_bytes(2, "big")
 
+# Opcodes the device answers by echoing a frame with the same opcode.
+_ECHO_OPCODES = frozenset((0x03, 0x04, 0x05, 0x08, 0x0C, 0x0E, 0x0F, 0x10))
+
+def reply_matcher(payload: bytes) -> Callable[[bytes], bool] | None:
+    """Return a predicate for the notification that answers `payload`, if any."""
+    if not payload:
+        return None
+    cmd = payload[0]
+    if cmd == 0x32:
+        return lambda frame: len(frame) >= 2 and frame[0] == 0x32 and frame[1] == 0x01
+    if cmd == 0x05:
+        return lambda frame: frame[0] == 0x05 and len(frame) >= 24
+    if cmd in _ECHO_OPCODES:
+        return lambda frame: frame[0] == cmd
+    return None
+
+_WORKMODE_SIG = b"\x32\x01"
+WORKMODE_LEN = 11
+
 def find_workmode_inside_bytes(payload: bytes) -> tuple[int,int,int,int,int,int,int,int] | None:
-    sig = bytes([0x32, 0x01])
-    if len(payload) < 11:
+    if len(payload) < WORKMODE_LEN:
         return None
-    for i in range(0, len(payload) - 11 + 1):
-        if payload[i:i+2] != sig:
-            continue
-        sh, sm, eh, em = payload[i+2], payload[i+3], payload[i+4], payload[i+5]
-        flag = payload[i+6]
-        run_s = u16be(payload[i+7:i+9])
-        stop_s = u16be(payload[i+9:i+11])
+    i = payload.find(_WORKMODE_SIG)
+    if 0 <= i <= len(payload) - WORKMODE_LEN:
+        sh, sm, eh, em, flag, run_s, stop_s = _WORKMODE.unpack_from(payload, i + 2)
         return (sh, sm, eh, em, flag, run_s, stop_s, i)
     return None
 
-def decode_frame(frame: bytes) -> dict[str, Any]:
-    """Decode a notification frame into a partial state dict."""
-    st: dict[str, Any] = {}
-    if not frame:
-        return st
+class BulkFrame(NamedTuple):
+    """Records found in a bulk 0x0C frame."""
 
-    cmd = frame[0]
-
-    # Status 05
-    if cmd == 0x05 and len(frame) >= 24:
-        year = u16be(frame[1:3])
-        month = frame[3]
-        day = frame[4]
-        hour = frame[5]
-        minute = frame[6]
-        second = frame[7]
-        st["device_time"] = f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
-
-        pwr = frame[9]
-        fan = frame[10]
-        st["power_on"] = True if pwr == 1 else False if pwr == 0 else None
-        st["fan_on"] = True if fan == 1 else False if fan == 0 else None
-
-        st["oil_consumption_raw"] = u16be(frame[11:13])
-        st["oil_capacity_ml"] = u16be(frame[13:15])
-        st["oil_remain_ml"] = u16be(frame[20:22])
-
-        cap = st.get("oil_capacity_ml")
-        rem = st.get("oil_remain_ml")
-        if isinstance(cap, int) and cap > 0 and isinstance(rem, int):
-            st["oil_level_pct"] = int((rem * 100) / cap)
-
-        raw_name = frame[24:] if len(frame) > 24 else b""
-        name = sanitize_ascii_label(raw_name)
-        if name:
-            st["oil_name"] = name
-        return st
+    # (sh, sm, eh, em, flag, run_s, stop_s) per WorkMode record, in frame order
+    schedules: tuple[tuple[int, ...], ...]
+    # offset of each schedule record
+    offsets: tuple[int, ...]
+    # (offset, hex) of non-zero spans no known record accounts for, opcode excluded
+    unknown: tuple[tuple[int, str], ...]
 
-    # Bulk 0C (contains embedded 32 01 ...)
-    if cmd == 0x0C and len(frame) >= 20:
-        wm = find_workmode_inside_bytes(frame)
-        if wm:
-            sh, sm, eh, em, flag, run_s, stop_s, _off = wm
-            st["work_start"] = f"{sh:02d}:{sm:02d}"
-            st["work_end"] = f"{eh:02d}:{em:02d}"
-            st["work_enabled"] = bool(flag & 0x80)
-            st["work_days_mask"] = int(flag & 0x7F)
-            st["work_run_s"] = int(run_s)
-            st["work_stop_s"] = int(stop_s)
-        return st
+def _valid_workmode(sh: int, sm: int, eh: int, em: int) -> bool:
+    # The end may be 24:00 (until midnight).
+    return sh < 24 and sm < 60 and (eh < 24 and em < 60 or eh == 24 and em == 0)
 
-    # WorkMode 32
-    if cmd == 0x32 and len(frame) == 11 and frame[1] == 0x01:
-        sh, sm, eh, em = frame[2], frame[3], frame[4], frame[5]
-        flag = frame[6]
-        st["work_start"] = f"{sh:02d}:{sm:02d}"
-        st["work_end"] = f"{eh:02d}:{em:02d}"
-        st["work_enabled"] = bool(flag & 0x80)
-        st["work_days_mask"] = int(flag & 0x7F)
-        st["work_run_s"] = u16be(frame[7:9])
-        st["work_stop_s"] = u16be(frame[9:11])
-        return st
+def parse_bulk(frame: bytes, header_len: int = 1) -> BulkFrame:
+    """Walk a bulk 0x0C frame once and collect every WorkMode record.
 
-    # Simple property frames
-    if cmd == 0x03 and len(frame) >= 2:
-        st["power_on"] = True if frame[1] == 1 else False if frame[1] == 0 else None
-        return st
-    if cmd == 0x04 and len(frame) >= 2:
-        st["fan_on"] = True if frame[1] == 1 else False if frame[1] == 0 else None
-        return st
-    if cmd == 0x08 and len(frame) >= 2:
-        name = sanitize_ascii_label(frame[1:])
+    Candidates are located with bytes.find() on the 0x32 0x01 signature and kept
+    when their times are plausible, so a stray 0x32 0x01 inside another field is
+    not mistaken for a schedule. Bytes between records are reported as unknown.
+    """
+    frame = bytes(frame)
+    schedules: list[tuple[int, ...]] = []
+    offsets: list[int] = []
+    unknown: list[tuple[int, str]] = []
+    end = len(frame) - WORKMODE_LEN
+    covered = header_len
+    i = frame.find(_WORKMODE_SIG, header_len)
+    while 0 <= i <= end:
+        rec = _WORKMODE.unpack_from(frame, i + 2)
+        if not _valid_workmode(*rec[:4]):
+            i = frame.find(_WORKMODE_SIG, i + 1)
+            continue
+        if i > covered and frame[covered:i].strip(b"\x00"):
+            unknown.append((covered, frame[covered:i].hex()))
+        schedules.append(rec)
+        offsets.append(i)
+        covered = i + WORKMODE_LEN
+        i = frame.find(_WORKMODE_SIG, covered)
+    if covered < len(frame) and frame[covered:].strip(b"\x00"):
+        unknown.append((covered, frame[covered:].hex()))
+    return BulkFrame(tuple(schedules), tuple(offsets), tuple(unknown))
+
+def _bool_or_none(v: int) -> bool | None:
+    return True if v == 1 else False if v == 0 else None
+
+def _put_workmode(st: dict[str, Any], sh: int, sm: int, eh: int, em: int, flag: int, run_s: int, stop_s: int) -> None:
+    st["work_start_h"] = sh
+    st["work_start_m"] = sm
+    st["work_end_h"] = eh
+    st["work_end_m"] = em
+    st["work_enabled"] = bool(flag & 0x80)
+    st["work_days_mask"] = flag & 0x7F
+    st["work_run_s"] = run_s
+    st["work_stop_s"] = stop_s
+
+def _decode_status(frame) -> dict[str, Any]:
+    if len(frame) < 24:
+        return {}
+    year, month, day, hour, minute, second, pwr, fan, cons, cap, rem = _STATUS.unpack_from(frame, 1)
+    st: dict[str, Any] = {
+        "device_clock": (year, month, day, hour, minute, second),
+        "power_on": _bool_or_none(pwr),
+        "fan_on": _bool_or_none(fan),
+        "oil_consumption_raw": cons,
+        "oil_capacity_ml": cap,
+        "oil_remain_ml": rem,
+    }
+    if len(frame) > 24:
+        name = sanitize_ascii_label(frame[24:])
         if name:
             st["oil_name"] = name
+    return st
+
+def _decode_bulk(frame) -> dict[str, Any]:
+    st: dict[str, Any] = {}
+    if len(frame) < 20:
         return st
-    if cmd == 0x0E and len(frame) >= 3:
-        st["oil_consumption_raw"] = u16be(frame[1:3])
-        return st
-    if cmd == 0x0F and len(frame) >= 3:
-        st["oil_capacity_ml"] = u16be(frame[1:3])
-        return st
-    if cmd == 0x10 and len(frame) >= 3:
-        st["oil_remain_ml"] = u16be(frame[1:3])
-        return st
+    bulk = parse_bulk(frame)
+    if bulk.schedules:
+        # The first record is the active schedule; all of them are kept as slots.
+        _put_workmode(st, *bulk.schedules[0])
+        st["work_slots"] = bulk.schedules
+    st["bulk_unknown"] = bulk.unknown
+    return st
 
+def _decode_workmode(frame) -> dict[str, Any]:
+    st: dict[str, Any] = {}
+    if len(frame) == 11 and frame[1] == 0x01:
+        _put_workmode(st, *_WORKMODE.unpack_from(frame, 2))
     return st
+
+def _decode_power(frame) -> dict[str, Any]:
+    return {"power_on": _bool_or_none(frame[1])} if len(frame) >= 2 else {}
+
+def _decode_fan(frame) -> dict[str, Any]:
+    return {"fan_on": _bool_or_none(frame[1])} if len(frame) >= 2 else {}
+
+def _decode_oil_name(frame) -> dict[str, Any]:
+    if len(frame) < 2:
+        return {}
+    name = sanitize_ascii_label(frame[1:])
+    return {"oil_name": name} if name else {}
+
+def _u16_decoder(key: str) -> Callable[[Any], dict[str, Any]]:
+    def decode(frame) -> dict[str, Any]:
+        return {key: _U16.unpack_from(frame, 1)[0]} if len(frame) >= 3 else {}
+    return decode
+
+# Opcode -> decoder. Decoders accept bytes, bytearray or memoryview.
+DECODERS: dict[int, Callable[[Any], dict[str, Any]]] = {
+    0x03: _decode_power,
+    0x04: _decode_fan,
+    0x05: _decode_status,
+    0x08: _decode_oil_name,
+    0x0C: _decode_bulk,
+    0x0E: _u16_decoder("oil_consumption_raw"),
+    0x0F: _u16_decoder("oil_capacity_ml"),
+    0x10: _u16_decoder("oil_remain_ml"),
+    0x32: _decode_workmode,
+}
+
+_WORKMODE_FIELDS = (
+    "work_start_h", "work_start_m", "work_end_h", "work_end_m",
+    "work_enabled", "work_days_mask", "work_run_s", "work_stop_s",
+)
+# Opcode -> state fields its frame may carry.
+DECODED_FIELDS: dict[int, tuple[str, ...]] = {
+    0x03: ("power_on",),
+    0x04: ("fan_on",),
+    0x05: (
+        "device_clock", "power_on", "fan_on", "oil_consumption_raw",
+        "oil_capacity_ml", "oil_remain_ml", "oil_name",
+    ),
+    0x08: ("oil_name",),
+    0x0C: _WORKMODE_FIELDS + ("work_slots", "bulk_unknown"),
+    0x0E: ("oil_consumption_raw",),
+    0x0F: ("oil_capacity_ml",),
+    0x10: ("oil_remain_ml",),
+    0x32: _WORKMODE_FIELDS,
+}
+# Opcode -> the other opcodes whose frames set some of the same fields.
+_OVERLAPS: dict[int, tuple[int, ...]] = {
+    op: tuple(
+        other for other, theirs in DECODED_FIELDS.items()
+        if other != op and set(fields).intersection(theirs)
+    )
+    for op, fields in DECODED_FIELDS.items()
+}
+
+def decode_frame(frame: bytes) -> dict[str, Any]:
+    """Decode a notification frame into a partial state dict (FelshareState field names)."""
+    if not frame:
+        return {}
+    decoder = DECODERS.get(frame[0])
+    if decoder is None:
+        return {}
+    return decoder(frame)
+
+class FrameDecoder:
+    """Per-device decoder that skips frames identical to the previous one of the same opcode.
+
+    A repeated frame cannot change state, so decode() returns None for it instead of
+    building a new dict. That only holds while no other opcode changed the same
+    fields in between (a status frame reporting power off between two 03 01
+    echoes), so a decoded frame forgets the cached frames of every opcode it
+    overlaps with. Frames may be bytearray (as handed over by Bleak); only frames
+    that differ from the cached one are copied.
+    """
+
+    __slots__ = ("_last", "duplicates")
+
+    def __init__(self) -> None:
+        self._last: dict[int, bytes] = {}
+        self.duplicates = 0
+
+    def decode(self, frame) -> dict[str, Any] | None:
+        if not frame:
+            return {}
+        cmd = frame[0]
+        last = self._last.get(cmd)
+        if last is not None and last == frame:
+            self.duplicates += 1
+            return None
+        decoder = DECODERS.get(cmd)
+        if decoder is None:
+            return {}
+        last_frames = self._last
+        last_frames[cmd] = bytes(frame)
+        for other in _OVERLAPS[cmd]:
+            last_frames.pop(other, None)
+        return decoder(frame)
+
+    def reset(self) -> None:
+        self._last.clear()
@@ -0,0 +1,225 @@
+"""Domain-wide BLE connection-slot scheduler.
+
+Every Felshare config entry connects on its own, but they all share the same few
+adapters / ESPHome proxies, each of which only has a handful of connection slots.
+The scheduler hands out connection leases per adapter (scanner source) within a
+slot budget, queues waiting devices first-come-first-served and asks idle lease
+holders to give their slot back when someone else is waiting. A holder that is
+busy at that moment is asked again once its lease has been idle long enough.
+The budget and the idle time come from the entries' options; when loaded entries
+disagree, the smallest value applies.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from .const import DOMAIN, DATA_SLOT_SCHEDULER, DEFAULT_SLOTS_PER_ADAPTER, DEFAULT_LEASE_IDLE_RECLAIM
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+RECLAIM_RECHECK_MIN = 1.0  # seconds between asking a holder that declined or stays busy
+
+class SlotLease:
+    __slots__ = ("source", "address", "acquired_at", "last_activity", "_reclaim", "released")
+
+    def __init__(self, source: str, address: str, reclaim: Callable[[], Awaitable[None]] | None) -> None:
+        self.source = source
+        self.address = address
+        self.acquired_at = time.monotonic()
+        self.last_activity = self.acquired_at
+        self._reclaim = reclaim
+        self.released = False
+
+    def touch(self) -> None:
+        """Record link activity so the lease is not treated as idle."""
+        self.last_activity = time.monotonic()
+
+class FelshareSlotScheduler:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        slots_per_adapter: int = DEFAULT_SLOTS_PER_ADAPTER,
+        idle_reclaim: float = DEFAULT_LEASE_IDLE_RECLAIM,
+    ) -> None:
+        self.hass = hass
+        self._default_limits = (max(1, int(slots_per_adapter)), float(idle_reclaim))
+        self._limits: dict[str, tuple[int, float]] = {}  # config entry id -> (slots, idle reclaim)
+        self._held: dict[str, list[SlotLease]] = {}
+        self._waiters: dict[str, deque[tuple[asyncio.Future, SlotLease]]] = {}
+        self._reclaiming: set[SlotLease] = set()
+        self._rechecks: dict[str, asyncio.TimerHandle] = {}
+
+        self.grants = 0
+        self.waited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.reclaims = 0
+
+    @property
+    def slots_per_adapter(self) -> int:
+        return min((slots for slots, _idle in self._limits.values()), default=self._default_limits[0])
+
+    @property
+    def idle_reclaim(self) -> float:
+        return min((idle for _slots, idle in self._limits.values()), default=self._default_limits[1])
+
+    def set_limits(self, entry_id: str, slots_per_adapter: int, idle_reclaim: float) -> None:
+        """Apply the slot budget and idle time from a config entry's options."""
+        self._limits[entry_id] = (max(1, int(slots_per_adapter)), float(idle_reclaim))
+        self._regrant()
+
+    def remove_limits(self, entry_id: str) -> None:
+        if self._limits.pop(entry_id, None) is not None:
+            self._regrant()
+
+    def _regrant(self) -> None:
+        # A larger budget may let waiting devices in right away.
+        for source in list(self._waiters):
+            self._grant_next(source)
+
+    @property
+    def leases_held(self) -> int:
+        return sum(len(v) for v in self._held.values())
+
+    def leases_on(self, source: str) -> int:
+        return len(self._held.get(source, ()))
+
+    def waiting_on(self, source: str) -> int:
+        return len(self._waiters.get(source, ()))
+
+    async def acquire(
+        self,
+        source: str,
+        address: str,
+        reclaim: Callable[[], Awaitable[None]] | None = None,
+    ) -> tuple[SlotLease, float]:
+        """Wait for a free slot on `source`; return the lease and the seconds waited."""
+        start = time.monotonic()
+        lease = SlotLease(source, address, reclaim)
+        held = self._held.setdefault(source, [])
+        waiters = self._waiters.setdefault(source, deque())
+        queued = len(held) >= self.slots_per_adapter or bool(waiters)
+        if not queued:
+            held.append(lease)
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            waiters.append((fut, lease))
+            self._reclaim_idle(source)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if lease in held:
+                    # Granted while being cancelled; pass the slot on.
+                    self.release(lease)
+                else:
+                    try:
+                        waiters.remove((fut, lease))
+                    except ValueError:
+                        pass
+                raise
+
+        lease.acquired_at = lease.last_activity = time.monotonic()
+        waited = lease.acquired_at - start
+        self.grants += 1
+        if queued:
+            self.waited += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            _LOGGER.debug("%s waited %.1fs for a connection slot on %s", address, waited, source)
+        return lease, waited
+
+    def release(self, lease: SlotLease | None) -> None:
+        if lease is None or lease.released:
+            return
+        lease.released = True
+        self._reclaiming.discard(lease)
+        held = self._held.get(lease.source, [])
+        try:
+            held.remove(lease)
+        except ValueError:
+            return
+        self._grant_next(lease.source)
+
+    def _grant_next(self, source: str) -> None:
+        held = self._held.setdefault(source, [])
+        waiters = self._waiters.get(source)
+        while waiters and len(held) < self.slots_per_adapter:
+            fut, lease = waiters.popleft()
+            if fut.done():
+                continue
+            held.append(lease)
+            fut.set_result(None)
+
+    def _reclaim_idle(self, source: str) -> None:
+        """Ask the longest-idle lease holder on `source` to disconnect.
+
+        When no holder has been idle long enough yet, check again when the first
+        one will have been, for as long as someone is waiting.
+        """
+        timer = self._rechecks.pop(source, None)
+        if timer is not None:
+            timer.cancel()
+        if not any(not fut.done() for fut, _lease in self._waiters.get(source, ())):
+            return
+        now = time.monotonic()
+        candidates = [
+            lease
+            for lease in self._held.get(source, ())
+            if lease._reclaim is not None and lease not in self._reclaiming
+        ]
+        idle = [lease for lease in candidates if now - lease.last_activity >= self.idle_reclaim]
+        if not idle:
+            if candidates:
+                due = min(lease.last_activity for lease in candidates) + self.idle_reclaim
+                self._recheck_later(source, due - now)
+            return
+        lease = min(idle, key=lambda l: l.last_activity)
+        self._reclaiming.add(lease)
+        self.reclaims += 1
+        _LOGGER.debug("Reclaiming idle connection slot of %s on %s", lease.address, source)
+        self.hass.async_create_task(self._run_reclaim(lease))
+
+    def _recheck_later(self, source: str, delay: float) -> None:
+        if source not in self._rechecks:
+            self._rechecks[source] = asyncio.get_running_loop().call_later(
+                max(RECLAIM_RECHECK_MIN, delay), self._reclaim_idle, source
+            )
+
+    async def _run_reclaim(self, lease: SlotLease) -> None:
+        try:
+            await lease._reclaim()
+        except Exception:
+            _LOGGER.debug("Reclaiming slot of %s failed", lease.address, exc_info=True)
+        finally:
+            # The holder may decline (e.g. it is busy); ask again later.
+            self._reclaiming.discard(lease)
+            if not lease.released:
+                self._recheck_later(lease.source, lease.last_activity + self.idle_reclaim - time.monotonic())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "slots_per_adapter": self.slots_per_adapter,
+            "leases_held": self.leases_held,
+            "leases_by_adapter": {s: len(v) for s, v in self._held.items() if v},
+            "waiting_by_adapter": {s: len(v) for s, v in self._waiters.items() if v},
+            "grants": self.grants,
+            "waited": self.waited,
+            "wait_avg_s": round(self.wait_total / self.waited, 3) if self.waited else 0.0,
+            "wait_max_s": round(self.wait_max, 3),
+            "reclaims": self.reclaims,
+        }
+
+def get_slot_scheduler(hass: HomeAssistant) -> FelshareSlotScheduler:
+    """Return the shared scheduler, creating it with defaults if async_setup did not."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler = domain_data.get(DATA_SLOT_SCHEDULER)
+    if scheduler is None:
+        scheduler = domain_data[DATA_SLOT_SCHEDULER] = FelshareSlotScheduler(hass)
+    return scheduler
@@ -1,20 +1,64 @@
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.const import PERCENTAGE
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import DOMAIN, KEY_LINK, KEY_POLL, KEY_METRICS, KEY_OIL_MODEL
 from .entity import FelshareEntity
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     coordinator = hass.data[DOMAIN][entry.entry_id]
     async_add_entities(
         [
-            FelshareAttrSensor(coordinator, "device_time", "Device time"),
+            FelshareDeviceTimeSensor(coordinator),
             FelshareAttrSensor(coordinator, "oil_level_pct", "Oil level", native_unit_of_measurement=PERCENTAGE),
+            FelshareOilPredictionSensor(coordinator),
+            FelshareOilTimeToEmptySensor(coordinator),
+            FelshareSlotWaitSensor(coordinator),
+            FelshareConnectTimeSensor(coordinator),
+            FelsharePollIntervalSensor(coordinator),
+            FelshareMetricSensor(
+                coordinator,
+                "write_latency",
+                "Write latency",
+                lambda c: c.metrics.write_latency.avg_ms,
+                lambda c: {
+                    "write": c.metrics.write_latency.as_dict(),
+                    "reply": c.metrics.reply_latency.as_dict(),
+                    "write_errors": c.metrics.write_errors,
+                    "suppressed_writes": c.metrics.suppressed_writes,
+                    "command_retries": c.metrics.command_retries,
+                    "rollbacks": c.metrics.rollbacks,
+                },
+                unit=UnitOfTime.MILLISECONDS,
+            ),
+            FelshareMetricSensor(
+                coordinator,
+                "frames_received",
+                "Frames received",
+                lambda c: c.metrics.frames_rx,
+                lambda c: {
+                    "by_opcode": {f"0x{op:02X}": n for op, n in sorted(c.metrics.frames_by_opcode.items())},
+                    "decode_misses": c.metrics.decode_misses,
+                    **c.connection.framing_stats(),
+                },
+                state_class=SensorStateClass.TOTAL_INCREASING,
+            ),
+            FelshareMetricSensor(
+                coordinator,
+                "connects",
+                "Connects",
+                lambda c: c.metrics.connects,
+                lambda c: {
+                    "connect_failures": c.metrics.connect_failures,
+                    "unexpected_disconnects": c.metrics.unexpected_disconnects,
+                    "lock_wait": c.metrics.lock_wait.as_dict(),
+                },
+                state_class=SensorStateClass.TOTAL_INCREASING,
+            ),
         ]
     )
 
@@ -25,4 +69,135 @@ class FelshareAttrSensor(FelshareEntity, SensorEntity):
 
     @property
     def native_value(self):
-        return (self.coordinator.data or {}).get(self._key)
+        return self.coordinator.get(self._key)
+
+class FelshareDeviceTimeSensor(FelshareEntity, SensorEntity):
+    """Device clock as reported in the status frame (local time, no timezone)."""
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "device_time", "Device time")
+
+    @property
+    def native_value(self):
+        dt = self.coordinator.get("device_time")
+        return dt.isoformat(sep=" ") if dt is not None else None
+
+class FelshareOilPredictionSensor(FelshareEntity, SensorEntity):
+    """Remaining oil predicted by the consumption model between status frames."""
+
+    _attr_native_unit_of_measurement = "mL"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+    _state_keys = (KEY_OIL_MODEL,)
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "oil_remaining_predicted", "Oil remaining (predicted)")
+
+    @property
+    def native_value(self):
+        predicted, _tte = self.coordinator.oil_prediction()
+        return round(predicted, 1) if predicted is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.oil_model_stats()
+
+class FelshareOilTimeToEmptySensor(FelshareEntity, SensorEntity):
+    """Predicted time until the oil runs out; unknown while the unit does not consume any."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 1
+    _state_keys = (KEY_OIL_MODEL,)
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "oil_time_to_empty", "Oil time to empty")
+
+    @property
+    def native_value(self):
+        _predicted, tte = self.coordinator.oil_prediction()
+        return round(tte / 3600.0, 2) if tte is not None else None
+
+class FelshareSlotWaitSensor(FelshareEntity, SensorEntity):
+    """How long the last connect waited for a connection slot on its adapter."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
+    _state_keys = (KEY_LINK,)
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "slot_wait", "Connection slot wait")
+
+    @property
+    def native_value(self):
+        return self.coordinator.connection.last_lease_wait
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.connection.slot_stats()
+
+class FelshareConnectTimeSensor(FelshareEntity, SensorEntity):
+    """Duration of the last connect, with statistics for connects with known and new GATT handles."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
+    _state_keys = (KEY_LINK,)
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "connect_time", "Connect time")
+
+    @property
+    def native_value(self):
+        return self.coordinator.connection.last_connect_time
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.connection.connect_stats()
+
+class FelsharePollIntervalSensor(FelshareEntity, SensorEntity):
+    """Effective status-poll interval chosen by the adaptive poll schedule."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _state_keys = (KEY_POLL,)
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "poll_interval", "Poll interval")
+
+    @property
+    def native_value(self):
+        return self.coordinator.poll_interval
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.poll_stats()
+
+class FelshareMetricSensor(FelshareEntity, SensorEntity):
+    """Link/protocol counter from FelshareMetrics, refreshed every METRICS_PUBLISH_INTERVAL."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _state_keys = (KEY_METRICS,)
+
+    def __init__(self, coordinator, key, name, value, attributes, unit=None, state_class=SensorStateClass.MEASUREMENT):
+        super().__init__(coordinator, key, name)
+        self._value = value
+        self._attributes = attributes
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    @property
+    def native_value(self):
+        return self._value(self.coordinator)
+
+    @property
+    def extra_state_attributes(self):
+        return self._attributes(self.coordinator)
@@ -0,0 +1,210 @@
+"""Domain services for Felshare BLE (fleet operations)."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_config_entry_ids
+
+from .const import (
+    DOMAIN,
+    DAY_BITS,
+    DATA_SLOT_SCHEDULER,
+    DEFAULT_SLOTS_PER_ADAPTER,
+    SERVICE_APPLY_PROFILE,
+    SERVICE_EXPORT_TRACE,
+    ATTR_START_TIME,
+    ATTR_END_TIME,
+    ATTR_RUN_SECONDS,
+    ATTR_STOP_SECONDS,
+    ATTR_DAYS,
+    ATTR_SCHEDULE_ENABLED,
+    ATTR_OIL_NAME,
+    ATTR_OIL_CAPACITY,
+    ATTR_OIL_REMAINING,
+    ATTR_OIL_CONSUMPTION,
+    ATTR_MAX_PER_ADAPTER,
+    ATTR_FORCE,
+    ATTR_CLEAR,
+)
+from .coordinator import FelshareCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+APPLY_PROFILE_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_START_TIME): cv.time,
+        vol.Optional(ATTR_END_TIME): cv.time,
+        vol.Optional(ATTR_RUN_SECONDS): vol.All(vol.Coerce(int), vol.Range(min=0, max=2000)),
+        vol.Optional(ATTR_STOP_SECONDS): vol.All(vol.Coerce(int), vol.Range(min=0, max=2000)),
+        vol.Optional(ATTR_DAYS): vol.All(cv.ensure_list, [vol.In(list(DAY_BITS))]),
+        vol.Optional(ATTR_SCHEDULE_ENABLED): cv.boolean,
+        vol.Optional(ATTR_OIL_NAME): cv.string,
+        vol.Optional(ATTR_OIL_CAPACITY): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        vol.Optional(ATTR_OIL_REMAINING): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+        vol.Optional(ATTR_OIL_CONSUMPTION): vol.All(vol.Coerce(float), vol.Range(min=0, max=6553.5)),
+        vol.Optional(ATTR_MAX_PER_ADAPTER): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    }
+)
+
+EXPORT_TRACE_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_CLEAR, default=False): cv.boolean,
+    }
+)
+
+async def _coordinators_for_call(hass: HomeAssistant, call: ServiceCall) -> list[FelshareCoordinator]:
+    entry_ids = await async_extract_config_entry_ids(hass, call)
+    domain_data = hass.data.get(DOMAIN, {})
+    coordinators = [
+        domain_data[entry_id]
+        for entry_id in entry_ids
+        if isinstance(domain_data.get(entry_id), FelshareCoordinator)
+    ]
+    if not coordinators:
+        raise ServiceValidationError("No Felshare diffusers match the selected targets")
+    return coordinators
+
+def _profile_from_call(data: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Split service data into async_update_workmode() changes and oil settings."""
+    schedule: dict[str, Any] = {}
+    if (start := data.get(ATTR_START_TIME)) is not None:
+        schedule.update(sh=start.hour, sm=start.minute)
+    if (end := data.get(ATTR_END_TIME)) is not None:
+        schedule.update(eh=end.hour, em=end.minute)
+    if ATTR_RUN_SECONDS in data:
+        schedule["run_s"] = data[ATTR_RUN_SECONDS]
+    if ATTR_STOP_SECONDS in data:
+        schedule["stop_s"] = data[ATTR_STOP_SECONDS]
+    if ATTR_DAYS in data:
+        schedule["daymask"] = sum(1 << DAY_BITS[day] for day in set(data[ATTR_DAYS]))
+    if ATTR_SCHEDULE_ENABLED in data:
+        schedule["enabled"] = data[ATTR_SCHEDULE_ENABLED]
+    oil = {
+        key: data[attr]
+        for key, attr in (
+            ("name", ATTR_OIL_NAME),
+            ("capacity", ATTR_OIL_CAPACITY),
+            ("remain", ATTR_OIL_REMAINING),
+            ("consumption", ATTR_OIL_CONSUMPTION),
+        )
+        if attr in data
+    }
+    return schedule, oil
+
+async def _apply_one(
+    coordinator: FelshareCoordinator,
+    adapter: str,
+    slots: asyncio.Semaphore,
+    schedule: dict[str, Any],
+    oil: dict[str, Any],
+    force: bool,
+) -> dict[str, Any]:
+    submitted = time.monotonic()
+    result: dict[str, Any] = {"device": coordinator.name, "adapter": adapter}
+    async with slots:
+        started = time.monotonic()
+        try:
+            journaled = await coordinator.async_apply_profile(schedule, oil, force)
+        except Exception as err:  # noqa: BLE001 - reported per device
+            result.update(success=False, queued=False, error=str(err) or type(err).__name__)
+        else:
+            # Journaled writes are sent when the diffuser is reachable again; not applied yet.
+            result.update(success=not journaled, queued=journaled, error=None)
+    result["waited_s"] = round(started - submitted, 3)
+    result["elapsed_s"] = round(time.monotonic() - started, 3)
+    return result
+
+async def _async_apply_profile(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    coordinators = await _coordinators_for_call(hass, call)
+    schedule, oil = _profile_from_call(call.data)
+    if not schedule and not oil:
+        raise ServiceValidationError("Nothing to apply: set at least one schedule or oil field")
+
+    scheduler = hass.data.get(DOMAIN, {}).get(DATA_SLOT_SCHEDULER)
+    per_adapter = call.data.get(
+        ATTR_MAX_PER_ADAPTER, scheduler.slots_per_adapter if scheduler is not None else DEFAULT_SLOTS_PER_ADAPTER
+    )
+    adapter_slots: dict[str, asyncio.Semaphore] = {}
+    jobs = []
+    for coordinator in coordinators:
+        adapter = coordinator.connection.adapter
+        slots = adapter_slots.setdefault(adapter, asyncio.Semaphore(per_adapter))
+        jobs.append(_apply_one(coordinator, adapter, slots, schedule, oil, call.data[ATTR_FORCE]))
+
+    started = time.monotonic()
+    results = await asyncio.gather(*jobs)
+    failed = [r["device"] for r in results if not r["success"] and not r["queued"]]
+    queued = [r["device"] for r in results if r["queued"]]
+    _LOGGER.debug(
+        "apply_profile: %d devices on %d adapters in %.1fs, %d failed, %d queued",
+        len(results), len(adapter_slots), time.monotonic() - started, len(failed), len(queued),
+    )
+    if not call.return_response:
+        if failed:
+            raise HomeAssistantError(f"Applying the profile failed on: {', '.join(failed)}")
+        return None
+    return {
+        "elapsed_s": round(time.monotonic() - started, 3),
+        "succeeded": len(results) - len(failed) - len(queued),
+        "queued": len(queued),
+        "failed": len(failed),
+        "results": list(results),
+    }
+
+def _write_trace(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+async def _async_export_trace(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    coordinators = await _coordinators_for_call(hass, call)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    results = []
+    for coordinator in coordinators:
+        trace = coordinator.connection.trace
+        data = trace.export()
+        frames = len(trace)
+        if call.data[ATTR_CLEAR]:
+            trace.clear()
+        name = f"{coordinator.address.replace(':', '').lower()}-{stamp}.fstr"
+        path = Path(hass.config.path(DOMAIN, "traces", name))
+        await hass.async_add_executor_job(_write_trace, path, data)
+        results.append({"device": coordinator.name, "path": str(path), "frames": frames, "bytes": len(data)})
+    return {"traces": results} if call.return_response else None
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    async def apply_profile(call: ServiceCall) -> ServiceResponse:
+        return await _async_apply_profile(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PROFILE,
+        apply_profile,
+        schema=APPLY_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def export_trace(call: ServiceCall) -> ServiceResponse:
+        return await _async_export_trace(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_TRACE,
+        export_trace,
+        schema=EXPORT_TRACE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,315 @@
+"""In-process Felshare diffuser simulator.
+
+SimulatedDiffuser keeps the state of a virtual unit and answers frames written to
+the NUS TX characteristic the way the device does: setters are applied and echoed,
+0x05 returns a status frame and 0x0C a bulk frame with the schedule records.
+SimulatedClient stands in for the Bleak client FelshareBleConnection talks to, so
+the connection, the coordinator and the entities can run without hardware:
+
+    sim = SimulatedDiffuser("AA:BB:CC:DD:EE:01", latency=0.05, drop_rate=0.02)
+    conn = FelshareBleConnection(hass, sim.address, "sim", on_state, client_factory=sim.connect)
+
+Faults are plain attributes and can be changed at any time: reply latency and
+jitter, MTU (notifications are split into MTU-3 byte fragments), dropped
+notifications, failing or slow connects and link drops after a number of writes
+or on demand (drop_link()). Each diffuser is independent, so a load run simply
+creates as many as it needs (make_fleet()).
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import struct
+import time
+from typing import Any, Callable, NamedTuple
+
+from bleak import BleakError
+
+from .const import NUS_SERVICE_UUID, NUS_TX_CHAR_UUID, NUS_RX_CHAR_UUID
+from .protocol import WORKMODE_LEN, bytes_workmode, clamp_int
+
+# Same layout protocol._STATUS decodes, plus the two bytes before the oil name.
+_STATUS = struct.Struct(">HBBBBBxBBHH5xH2x")
+
+class _Descriptor(NamedTuple):
+    handle: int
+
+class _Characteristic(NamedTuple):
+    uuid: str
+    handle: int
+    properties: tuple[str, ...]
+    descriptors: tuple[_Descriptor, ...]
+
+class _Service(NamedTuple):
+    uuid: str
+    handle: int
+
+class SimulatedServices:
+    """The part of BleakGATTServiceCollection the integration uses."""
+
+    def __init__(self, base_handle: int) -> None:
+        self._service = _Service(NUS_SERVICE_UUID, base_handle)
+        self._chars = {
+            NUS_TX_CHAR_UUID: _Characteristic(
+                NUS_TX_CHAR_UUID, base_handle + 1, ("write", "write-without-response"), ()
+            ),
+            NUS_RX_CHAR_UUID: _Characteristic(
+                NUS_RX_CHAR_UUID, base_handle + 3, ("notify",), (_Descriptor(base_handle + 5),)
+            ),
+        }
+
+    def get_service(self, uuid: str) -> _Service | None:
+        return self._service if uuid == self._service.uuid else None
+
+    def get_characteristic(self, uuid: str) -> _Characteristic | None:
+        return self._chars.get(uuid)
+
+class SimulatedDiffuser:
+    def __init__(
+        self,
+        address: str,
+        *,
+        name: str = "Felshare Sim",
+        power: bool = True,
+        fan: bool = False,
+        oil_name: str = "Lavender",
+        oil_capacity_ml: int = 200,
+        oil_remain_ml: int = 150,
+        oil_consumption_raw: int = 15,
+        schedules: list[tuple[int, ...]] | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        mtu: int = 23,
+        drop_rate: float = 0.0,
+        connect_latency: float = 0.0,
+        fail_connects: int = 0,
+        disconnect_after_writes: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.address = address
+        self.name = name
+
+        # Device state, in the device's own units.
+        self.power = power
+        self.fan = fan
+        self.oil_name = oil_name
+        self.oil_capacity_ml = oil_capacity_ml
+        self.oil_remain_ml = oil_remain_ml
+        self.oil_consumption_raw = oil_consumption_raw
+        # (sh, sm, eh, em, flag, run_s, stop_s) per slot; 0x32 writes replace the first.
+        self.schedules = list(schedules or [(8, 0, 22, 0, 0x80 | 0x7F, 30, 120)])
+        self.clock_offset = 0.0  # seconds added to the host clock in status frames
+
+        # Faults.
+        self.latency = latency  # seconds from write to reply notification
+        self.jitter = jitter  # +/- seconds added to each reply
+        self.mtu = mtu  # notifications carry at most mtu - 3 bytes
+        self.drop_rate = drop_rate  # probability a reply frame is never sent
+        self.connect_latency = connect_latency
+        self.fail_connects = fail_connects  # the next N connects time out
+        self.disconnect_after_writes = disconnect_after_writes  # drop the link after N more writes
+        self.handle_base = 0x000E  # change with firmware_update() to invalidate cached handles
+
+        self._random = random.Random(seed)
+        self.client: SimulatedClient | None = None
+        self.connects = 0
+        self.writes: list[bytes] = []
+        self.notifications = 0
+        self.dropped = 0
+
+    # ----- protocol -----
+    def handle_write(self, payload: bytes) -> list[bytes]:
+        """Apply a frame written by the host; return the frames the device answers with."""
+        if not payload:
+            return []
+        cmd = payload[0]
+        if cmd == 0x03 and len(payload) >= 2:
+            self.power = bool(payload[1])
+            return [bytes([0x03, int(self.power)])]
+        if cmd == 0x04 and len(payload) >= 2:
+            self.fan = bool(payload[1])
+            return [bytes([0x04, int(self.fan)])]
+        if cmd == 0x05:
+            return [self.status_frame()]
+        if cmd == 0x08:
+            raw = bytes(payload[1:])
+            nul = raw.find(0)
+            self.oil_name = (raw[:nul] if nul >= 0 else raw).decode("ascii", errors="ignore")
+            return [self.oil_name_frame()]
+        if cmd == 0x0C:
+            return [self.bulk_frame()]
+        if cmd in (0x0E, 0x0F, 0x10) and len(payload) >= 3:
+            value = int.from_bytes(payload[1:3], "big")
+            if cmd == 0x0E:
+                self.oil_consumption_raw = value
+            elif cmd == 0x0F:
+                self.oil_capacity_ml = value
+            else:
+                self.oil_remain_ml = value
+            return [bytes([cmd]) + value.to_bytes(2, "big")]
+        if cmd == 0x32 and len(payload) == WORKMODE_LEN and payload[1] == 0x01:
+            record = struct.unpack(">BBBBBHH", payload[2:])
+            self.schedules[0] = record
+            return [self.workmode_frame(record)]
+        return []
+
+    def status_frame(self) -> bytes:
+        clock = time.localtime(time.time() + self.clock_offset)
+        body = _STATUS.pack(
+            clock.tm_year,
+            clock.tm_mon,
+            clock.tm_mday,
+            clock.tm_hour,
+            clock.tm_min,
+            clock.tm_sec,
+            int(self.power),
+            int(self.fan),
+            clamp_int(self.oil_consumption_raw, 0, 65535),
+            clamp_int(self.oil_capacity_ml, 0, 65535),
+            clamp_int(self.oil_remain_ml, 0, 65535),
+        )
+        return b"\x05" + body + self.oil_name.encode("ascii", errors="ignore") + b"\x00"
+
+    def bulk_frame(self) -> bytes:
+        frame = b"\x0c" + b"".join(self.workmode_frame(record) for record in self.schedules)
+        return frame.ljust(20, b"\x00")
+
+    def oil_name_frame(self) -> bytes:
+        return b"\x08" + self.oil_name.encode("ascii", errors="ignore") + b"\x00"
+
+    @staticmethod
+    def workmode_frame(record: tuple[int, ...]) -> bytes:
+        sh, sm, eh, em, flag, run_s, stop_s = record
+        return bytes_workmode(sh, sm, eh, em, bool(flag & 0x80), flag & 0x7F, run_s, stop_s)
+
+    # ----- behaviour -----
+    def consume(self, ml: int, push: bool = True) -> None:
+        """Use up oil; with `push`, send the status frame the device pushes on its own."""
+        self.oil_remain_ml = max(0, self.oil_remain_ml - ml)
+        if push:
+            self.push(self.status_frame())
+
+    def push(self, frame: bytes) -> None:
+        """Send an unsolicited notification to the connected client, if any."""
+        if self.client is not None and self.client.is_connected:
+            self.client._send([frame])
+
+    def drop_link(self) -> None:
+        """Drop the connection from the device side (out of range, power loss)."""
+        if self.client is not None:
+            self.client._drop()
+
+    def firmware_update(self) -> None:
+        """Move the GATT handles, as a firmware update would."""
+        self.handle_base += 0x10
+        self.drop_link()
+
+    async def connect(
+        self,
+        _device: Any,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        use_services_cache: bool = True,
+    ) -> SimulatedClient:
+        """Client factory for FelshareBleConnection(client_factory=...)."""
+        if self.connect_latency:
+            await asyncio.sleep(self._delay(self.connect_latency))
+        if self.fail_connects > 0:
+            self.fail_connects -= 1
+            raise TimeoutError(f"{self.address}: simulated connect timeout")
+        if self.client is not None:
+            self.client._drop()
+        self.connects += 1
+        self.client = SimulatedClient(self, disconnected_callback)
+        return self.client
+
+    def _delay(self, base: float) -> float:
+        if self.jitter:
+            base += self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, base)
+
+class SimulatedClient:
+    """Stand-in for BleakClientWithServiceCache, bound to one SimulatedDiffuser."""
+
+    def __init__(self, device: SimulatedDiffuser, disconnected_callback: Callable[[Any], None] | None) -> None:
+        self._device = device
+        self._disconnected_callback = disconnected_callback
+        self._notify: Callable[[int, bytearray], None] | None = None
+        self.address = device.address
+        self.services = SimulatedServices(device.handle_base)
+        self.mtu_size = device.mtu
+        self.is_connected = True
+
+    async def start_notify(self, uuid: str, callback: Callable[[int, bytearray], None]) -> None:
+        self._check(uuid, NUS_RX_CHAR_UUID)
+        self._notify = callback
+
+    async def stop_notify(self, uuid: str) -> None:
+        self._notify = None
+
+    async def write_gatt_char(self, uuid: str, data: bytes, response: bool = False) -> None:
+        self._check(uuid, NUS_TX_CHAR_UUID)
+        device = self._device
+        device.writes.append(bytes(data))
+        replies = device.handle_write(bytes(data))
+        if device.disconnect_after_writes is not None:
+            device.disconnect_after_writes -= 1
+            if device.disconnect_after_writes <= 0:
+                device.disconnect_after_writes = None
+                self._drop()
+                return
+        self._send(replies)
+
+    async def disconnect(self) -> bool:
+        self._drop()
+        return True
+
+    async def clear_cache(self) -> bool:
+        return True
+
+    def _check(self, uuid: str, expected: str) -> None:
+        if not self.is_connected:
+            raise BleakError(f"{self.address}: not connected")
+        if uuid != expected:
+            raise BleakError(f"{self.address}: characteristic {uuid} not found")
+
+    def _send(self, frames: list[bytes]) -> None:
+        device = self._device
+        loop = asyncio.get_running_loop()
+        size = max(1, device.mtu - 3)
+        for frame in frames:
+            if device.drop_rate and device._random.random() < device.drop_rate:
+                device.dropped += 1
+                continue
+            fragments = [frame[i : i + size] for i in range(0, len(frame), size)]
+            loop.call_later(device._delay(device.latency), self._deliver, fragments)
+
+    def _deliver(self, fragments: list[bytes]) -> None:
+        for fragment in fragments:
+            if self._notify is None or not self.is_connected:
+                return
+            self._device.notifications += 1
+            self._notify(self._device.handle_base + 3, bytearray(fragment))
+
+    def _drop(self) -> None:
+        if not self.is_connected:
+            return
+        self.is_connected = False
+        self._notify = None
+        if self._device.client is self:
+            self._device.client = None
+        # Like Bleak, report every disconnect; the connection ignores the ones it asked for.
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
+
+def make_fleet(count: int, prefix: str = "F5:E1:00:00", **kwargs: Any) -> list[SimulatedDiffuser]:
+    """`count` diffusers with consecutive addresses; kwargs go to every SimulatedDiffuser."""
+    seed = kwargs.pop("seed", None)
+    return [
+        SimulatedDiffuser(
+            f"{prefix}:{i >> 8:02X}:{i & 0xFF:02X}",
+            name=f"Felshare Sim {i + 1}",
+            seed=None if seed is None else seed + i,
+            **kwargs,
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,136 @@
+"""Typed device state for the Felshare diffuser.
+
+One FelshareState per device holds the last reported values as native types and is
+updated in place from decoded frames. Derived values (oil level %, device clock as
+a datetime) are computed once when their inputs change instead of on every read.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+# Fields a decoded frame may carry (see protocol.decode_frame).
+FIELDS = (
+    "power_on",
+    "fan_on",
+    "device_clock",  # (year, month, day, hour, minute, second) from the status frame
+    "oil_consumption_raw",  # tenths of mL/h
+    "oil_capacity_ml",
+    "oil_remain_ml",
+    "oil_name",
+    "work_start_h",
+    "work_start_m",
+    "work_end_h",
+    "work_end_m",
+    "work_enabled",
+    "work_days_mask",
+    "work_run_s",
+    "work_stop_s",
+    "work_slots",  # every WorkMode record of the last bulk frame: (sh, sm, eh, em, flag, run_s, stop_s)
+    "bulk_unknown",  # (offset, hex) spans of the last bulk frame no known record explains
+)
+# Fields computed from other fields.
+DERIVED = ("oil_level_pct", "device_time")
+DERIVED_FROM = {
+    "oil_level_pct": ("oil_capacity_ml", "oil_remain_ml"),
+    "device_time": ("device_clock",),
+}
+
+SCHEDULE_FIELDS = (
+    "work_start_h",
+    "work_start_m",
+    "work_end_h",
+    "work_end_m",
+    "work_enabled",
+    "work_days_mask",
+    "work_run_s",
+    "work_stop_s",
+)
+# Schedule assumed for fields the device has not reported yet.
+SCHEDULE_DEFAULTS = {
+    "work_start_h": 9,
+    "work_start_m": 0,
+    "work_end_h": 21,
+    "work_end_m": 0,
+    "work_enabled": True,
+    "work_days_mask": 0x7F,
+    "work_run_s": 30,
+    "work_stop_s": 280,
+}
+
+class FelshareState:
+    __slots__ = FIELDS + DERIVED
+
+    def __init__(self) -> None:
+        for name in FIELDS + DERIVED:
+            setattr(self, name, None)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def update(self, partial: dict[str, Any]) -> list[str]:
+        """Apply a decoded frame in place; return the names of fields that changed."""
+        changed: list[str] = []
+        for key, value in partial.items():
+            if getattr(self, key) != value:
+                setattr(self, key, value)
+                changed.append(key)
+        if not changed:
+            return changed
+
+        if "oil_capacity_ml" in changed or "oil_remain_ml" in changed:
+            cap, rem = self.oil_capacity_ml, self.oil_remain_ml
+            pct = int((rem * 100) / cap) if cap and rem is not None else None
+            if pct != self.oil_level_pct:
+                self.oil_level_pct = pct
+                changed.append("oil_level_pct")
+        if "device_clock" in changed:
+            self.device_time = _clock_to_datetime(self.device_clock)
+            changed.append("device_time")
+        return changed
+
+    def workmode_fields(self) -> dict[str, Any]:
+        """Current schedule as bytes_workmode() keyword arguments, with defaults for unknown fields."""
+        f = {name: self.get(name, SCHEDULE_DEFAULTS[name]) for name in SCHEDULE_FIELDS}
+        return {
+            "sh": int(f["work_start_h"]),
+            "sm": int(f["work_start_m"]),
+            "eh": int(f["work_end_h"]),
+            "em": int(f["work_end_m"]),
+            "enabled": bool(f["work_enabled"]),
+            "daymask": int(f["work_days_mask"]),
+            "run_s": int(f["work_run_s"]),
+            "stop_s": int(f["work_stop_s"]),
+        }
+
+    def copy(self) -> "FelshareState":
+        other = FelshareState()
+        for name in FIELDS + DERIVED:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def as_dict(self) -> dict[str, Any]:
+        """Known fields as a plain dict (diagnostics / persistence)."""
+        return {name: getattr(self, name) for name in FIELDS + DERIVED if getattr(self, name) is not None}
+
+def _clock_to_datetime(clock: tuple[int, ...] | None) -> datetime | None:
+    if not clock:
+        return None
+    try:
+        return datetime(*clock)
+    except (TypeError, ValueError):
+        return None  # device clock not set (e.g. all zeros)
+
+def workmode_to_state(fields: dict[str, Any]) -> dict[str, Any]:
+    """Express bytes_workmode() keyword arguments as state fields."""
+    return {
+        "work_start_h": int(fields["sh"]),
+        "work_start_m": int(fields["sm"]),
+        "work_end_h": int(fields["eh"]),
+        "work_end_m": int(fields["em"]),
+        "work_enabled": bool(fields["enabled"]),
+        "work_days_mask": int(fields["daymask"]),
+        "work_run_s": int(fields["run_s"]),
+        "work_stop_s": int(fields["stop_s"]),
+    }
@@ -6,13 +6,13 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
-from .entity import FelshareEntity
+from .entity import FelshareCommandEntity
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     coordinator = hass.data[DOMAIN][entry.entry_id]
     async_add_entities([FelshareOilNameText(coordinator)])
 
-class FelshareOilNameText(FelshareEntity, TextEntity):
+class FelshareOilNameText(FelshareCommandEntity, TextEntity):
     _attr_native_min = 0
     _attr_native_max = 64
     _attr_pattern = r"^[\x20-\x7E]*$"  # printable ASCII only
@@ -22,7 +22,7 @@ class FelshareOilNameText(FelshareEntity, TextEntity):
 
     @property
     def native_value(self):
-        return (self.coordinator.data or {}).get("oil_name") or ""
+        return self.coordinator.get("oil_name") or ""
 
     async def async_set_value(self, value: str) -> None:
         await self.coordinator.async_set_oil_name(value)
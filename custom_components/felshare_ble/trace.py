@@ -0,0 +1,215 @@
+"""Ring buffer of raw BLE frames, binary trace export and replay.
+
+Every frame written to the device and every notification received (before
+reassembly) is kept with its monotonic timestamp in a bounded deque, so the
+most recent traffic is still there when a unit misbehaves. Recording costs a
+copy of the frame and one deque append. A trace exports to a compact binary
+format:
+
+    header  b"FSTR", version (u8), start wall-clock time (f64), record count (u32)
+    record  delta to the previous record in µs (u32), direction (u8: 0 TX, 1 RX),
+            length (u16), frame bytes
+
+All integers are little-endian. The device address is not part of the trace.
+reassemble() and replay_decode() turn the RX notifications of a trace back into
+frames and decoded state (benchmarks, offline analysis); async_replay() feeds
+them to a notification sink at the original pace, scaled, or as fast as
+possible, and async_replay_state() does so into a TraceState: reassembly, the
+per-device decoder and the state merge as on a live connection, but into their
+own state, leaving every device alone.
+"""
+from __future__ import annotations
+
+import asyncio
+import struct
+import time
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from .framing import FrameAssembler, DEFAULT_MAX_PAYLOAD
+from .protocol import FrameDecoder, decode_frame
+from .state import FelshareState
+
+TX = 0
+RX = 1
+
+MAGIC = b"FSTR"
+VERSION = 1
+_HEADER = struct.Struct("<4sBdI")
+_RECORD = struct.Struct("<IBH")
+_MAX_DELTA_US = 0xFFFFFFFF
+
+class TraceRecord(NamedTuple):
+    time: float  # seconds since the first record
+    direction: int  # TX or RX
+    frame: bytes
+
+class Trace(NamedTuple):
+    started_at: float  # wall-clock time of the first record
+    records: list[TraceRecord]
+
+class FrameTrace:
+    """Bounded buffer of the most recent TX/RX frames of one device."""
+
+    def __init__(self, capacity: int) -> None:
+        self._frames: deque[tuple[float, int, bytes]] = deque(maxlen=capacity)
+        self.capacity = capacity
+        self.recorded = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def record(self, direction: int, frame: bytes | bytearray) -> None:
+        self._frames.append((time.monotonic(), direction, bytes(frame)))
+        self.recorded += 1
+
+    def clear(self) -> None:
+        self._frames.clear()
+
+    def export(self) -> bytes:
+        """The buffered frames in the binary trace format."""
+        frames = list(self._frames)
+        started_at = time.time() - (time.monotonic() - frames[0][0]) if frames else time.time()
+        return encode_trace(started_at, frames)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"frames": len(self._frames), "capacity": self.capacity, "recorded": self.recorded}
+
+def encode_trace(started_at: float, frames: Iterable[tuple[float, int, bytes]]) -> bytes:
+    """Binary trace of (monotonic time, direction, frame) tuples."""
+    parts = []
+    previous: float | None = None
+    count = 0
+    for at, direction, frame in frames:
+        delta = 0 if previous is None else min(_MAX_DELTA_US, max(0, round((at - previous) * 1e6)))
+        previous = at
+        frame = frame[:0xFFFF]
+        parts.append(_RECORD.pack(delta, direction, len(frame)))
+        parts.append(frame)
+        count += 1
+    return _HEADER.pack(MAGIC, VERSION, started_at, count) + b"".join(parts)
+
+def parse_trace(data: bytes) -> Trace:
+    """Decode a binary trace; raises ValueError if it is not one or is truncated."""
+    if len(data) < _HEADER.size:
+        raise ValueError("not a Felshare trace (too short)")
+    magic, version, started_at, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a Felshare trace (bad magic)")
+    if version != VERSION:
+        raise ValueError(f"unsupported trace version {version}")
+    records: list[TraceRecord] = []
+    offset = _HEADER.size
+    elapsed = 0.0
+    for _ in range(count):
+        if offset + _RECORD.size > len(data):
+            raise ValueError("truncated trace")
+        delta, direction, length = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        if offset + length > len(data):
+            raise ValueError("truncated trace")
+        elapsed += delta / 1e6
+        records.append(TraceRecord(elapsed, direction, bytes(data[offset : offset + length])))
+        offset += length
+    return Trace(started_at, records)
+
+def notification_size(records: Iterable[TraceRecord]) -> int:
+    """The link's notification size (a full fragment) as seen in a trace: its longest RX notification."""
+    longest = max((len(record.frame) for record in records if record.direction == RX), default=0)
+    return max(DEFAULT_MAX_PAYLOAD, longest)
+
+def reassemble(records: Iterable[TraceRecord], max_payload: int | None = None) -> Iterator[bytes]:
+    """Whole frames from the RX notifications of a trace, using its timestamps.
+
+    Without `max_payload` the longest notification in the trace is taken as the
+    link's notification size (a full fragment), but never less than the default.
+    """
+    rx = [record for record in records if record.direction == RX]
+    if max_payload is None:
+        max_payload = notification_size(rx)
+    assembler = FrameAssembler(max(DEFAULT_MAX_PAYLOAD, max_payload))
+    for record in rx:
+        for frame in assembler.flush_stale(record.time):
+            yield bytes(frame)
+        for frame in assembler.feed(record.frame, record.time):
+            yield bytes(frame)
+    for frame in assembler.flush_stale(float("inf")):
+        yield bytes(frame)
+
+def replay_decode(records: Iterable[TraceRecord], max_payload: int | None = None) -> Iterator[dict[str, Any]]:
+    """decode_frame() of every frame reassemble() finds in a trace."""
+    for frame in reassemble(records, max_payload):
+        yield decode_frame(frame)
+
+class TraceState:
+    """Notification sink that reassembles, decodes and merges frames into its own state.
+
+    The same steps a connection takes for live notifications, but into a separate
+    FrameDecoder and FelshareState, so replaying a trace leaves the device alone.
+    `max_payload` is the link's notification size (see notification_size()).
+    """
+
+    def __init__(self, max_payload: int = DEFAULT_MAX_PAYLOAD) -> None:
+        self._assembler = FrameAssembler(max_payload)
+        self.decoder = FrameDecoder()
+        self.state = FelshareState()
+        self.frames = 0
+
+    def feed(self, data: bytearray) -> None:
+        now = asyncio.get_running_loop().time()
+        for frame in self._assembler.flush_stale(now):
+            self._merge(frame)
+        for frame in self._assembler.feed(data, now):
+            self._merge(frame)
+
+    def finish(self) -> None:
+        """Decode what is left of a frame cut short at the end of the trace."""
+        for frame in self._assembler.flush_stale(float("inf")):
+            self._merge(frame)
+
+    def _merge(self, frame: bytes | bytearray) -> None:
+        self.frames += 1
+        partial = self.decoder.decode(frame)
+        if partial:
+            self.state.update(partial)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"frames": self.frames, "duplicates": self.decoder.duplicates, "state": self.state.as_dict()}
+
+async def async_replay(
+    records: Iterable[TraceRecord],
+    feed: Callable[[bytearray], None],
+    speed: float | None = 1.0,
+) -> int:
+    """Hand the RX frames of a trace to `feed` as notifications; return how many were fed.
+
+    `speed` scales the recorded pace (2.0 = twice as fast); None or 0 replays as
+    fast as possible, yielding to the event loop between frames.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    fed = 0
+    for record in records:
+        if record.direction != RX:
+            continue
+        if speed:
+            delay = started + record.time / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+        feed(bytearray(record.frame))
+        fed += 1
+    return fed
+
+async def async_replay_state(records: Iterable[TraceRecord], speed: float | None = 1.0) -> dict[str, Any]:
+    """Replay the RX notifications of a trace into a fresh TraceState; return what they decode to.
+
+    The notification size is taken from the trace, as reassemble() does.
+    Returns the number of notifications and frames and the resulting state.
+    """
+    records = list(records)
+    replay = TraceState(notification_size(records))
+    fed = await async_replay(records, replay.feed, speed)
+    replay.finish()
+    return {"notifications": fed, **replay.as_dict()}
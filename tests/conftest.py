@@ -0,0 +1,94 @@
+"""Import the pure felshare_ble modules without Home Assistant (see benchmarks/_load.py)."""
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "felshare_ble"
+
+def load(name: str):
+    if "felshare_ble" not in sys.modules:
+        pkg = types.ModuleType("felshare_ble")
+        pkg.__path__ = [str(PACKAGE_DIR)]
+        sys.modules["felshare_ble"] = pkg
+    return importlib.import_module(f"felshare_ble.{name}")
+
+@pytest.fixture
+def const():
+    return load("const")
+
+@pytest.fixture
+def protocol():
+    return load("protocol")
+
+@pytest.fixture
+def framing():
+    return load("framing")
+
+@pytest.fixture
+def polling():
+    return load("polling")
+
+@pytest.fixture
+def trace():
+    return load("trace")
+
+@pytest.fixture
+def coalescer():
+    return load("coalescer")
+
+@pytest.fixture
+def ble():
+    return load("ble")
+
+@pytest.fixture
+def simulator():
+    return load("simulator")
+
+@pytest.fixture
+def breaker():
+    return load("breaker")
+
+@pytest.fixture
+def scheduler():
+    return load("scheduler")
+
+@pytest.fixture
+def coordinator():
+    return load("coordinator")
+
+class MemoryStore:
+    """In-memory stand-in for homeassistant.helpers.storage.Store."""
+
+    def __init__(self, hass, version, key) -> None:
+        self.data = None
+
+    async def async_load(self):
+        return self.data
+
+    async def async_save(self, data) -> None:
+        self.data = data
+
+    def async_delay_save(self, data_func, delay) -> None:
+        self.data = data_func()
+
+    async def async_remove(self) -> None:
+        self.data = None
+
+@pytest.fixture
+def memory_storage(monkeypatch):
+    """Keep the journal and the state cache in memory (needs Home Assistant)."""
+    for name in ("journal", "cache"):
+        monkeypatch.setattr(load(name), "Store", MemoryStore)
+
+@pytest.fixture
+def oil_model():
+    return load("oil_model")
+
+@pytest.fixture
+def state():
+    return load("state")
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("bleak_retry_connector")
+pytest.importorskip("homeassistant.components.bluetooth")
+
+class _Hass:
+    """The part of HomeAssistant a connection with a client factory uses."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.data: dict = {}
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+    def async_create_background_task(self, coro, name):
+        return self.loop.create_task(coro, name=name)
+
+def _connection(ble, device):
+    return ble.FelshareBleConnection(_Hass(), device.address, "sim", lambda state: None, client_factory=device.connect)
+
+def test_writer_sends_by_priority(ble, const, simulator):
+    device = simulator.SimulatedDiffuser("AA:BB:CC:DD:EE:01")
+
+    async def run():
+        conn = _connection(ble, device)
+        # Queued in one go, before the writer task gets to run.
+        writes = [
+            asyncio.ensure_future(conn.write(b"\x05", priority=ble.PRIORITY_POLL)),
+            asyncio.ensure_future(conn.write(b"\x03\x00", priority=const.PRIORITY_SCHEDULE)),
+            asyncio.ensure_future(conn.write(b"\x04\x01", priority=ble.PRIORITY_USER)),
+            asyncio.ensure_future(conn.write(b"\x03\x01", priority=ble.PRIORITY_USER)),
+        ]
+        await asyncio.gather(*writes)
+        await conn.close()
+
+    asyncio.run(run())
+    assert device.writes == [b"\x04\x01", b"\x03\x01", b"\x03\x00", b"\x05"]
+
+def test_superseded_poll_is_answered_by_the_newer_one(ble, simulator):
+    device = simulator.SimulatedDiffuser("AA:BB:CC:DD:EE:01")
+
+    async def run():
+        conn = _connection(ble, device)
+        polls = [asyncio.ensure_future(conn.request(b"\x05", priority=ble.PRIORITY_POLL)) for _ in range(3)]
+        replies = await asyncio.gather(*polls)
+        await conn.close()
+        return replies
+
+    replies = asyncio.run(run())
+    assert device.writes == [b"\x05"]
+    assert len(set(replies)) == 1
+    assert replies[0][0] == 0x05
+
+def test_superseded_poll_shares_the_failure(ble, simulator):
+    device = simulator.SimulatedDiffuser("AA:BB:CC:DD:EE:01", fail_connects=1)
+
+    async def run():
+        conn = _connection(ble, device)
+        polls = [asyncio.ensure_future(conn.write(b"\x05", priority=ble.PRIORITY_POLL)) for _ in range(2)]
+        results = await asyncio.gather(*polls, return_exceptions=True)
+        await conn.close()
+        return results
+
+    results = asyncio.run(run())
+    assert device.writes == []
+    assert all(isinstance(result, TimeoutError) for result in results)
+
+def test_full_queue_drops_the_lowest_priority_command(ble, simulator):
+    device = simulator.SimulatedDiffuser("AA:BB:CC:DD:EE:01")
+
+    async def run():
+        conn = _connection(ble, device)
+        polls = [
+            asyncio.ensure_future(conn.write(bytes([0x0C, i]), priority=ble.PRIORITY_POLL))
+            for i in range(ble.COMMAND_QUEUE_MAX)
+        ]
+        user = asyncio.ensure_future(conn.write(b"\x03\x01", priority=ble.PRIORITY_USER))
+        await asyncio.sleep(0)
+        with pytest.raises(ble.CommandQueueFullError):
+            await conn.write(b"\x05", priority=ble.PRIORITY_POLL)
+        results = await asyncio.gather(*polls, user, return_exceptions=True)
+        await conn.close()
+        return results
+
+    results = asyncio.run(run())
+    *polls, user = results
+    assert user is None
+    assert isinstance(polls[-1], ble.CommandQueueFullError)
+    assert all(result is None for result in polls[:-1])
+    assert device.writes[0] == b"\x03\x01"
+    assert bytes([0x0C, ble.COMMAND_QUEUE_MAX - 1]) not in device.writes
+
+def test_connect_cut_by_the_deadline_counts_as_failure(ble, simulator):
+    device = simulator.SimulatedDiffuser("AA:BB:CC:DD:EE:01", connect_latency=0.2)
+
+    async def run():
+        conn = _connection(ble, device)
+        loop = asyncio.get_running_loop()
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                await conn.connect(loop.time() + 0.02)
+        stats = conn.breaker_stats()
+        # The breaker is open: the next command fails fast instead of connecting.
+        with pytest.raises(ble.CircuitOpenError):
+            await conn.ensure_connected(loop.time() + 0.02)
+        await conn.close()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["state"] == "open"
+    assert stats["failures"] == 2
+    assert device.connects == 0
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+
+@pytest.fixture
+def circuit(breaker):
+    return breaker.ConnectBreaker(threshold=2, base=30.0, maximum=100.0, jitter=0.0)
+
+def test_opens_after_threshold(breaker, circuit):
+    circuit.record_failure(10.0)
+    assert circuit.state == breaker.STATE_CLOSED
+    assert circuit.allow(11.0, None)
+    circuit.record_failure(11.0)
+    assert circuit.state == breaker.STATE_OPEN
+    assert circuit.retry_in(11.0) == 30.0
+    assert not circuit.allow(12.0, 12.0)
+    assert circuit.fast_fails == 1
+
+def test_probe_needs_backoff_and_a_fresh_advertisement(breaker, circuit):
+    circuit.record_failure(0.0)
+    circuit.record_failure(0.0)
+    assert not circuit.would_allow(40.0, None)
+    assert not circuit.would_allow(40.0, 0.0)  # not heard since the failure
+    assert not circuit.would_allow(20.0, 15.0)  # still backing off
+    assert circuit.would_allow(40.0, 35.0)
+    assert circuit.state == breaker.STATE_OPEN
+    assert circuit.allow(40.0, 35.0)
+    assert circuit.state == breaker.STATE_HALF_OPEN
+    # Only one probe at a time.
+    assert not circuit.allow(40.0, 35.0)
+
+def test_failed_probe_reopens_with_longer_backoff(breaker, circuit):
+    circuit.record_failure(0.0)
+    circuit.record_failure(0.0)
+    assert circuit.allow(30.0, 25.0)
+    circuit.record_failure(31.0)
+    assert circuit.state == breaker.STATE_OPEN
+    assert circuit.retry_in(31.0) == 60.0
+    circuit.allow(91.0, 90.0)
+    circuit.record_failure(91.0)
+    assert circuit.retry_in(91.0) == 100.0  # capped
+
+def test_successful_probe_closes(breaker, circuit):
+    circuit.record_failure(0.0)
+    circuit.record_failure(0.0)
+    assert circuit.allow(30.0, 25.0)
+    circuit.record_success()
+    assert circuit.state == breaker.STATE_CLOSED
+    assert circuit.failures == 0
+    circuit.record_failure(40.0)
+    assert circuit.state == breaker.STATE_CLOSED  # the threshold counts from zero again
+
+def test_cancelled_probe_allows_another(breaker, circuit):
+    circuit.record_failure(0.0)
+    circuit.record_failure(0.0)
+    assert circuit.allow(30.0, 25.0)
+    circuit.cancel_probe()
+    assert circuit.state == breaker.STATE_OPEN
+    assert circuit.allow(31.0, 25.0)
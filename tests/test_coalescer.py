@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+def _merge(pending, change):
+    return {**(pending or {}), **change}
+
+def test_burst_becomes_one_flush(coalescer):
+    flushed = []
+
+    async def flush(pending):
+        flushed.append(dict(pending))
+        return {}
+
+    async def run():
+        writer = coalescer.WriteCoalescer(0.01, flush)
+        futures = [
+            writer.submit("power", False),
+            writer.submit("workmode", {"sh": 8}, _merge),
+            writer.submit("power", True),
+            writer.submit("workmode", {"eh": 22}, _merge),
+        ]
+        await asyncio.gather(*futures)
+
+    asyncio.run(run())
+    assert flushed == [{"workmode": {"sh": 8, "eh": 22}, "power": True}]
+
+def test_debounce_is_capped(coalescer):
+    flushed_at = []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+
+        async def flush(pending):
+            flushed_at.append(loop.time())
+            return {}
+
+        writer = coalescer.WriteCoalescer(0.02, flush)
+        started = loop.time()
+        futures = []
+        # Keep editing for twice the cap, always within one window of the last edit.
+        while loop.time() - started < 0.02 * coalescer.MAX_WAIT_WINDOWS * 2:
+            futures.append(writer.submit("remain", len(futures)))
+            await asyncio.sleep(0.005)
+        await writer.async_flush()
+        await asyncio.gather(*futures)
+        return started
+
+    started = asyncio.run(run())
+    assert len(flushed_at) >= 2
+    assert flushed_at[0] - started < 0.02 * (coalescer.MAX_WAIT_WINDOWS + 1)
+
+def test_outcomes_are_per_property(coalescer):
+    async def flush(pending):
+        return {"power": "queued", "fan": ValueError("rejected")}
+
+    async def run():
+        writer = coalescer.WriteCoalescer(10.0, flush)
+        power = writer.submit("power", True)
+        fan = writer.submit("fan", True)
+        name = writer.submit("name", "Rose")
+        await writer.async_flush()
+        assert await power == "queued"
+        assert await name is None
+        with pytest.raises(ValueError):
+            await fan
+
+    asyncio.run(run())
+
+def test_failed_flush_fails_every_caller(coalescer):
+    async def flush(pending):
+        raise TimeoutError
+
+    async def run():
+        writer = coalescer.WriteCoalescer(10.0, flush)
+        futures = [writer.submit("power", True), writer.submit("fan", True)]
+        await writer.async_flush()
+        for future in futures:
+            with pytest.raises(TimeoutError):
+                await future
+
+    asyncio.run(run())
+
+def test_cancel_drops_pending_writes(coalescer):
+    flushed = []
+
+    async def flush(pending):
+        flushed.append(pending)
+        return {}
+
+    async def run():
+        writer = coalescer.WriteCoalescer(0.01, flush)
+        future = writer.submit("power", True)
+        writer.cancel()
+        assert future.cancelled()
+        assert not writer.has_pending
+        await asyncio.sleep(0.03)
+
+    asyncio.run(run())
+    assert flushed == []
+
+def test_cancelled_flush_cancels_its_callers(coalescer):
+    async def run():
+        entered = asyncio.Event()
+
+        async def flush(pending):
+            entered.set()
+            await asyncio.sleep(10)
+
+        writer = coalescer.WriteCoalescer(0.0, flush)
+        future = writer.submit("power", True)
+        await entered.wait()
+        writer.cancel()
+        await asyncio.sleep(0)
+        assert future.cancelled()
+
+    asyncio.run(run())
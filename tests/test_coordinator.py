@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("bleak_retry_connector")
+pytest.importorskip("homeassistant.helpers.update_coordinator")
+
+class _Hass:
+    """The part of HomeAssistant a coordinator with a client factory uses."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.data: dict = {}
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+    def async_create_background_task(self, coro, name):
+        return self.loop.create_task(coro, name=name)
+
+def test_user_write_wins_over_a_journaled_one(coordinator, simulator, memory_storage):
+    device = simulator.SimulatedDiffuser("AA:BB:CC:DD:EE:01", power=False)
+
+    async def run():
+        coord = coordinator.FelshareCoordinator(_Hass(), device.address, "sim", client_factory=device.connect)
+        # Journaled while the unit was out of reach: power off and a schedule change.
+        coord._journal.record("power", False)
+        coord._journal.record("workmode", {"run_s": 40}, coordinator._merge_workmode)
+        await coord._conn.connect()
+        # The replay has started (it waits for the schedule) when the user turns the unit on.
+        await asyncio.sleep(0)
+        assert not coord._replay_task.done()
+        queued = await coord.async_set_power(True)
+        await coord._replay_task
+        await coord._writer.async_flush()
+        await coord._conn.close()
+        return queued, len(coord._journal)
+
+    queued, journaled = asyncio.run(run())
+    assert not queued
+    assert journaled == 0
+    assert device.power
+    assert device.schedules[0][5] == 40
+    assert b"\x03\x00" not in device.writes
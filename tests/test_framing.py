@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+def _chunks(frame: bytes, size: int) -> list[bytes]:
+    return [frame[i : i + size] for i in range(0, len(frame), size)]
+
+def _feed(assembler, fragments: list[bytes]) -> list[bytes]:
+    out = []
+    for i, fragment in enumerate(fragments):
+        out.extend(bytes(frame) for frame in assembler.feed(fragment, i * 0.01))
+    return out
+
+def _bulk(protocol, count: int) -> bytes:
+    records = b"".join(protocol.bytes_workmode(8 + i, 0, 20, 0, True, 0x7F, 30, 60) for i in range(count))
+    return (b"\x0c" + records).ljust(20, b"\x00")
+
+def _status(protocol, name: str) -> bytes:
+    body = protocol._STATUS.pack(2026, 10, 18, 12, 0, 0, 1, 0, 15, 200, 80)
+    return b"\x05" + body + b"\x00\x00" + name.encode() + b"\x00"
+
+@pytest.mark.parametrize("count", [2, 3, 5, 9])
+def test_bulk_in_20_byte_chunks_on_large_mtu(framing, protocol, count):
+    frame = _bulk(protocol, count)
+    assembler = framing.FrameAssembler(max_payload=244)
+    assert _feed(assembler, _chunks(frame, 20)) + [bytes(f) for f in assembler.flush_stale(float("inf"))] == [frame]
+    assert len(protocol.parse_bulk(frame).schedules) == count
+
+def test_bulk_cut_at_record_completes_without_waiting(framing, protocol):
+    frame = _bulk(protocol, 3)
+    assembler = framing.FrameAssembler(max_payload=244)
+    assert _feed(assembler, _chunks(frame, 20)) == [frame]
+    assert not assembler.pending
+    assert assembler.reassembled == 1
+
+def test_single_record_bulk_in_one_notification(framing, protocol):
+    frame = _bulk(protocol, 1)
+    assembler = framing.FrameAssembler(max_payload=244)
+    assert _feed(assembler, [frame]) == [frame]
+
+def test_status_with_long_name_in_20_byte_chunks(framing, protocol):
+    frame = _status(protocol, "Lavender and Vanilla")
+    assembler = framing.FrameAssembler(max_payload=244)
+    assert _feed(assembler, _chunks(frame, 20)) == [frame]
+    assert protocol.decode_frame(frame)["oil_name"] == "Lavender and Vanilla"
+
+def test_oil_name_in_20_byte_chunks(framing, protocol):
+    frame = protocol.bytes_oil_name("Sandalwood and Cedar")
+    assembler = framing.FrameAssembler(max_payload=244)
+    assert _feed(assembler, _chunks(frame, 20)) == [frame]
+
+def test_frame_at_full_mtu_waits_for_more(framing, protocol):
+    frame = _status(protocol, "X" * 40)
+    assembler = framing.FrameAssembler(max_payload=20)
+    assert _feed(assembler, _chunks(frame, 20)) == [frame]
+    unterminated = frame[:-1]
+    assembler = framing.FrameAssembler(max_payload=20)
+    assert _feed(assembler, _chunks(unterminated, 20)[:2]) == []
+    assert [bytes(f) for f in assembler.flush_stale(10.0)] == [unterminated[:40]]
+
+def test_frames_back_to_back(framing, protocol):
+    bulk = _bulk(protocol, 2)
+    assembler = framing.FrameAssembler(max_payload=244)
+    assert _feed(assembler, _chunks(bulk, 20) + [bytes([0x03, 0x01])]) == [bulk, bytes([0x03, 0x01])]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import types
+
+import pytest
+
+pytest.importorskip("homeassistant.helpers.storage")
+
+from conftest import load
+
+def _merge(pending, change):
+    return {**(pending or {}), **change}
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(load("journal"), "time", types.SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+@pytest.fixture
+def journal(memory_storage, clock):
+    return load("journal").CommandJournal(None, "AA:BB:CC:DD:EE:01", {"power": 60, "workmode": 3600, "fan": 0})
+
+def test_merged_entry_collects_changes(journal):
+    assert journal.record("workmode", {"sh": 8}, _merge)
+    assert journal.record("workmode", {"eh": 22}, _merge)
+    assert journal.record("power", False)
+    assert journal.record("power", True)
+    assert not journal.record("fan", True)  # not journaled
+    assert journal.pending() == {"workmode": {"sh": 8, "eh": 22}, "power": True}
+
+def test_entries_expire_per_property(journal, clock):
+    journal.record("power", False)
+    journal.record("workmode", {"sh": 8}, _merge)
+    clock.now += 61
+    assert journal.pending() == {"workmode": {"sh": 8}}
+    assert journal.expired == 1
+    assert "power" not in journal
+
+def test_failed_replay_keeps_the_original_age(journal, clock):
+    journal.record("power", False)
+    clock.now += 50
+    journal.record("power", False)  # the replay failed again
+    assert journal.as_dict()["entries"] == {"power": 50.0}
+    clock.now += 11
+    assert journal.pending() == {}
+    # A different value is a new intent with its own age.
+    journal.record("power", True)
+    clock.now += 50
+    journal.record("power", False)
+    assert journal.as_dict()["entries"] == {"power": 0.0}
+
+def test_newer_write_supersedes_the_entry(journal, clock):
+    journal.record("power", False)
+    journal.record("workmode", {"sh": 8, "eh": 22}, _merge)
+    clock.now += 30
+    journal.supersede("power", True)
+    journal.supersede("workmode", {"sh": 9}, _merge)
+    assert journal.pending() == {"workmode": {"sh": 9, "eh": 22}}
+    assert journal.as_dict()["entries"] == {"workmode": 30.0}
+
+def test_replayed_entries_are_counted(journal):
+    journal.record("power", False)
+    journal.discard("power", replayed=True)
+    journal.discard("power", replayed=True)
+    assert journal.replayed == 1
+    assert len(journal) == 0
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+NOON = datetime(2024, 1, 1, 12, 0)  # a Monday
+
+def _inputs(oil_model, **changes):
+    fields = dict(
+        power_on=True,
+        rate_ml_h=36.0,
+        run_s=30,
+        stop_s=30,
+        schedule_enabled=False,
+        start_min=9 * 60,
+        end_min=21 * 60,
+        days_mask=0x7F,
+    )
+    fields.update(changes)
+    return oil_model.OilInputs(**fields)
+
+def test_active_seconds_follow_the_schedule(oil_model):
+    scheduled = _inputs(oil_model, schedule_enabled=True)
+    assert oil_model.active_seconds(scheduled, datetime(2024, 1, 1, 8), datetime(2024, 1, 1, 10)) == 3600
+    assert oil_model.active_seconds(scheduled, datetime(2024, 1, 1, 8), datetime(2024, 1, 2, 8)) == 12 * 3600
+    # Monday off (bit 1): only Tuesday's window counts.
+    assert oil_model.active_seconds(
+        scheduled._replace(days_mask=0x7F & ~0b10), datetime(2024, 1, 1, 8), datetime(2024, 1, 2, 10)
+    ) == 3600
+    assert oil_model.active_seconds(_inputs(oil_model, power_on=False), NOON, datetime(2024, 1, 1, 13)) == 0
+
+def test_window_past_midnight(oil_model):
+    overnight = _inputs(oil_model, schedule_enabled=True, start_min=22 * 60, end_min=2 * 60)
+    assert oil_model.active_seconds(overnight, datetime(2024, 1, 1, 23), datetime(2024, 1, 2, 3)) == 3 * 3600
+    assert oil_model.seconds_until_active(overnight, NOON, 3600) == 11 * 3600
+
+def test_prediction_and_time_to_empty(oil_model):
+    model = oil_model.OilModel()
+    model.set_inputs(0.0, _inputs(oil_model))
+    model.observe(0.0, 100, clock=NOON)
+    # 36 mL/h at a 50 % duty cycle.
+    assert model.predict(3600.0) == pytest.approx(82.0)
+    assert model.time_to_empty(0.0) == pytest.approx(100 / 18 * 3600)
+
+def test_report_within_half_a_millilitre_keeps_the_prediction(oil_model):
+    model = oil_model.OilModel()
+    model.set_inputs(0.0, _inputs(oil_model))
+    model.observe(0.0, 100, clock=NOON)
+    model.observe(60.0, 100)  # 99.7 predicted
+    assert model.predict(60.0) == pytest.approx(99.7)
+    assert model.observations == 1
+    assert model.last_error_ml == pytest.approx(-0.3)
+
+def test_correction_is_learnt_from_the_actual_drop(oil_model):
+    model = oil_model.OilModel()
+    model.set_inputs(0.0, _inputs(oil_model))
+    model.observe(0.0, 100, clock=NOON)
+    model.observe(3600.0, 64)  # twice what the settings say
+    assert model.correction == pytest.approx(1.5)
+    assert model.rate_ml_s() * 3600 == pytest.approx(27.0)
+    assert model.predict(3600.0) == pytest.approx(64.5)
+
+def test_refill_reanchors_without_an_error(oil_model):
+    model = oil_model.OilModel()
+    model.set_inputs(0.0, _inputs(oil_model))
+    model.observe(0.0, 100, clock=NOON)
+    model.observe(3600.0, 150)
+    assert model.refills == 1
+    assert model.observations == 0
+    assert model.predict(3600.0) == 150
+
+def test_accurate_after_enough_good_predictions(oil_model):
+    model = oil_model.OilModel(accurate_error_ml=1.0, min_observations=3)
+    model.set_inputs(0.0, _inputs(oil_model))
+    model.observe(0.0, 100, clock=NOON)
+    for hour in range(1, 4):
+        assert not model.accurate
+        model.observe(hour * 3600.0, 100 - 18 * hour)
+    assert model.accurate
+
+def test_settings_change_applies_from_now_on(oil_model):
+    model = oil_model.OilModel()
+    model.set_inputs(0.0, _inputs(oil_model))
+    model.observe(0.0, 100, clock=NOON)
+    model.set_inputs(3600.0, _inputs(oil_model, power_on=False))
+    assert model.predict(7200.0) == pytest.approx(82.0)
+    assert model.time_to_empty(7200.0) is None
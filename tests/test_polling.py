@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+
+@pytest.fixture
+def schedule(polling):
+    return polling.AdaptivePollSchedule(
+        base=60, fast=10, maximum=900, fast_window=120, oil_fast_rate=20, relaxed=600
+    )
+
+def test_backoff_while_unreachable(polling, schedule):
+    schedule.note_result(False)
+    assert schedule.next_delay(0.0) == 120
+    schedule.note_result(False)
+    schedule.note_result(False)
+    assert schedule.next_delay(0.0) == 480
+    assert schedule.reason == polling.REASON_BACKOFF
+    for _ in range(5):
+        schedule.note_result(False)
+    assert schedule.next_delay(0.0) == 900
+
+def test_pushed_status_ends_backoff(polling, schedule):
+    for _ in range(4):
+        schedule.note_result(False)
+    assert schedule.next_delay(0.0) == 900
+    schedule.note_status(100.0)
+    assert schedule.failures == 0
+    assert schedule.next_delay(100.0) == 60
+    assert schedule.reason == polling.REASON_NORMAL
+    assert schedule.postponed == 0
+
+def test_reconnect_ends_backoff_and_honours_command_window(polling, schedule):
+    for _ in range(3):
+        schedule.note_result(False)
+    schedule.next_delay(0.0)
+    schedule.note_command(50.0)
+    assert schedule.next_delay(50.0) == 480  # still unreachable: the command window waits
+    assert schedule.note_reachable()
+    assert schedule.next_delay(55.0) == 10
+    assert schedule.reason == polling.REASON_COMMAND
+    assert not schedule.note_reachable()
+
+def test_command_window_polls_fast(polling, schedule):
+    schedule.note_command(0.0)
+    assert schedule.next_delay(0.0) == 10
+    assert schedule.reason == polling.REASON_COMMAND
+    assert schedule.next_delay(130.0) == 60
+    assert schedule.reason == polling.REASON_NORMAL
+
+def test_fast_oil_drop_polls_fast_unless_the_model_predicts_it(polling, schedule):
+    schedule.note_oil(0.0, 100)
+    schedule.note_oil(60.0, 99)  # 60 mL/h
+    assert schedule.next_delay(60.0) == 10
+    assert schedule.reason == polling.REASON_OIL
+
+    schedule = polling.AdaptivePollSchedule(60, 10, 900, 120, 20, relaxed=600)
+    schedule.note_model(True)
+    schedule.note_oil(0.0, 100)
+    schedule.note_oil(60.0, 99)
+    assert schedule.next_delay(60.0) == 600
+    assert schedule.reason == polling.REASON_MODEL
+
+def test_pushed_status_postpones_the_poll(polling, schedule):
+    schedule.note_status(0.0)
+    assert schedule.next_delay(0.0) == 60
+    schedule.note_status(30.0)
+    assert schedule.next_delay(30.0) == 60
+    assert schedule.postponed == 1
+    # Never closer than MIN_DELAY, even when the status is due already.
+    assert schedule.next_delay(89.0) == polling.MIN_DELAY
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+def _status(protocol, power: int = 1, remain: int = 80) -> bytes:
+    body = protocol._STATUS.pack(2026, 10, 18, 12, 0, 0, power, 0, 15, 200, remain)
+    return b"\x05" + body + b"Rose\x00"
+
+def test_decoder_skips_repeated_frame(protocol):
+    decoder = protocol.FrameDecoder()
+    assert decoder.decode(bytes([0x03, 0x01])) == {"power_on": True}
+    assert decoder.decode(bytearray([0x03, 0x01])) is None
+    assert decoder.duplicates == 1
+
+def test_power_echo_after_status_with_power_off(protocol):
+    decoder = protocol.FrameDecoder()
+    assert decoder.decode(bytes([0x03, 0x01])) == {"power_on": True}
+    assert decoder.decode(_status(protocol, power=0))["power_on"] is False
+    assert decoder.decode(bytes([0x03, 0x01])) == {"power_on": True}
+
+def test_refill_echo_after_status(protocol):
+    decoder = protocol.FrameDecoder()
+    refill = bytes([0x10, 0x00, 0x64])
+    assert decoder.decode(refill) == {"oil_remain_ml": 100}
+    assert decoder.decode(_status(protocol, remain=80))["oil_remain_ml"] == 80
+    assert decoder.decode(refill) == {"oil_remain_ml": 100}
+
+def test_status_after_echo_is_not_a_duplicate(protocol):
+    decoder = protocol.FrameDecoder()
+    status = _status(protocol, power=0)
+    assert decoder.decode(status)
+    assert decoder.decode(bytes([0x03, 0x01])) == {"power_on": True}
+    assert decoder.decode(status)["power_on"] is False
+
+def test_workmode_echo_after_bulk(protocol):
+    decoder = protocol.FrameDecoder()
+    echo = protocol.bytes_workmode(9, 0, 21, 0, True, 0x7F, 30, 60)
+    assert decoder.decode(echo)["work_start_h"] == 9
+    bulk = b"\x0c" + protocol.bytes_workmode(8, 0, 21, 0, True, 0x7F, 30, 60) + b"\x00" * 9
+    assert decoder.decode(bulk)["work_start_h"] == 8
+    assert decoder.decode(echo)["work_start_h"] == 9
+
+def test_workmode_ending_at_midnight(protocol):
+    frame = protocol.bytes_workmode(8, 0, 24, 0, True, 0x7F, 30, 60)
+    assert protocol.decode_frame(frame)["work_end_h"] == 24
+    bulk = protocol.parse_bulk(b"\x0c" + frame + b"\x00" * 8)
+    assert bulk.schedules == ((8, 0, 24, 0, 0xFF, 30, 60),)
+    assert not bulk.unknown
+
+def test_workmode_end_past_midnight_is_rejected(protocol):
+    for eh, em in ((24, 1), (25, 0)):
+        frame = protocol.bytes_workmode(8, 0, eh, em, True, 0x7F, 30, 60)
+        assert protocol.parse_bulk(b"\x0c" + frame + b"\x00" * 8).schedules == ()
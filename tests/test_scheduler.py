@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+
+class _Hass:
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+def test_leases_are_granted_in_arrival_order(scheduler):
+    async def run():
+        slots = scheduler.FelshareSlotScheduler(_Hass(), slots_per_adapter=1)
+        first, _ = await slots.acquire("proxy", "AA:01")
+        granted = []
+
+        async def wait(address):
+            lease, _ = await slots.acquire("proxy", address)
+            granted.append(address)
+            return lease
+
+        second = asyncio.ensure_future(wait("AA:02"))
+        third = asyncio.ensure_future(wait("AA:03"))
+        await asyncio.sleep(0)
+        assert slots.waiting_on("proxy") == 2
+        slots.release(first)
+        lease = await second
+        assert granted == ["AA:02"]
+        # Someone is waiting: a newcomer queues behind them even while a slot frees up.
+        fourth = asyncio.ensure_future(wait("AA:04"))
+        slots.release(lease)
+        await third
+        assert granted == ["AA:02", "AA:03"]
+        assert not fourth.done()
+        fourth.cancel()
+        await asyncio.gather(fourth, return_exceptions=True)
+        return slots.as_dict()
+
+    stats = asyncio.run(run())
+    assert stats["grants"] == 3
+    assert stats["waited"] == 2
+    assert stats["waiting_by_adapter"] == {}
+
+def test_idle_holder_is_asked_again_until_it_lets_go(scheduler, monkeypatch):
+    monkeypatch.setattr(scheduler, "RECLAIM_RECHECK_MIN", 0.01)
+
+    async def run():
+        slots = scheduler.FelshareSlotScheduler(_Hass(), slots_per_adapter=1, idle_reclaim=0.05)
+        asked = []
+        lease = None
+
+        async def reclaim():
+            asked.append(asyncio.get_running_loop().time())
+            if len(asked) == 1:
+                lease.touch()  # busy: declines
+            else:
+                slots.release(lease)
+
+        lease, _ = await slots.acquire("proxy", "AA:01", reclaim)
+        started = asyncio.get_running_loop().time()
+        waiter, waited = await asyncio.wait_for(slots.acquire("proxy", "AA:02"), 1.0)
+        return started, asked, waited, slots.reclaims
+
+    started, asked, waited, reclaims = asyncio.run(run())
+    assert reclaims == 2
+    # Not asked before the holder had been idle long enough, both times.
+    assert asked[0] - started >= 0.04
+    assert asked[1] - asked[0] >= 0.04
+    assert waited >= 0.08
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+def test_update_reports_changed_and_derived_fields(state):
+    s = state.FelshareState()
+    assert s.update({"power_on": True, "oil_capacity_ml": 200}) == ["power_on", "oil_capacity_ml"]
+    assert s.oil_level_pct is None  # remaining oil still unknown
+    assert s.update({"oil_remain_ml": 50}) == ["oil_remain_ml", "oil_level_pct"]
+    assert s.oil_level_pct == 25
+    assert s.update({"power_on": True, "oil_remain_ml": 50}) == []
+    assert s.update({"oil_remain_ml": 51}) == ["oil_remain_ml"]  # still 25 %
+
+def test_device_clock_becomes_device_time(state):
+    s = state.FelshareState()
+    assert s.update({"device_clock": (2024, 5, 6, 7, 8, 9)}) == ["device_clock", "device_time"]
+    assert s.device_time == datetime(2024, 5, 6, 7, 8, 9)
+    s.update({"device_clock": (0, 0, 0, 0, 0, 0)})
+    assert s.device_time is None
+
+def test_workmode_fields_default_unknown_fields(state):
+    s = state.FelshareState()
+    assert s.workmode_fields() == {
+        "sh": 9, "sm": 0, "eh": 21, "em": 0, "enabled": True, "daymask": 0x7F, "run_s": 30, "stop_s": 280,
+    }
+    s.update({"work_start_h": 7, "work_enabled": False, "work_days_mask": 0x3E})
+    fields = s.workmode_fields()
+    assert (fields["sh"], fields["enabled"], fields["daymask"], fields["eh"]) == (7, False, 0x3E, 21)
+    assert state.workmode_to_state(fields) == {
+        "work_start_h": 7,
+        "work_start_m": 0,
+        "work_end_h": 21,
+        "work_end_m": 0,
+        "work_enabled": False,
+        "work_days_mask": 0x3E,
+        "work_run_s": 30,
+        "work_stop_s": 280,
+    }
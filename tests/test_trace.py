@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+
+def _status(protocol, name: str) -> bytes:
+    body = protocol._STATUS.pack(2026, 10, 18, 12, 0, 0, 0, 1, 15, 200, 80)
+    return b"\x05" + body + b"\x00\x00" + name.encode() + b"\x00"
+
+def _trace(trace, frames: list[bytes], size: int) -> bytes:
+    records = [(0.0, trace.TX, bytes([0x05]))]
+    for i, frame in enumerate(frames):
+        records.extend((0.01 * i, trace.RX, frame[j : j + size]) for j in range(0, len(frame), size))
+    return trace.encode_trace(1_700_000_000.0, records)
+
+def test_round_trip(trace):
+    data = _trace(trace, [bytes([0x03, 0x01])], 20)
+    parsed = trace.parse_trace(data)
+    assert parsed.started_at == 1_700_000_000.0
+    assert [(r.direction, r.frame) for r in parsed.records] == [(trace.TX, b"\x05"), (trace.RX, b"\x03\x01")]
+
+def test_replay_state_takes_the_notification_size_from_the_trace(trace, protocol):
+    status = _status(protocol, "A" * 60)
+    records = trace.parse_trace(_trace(trace, [status, bytes([0x03, 0x01])], 64)).records
+    assert trace.notification_size(records) == 64
+    result = asyncio.run(trace.async_replay_state(records, speed=None))
+    assert result["notifications"] == 3
+    assert result["frames"] == 2
+    assert result["state"]["oil_name"] == "A" * 60
+    assert result["state"]["power_on"] is True
+    assert result["state"]["fan_on"] is True
+
+def test_replay_state_skips_repeats(trace, protocol):
+    echo = bytes([0x03, 0x00])
+    records = trace.parse_trace(_trace(trace, [echo, echo], 20)).records
+    result = asyncio.run(trace.async_replay_state(records, speed=None))
+    assert result["duplicates"] == 1
+    assert result["state"] == {"power_on": False}